@@ -0,0 +1,21 @@
+import argparse
+from config.config import logger
+from main import service, backfill_runner
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import the full mailbox history page by page")
+    parser.add_argument("--filters", default="", help="Gmail search query, e.g. 'after:2024/01/01'")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of emails to process in this run")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start over")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    service.ensure_service()
+    try:
+        processed = backfill_runner.run(filters=args.filters, limit=args.limit, restart=args.restart)
+        logger.success(f"[Backfill] {processed} emails processed in this run")
+    except KeyboardInterrupt:
+        logger.warning(f"[Backfill] Interrupted, resume with the same filters to continue")
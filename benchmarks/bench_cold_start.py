@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+import time
+import base64
+import socket
+import tempfile
+import subprocess
+import urllib.request
+
+RUNS = 5
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, data: bytes = None, timeout: float = 60) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(request, timeout=5) as response:
+                response.read()
+                return time.perf_counter()
+        except OSError:
+            time.sleep(0.005)
+    raise TimeoutError(url)
+
+
+def run() -> tuple:
+    port = free_port()
+    env = {**os.environ, "DEBUG_LEVEL": "WARNING", "DATA_DIR": tempfile.mkdtemp(), "PYTHONPATH": "."}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        ping = wait_for(f"http://127.0.0.1:{port}/ping") - start
+        message = {"emailAddress": "john.doe@gmail.com", "historyId": 1}
+        body = json.dumps({"message": {"data": base64.b64encode(json.dumps(message).encode()).decode(),
+                                       "messageId": str(time.time())}}).encode()
+        notification = wait_for(f"http://127.0.0.1:{port}/notifications", data=body) - start
+        return ping, notification
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    results = [run() for _ in range(RUNS)]
+    ping = sorted(r[0] for r in results)[RUNS // 2]
+    notification = sorted(r[1] for r in results)[RUNS // 2]
+    print(f"median of {RUNS} cold starts: /ping {ping * 1000:.0f} ms, /notifications {notification * 1000:.0f} ms")
@@ -0,0 +1,48 @@
+import os
+import json
+import time
+import statistics
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DEBUG_LEVEL", "WARNING")
+os.environ["GOOGLE_TOKEN_JSON"] = json.dumps({
+    "token": "access-token",
+    "refresh_token": "refresh-token",
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "expiry": (datetime.utcnow() + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+})
+
+from fastapi.testclient import TestClient
+from googleapiclient.discovery import build
+from src.service import web_gmail
+from tests.fake_gmail import FakeGmailHttp, make_mailbox
+import main
+
+REQUESTS = 300
+mailbox = make_mailbox(size=1)
+email_id = list(mailbox)[0]
+web_gmail.build = lambda **kwargs: build(
+    serviceName=kwargs["serviceName"], version=kwargs["version"], http=FakeGmailHttp(messages=mailbox)
+)
+
+
+def run(cached: bool):
+    client = TestClient(main.app)
+    latencies = []
+    for _ in range(REQUESTS):
+        if not cached:
+            main.service._credentials = None
+            main.service._service = None
+        start = time.perf_counter()
+        response = client.get(f"/emails/{email_id}")
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+if __name__ == "__main__":
+    for label, cached in [("rebuild per request", False), ("cached client", True)]:
+        p50, p99 = run(cached=cached)
+        print(f"{label:<20} p50={p50:6.2f} ms  p99={p99:6.2f} ms")
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+import resource
+import subprocess
+
+os.environ.setdefault("DEBUG_LEVEL", "WARNING")
+
+SIZE = 10_000
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "html")
+
+
+def make_responses() -> list:
+    from tests.fake_gmail import make_message
+
+    htmls = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as file:
+            htmls.append(file.read())
+    return [
+        make_message(message_id=f"{i:016x}", sender="alertas@produbanco.com", subject="consumo", html=htmls[i % len(htmls)])
+        for i in range(SIZE)
+    ]
+
+
+def measure() -> None:
+    from src.service.parse_pool import parse_response
+
+    responses = make_responses()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    emails = []
+    while responses:
+        emails.append(parse_response(responses.pop()))
+    parsed = time.perf_counter() - start
+    texts = sum(len(email.text or "") for email in emails)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{SIZE} emails  parse {SIZE / parsed:8.0f} emails/s  parse+text {SIZE / elapsed:8.0f} emails/s  "
+          f"peak RSS +{(peak - baseline) / 1024:6.1f} MiB  ({texts} text chars)")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        measure()
+    else:
+        subprocess.run([sys.executable, __file__, "--child"], check=True, env={**os.environ, "PYTHONPATH": "."})
@@ -0,0 +1,30 @@
+import os
+import time
+
+os.environ.setdefault("DEBUG_LEVEL", "WARNING")
+
+from src.service.local_gmail import LocalGmailService
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox
+
+LATENCY = 0.02
+SIZE = 100
+
+
+def run(batch_size):
+    mailbox = make_mailbox(size=SIZE)
+    http = FakeGmailHttp(messages=mailbox, latency=LATENCY)
+    gmail = LocalGmailService()
+    gmail._service = build_fake_service(http=http)
+
+    start = time.perf_counter()
+    emails = gmail.get_emails(max_results=SIZE, filters="", batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(http.requests), len(emails)
+
+
+if __name__ == "__main__":
+    print(f"{SIZE} emails, {LATENCY * 1000:.0f} ms simulated round trip")
+    for batch_size in [None, 10, 50]:
+        elapsed, calls, count = run(batch_size=batch_size)
+        label = "sequential" if batch_size is None else f"batch_size={batch_size}"
+        print(f"{label:<16} {elapsed:7.3f}s  {calls:4d} HTTP calls  {count} emails")
@@ -0,0 +1,32 @@
+import os
+import time
+from src.utils import process_html, process_html_soup
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "html")
+ROUNDS = 200
+
+
+def load_corpus():
+    corpus = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as file:
+            corpus.append(file.read())
+    return corpus
+
+
+def run(func, corpus):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for html in corpus:
+            func(html=html)
+    return ROUNDS * len(corpus) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    corpus = load_corpus()
+    assert all(process_html(html=html) == process_html_soup(html=html) for html in corpus)
+    soup_rate = run(process_html_soup, corpus)
+    fast_rate = run(process_html, corpus)
+    print(f"{len(corpus)} fixture emails x {ROUNDS} rounds")
+    print(f"BeautifulSoup       {soup_rate:8.0f} emails/s")
+    print(f"HtmlTextExtractor   {fast_rate:8.0f} emails/s  ({fast_rate / soup_rate:.1f}x)")
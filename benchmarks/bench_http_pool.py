@@ -0,0 +1,56 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DEBUG_LEVEL", "WARNING")
+
+from src.service.web_gmail import WebGmailService
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox
+
+LATENCY = 0.05
+HANDSHAKE = 0.1
+REQUESTS = 64
+CONCURRENCY = 16
+
+
+class SerialHttp(FakeGmailHttp):
+    def __init__(self, messages: dict):
+        super().__init__(messages=messages, latency=LATENCY)
+        self.lock = threading.Lock()
+        self.connected = False
+
+    def request(self, *args, **kwargs):
+        with self.lock:
+            if not self.connected:
+                time.sleep(HANDSHAKE)
+                self.connected = True
+            return super().request(*args, **kwargs)
+
+
+def run(pool_size: int):
+    mailbox = make_mailbox(size=REQUESTS)
+    gmail = WebGmailService(
+        client_id="",
+        client_secret="",
+        redirect_uri="",
+        token=None,
+        scopes=[],
+        http_pool_size=pool_size,
+        http_factory=lambda credentials: SerialHttp(messages=mailbox)
+    )
+    gmail._service = build_fake_service(http=SerialHttp(messages=mailbox))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        list(pool.map(lambda email_id: gmail.get_email_by_id(email_id=email_id), mailbox))
+    return time.perf_counter() - start, gmail.http_pool.metrics if gmail.http_pool else {}
+
+
+if __name__ == "__main__":
+    for size in (0, 1, 4, 16):
+        elapsed, metrics = run(pool_size=size)
+        print(
+            f"pool_size={size:<2} {REQUESTS} concurrent gets in {elapsed:.2f}s "
+            f"({REQUESTS / elapsed:.0f} req/s), transports created: {metrics.get('created', 1)}"
+        )
@@ -0,0 +1,72 @@
+import os
+import time
+import random
+import tempfile
+import statistics
+
+os.environ.setdefault("DEBUG_LEVEL", "WARNING")
+
+from src.service.ledger import SqliteLedger
+
+ROWS = 1_000_000
+MERCHANTS = 5_000
+RUNS = 5
+
+
+def populate(ledger: SqliteLedger) -> None:
+    random.seed(7)
+    merchants = [f"Merchant {i}" for i in range(MERCHANTS)]
+    rows = []
+    for i in range(ROWS):
+        date = f"20{random.randint(20, 25)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
+        merchant = merchants[int(random.paretovariate(1.2)) % MERCHANTS]
+        rows.append((
+            f"{i:016x}", None, random.choice(("card", "transfer")), random.randint(100, 50_000), date, date[:7],
+            merchant, merchant, "", 0.0
+        ))
+    with ledger._conn:
+        ledger._conn.executemany(
+            "INSERT INTO transactions (email_id, account, transaction_type, amount_cents, date, month, merchant, "
+            "establishment, beneficiary, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+    ledger._conn.execute("ANALYZE")
+    ledger.rebuild()
+
+
+def timed(func) -> float:
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        ledger = SqliteLedger(path=os.path.join(directory, "ledger.sqlite3"))
+        start = time.perf_counter()
+        populate(ledger)
+        print(f"{ROWS} rows loaded in {time.perf_counter() - start:.1f}s")
+
+        queries = {
+            "by month": lambda: ledger.spend_by(group="month"),
+            "by month (2024)": lambda: ledger.spend_by(group="month", start="2024-01-01", end="2024-12-31"),
+            "by type": lambda: ledger.spend_by(group="type"),
+            "by type (2024)": lambda: ledger.spend_by(group="type", start="2024-01-01", end="2024-12-31"),
+            "by merchant": lambda: ledger.spend_by(group="merchant"),
+            "top 10 merchants": lambda: ledger.top_merchants(n=10),
+            "top 10 merchants (March 2024)": lambda: ledger.top_merchants(n=10, start="2024-03-01", end="2024-03-31"),
+        }
+        for name, query in queries.items():
+            print(f"{name:<32} {timed(query):7.1f} ms")
+
+        transaction = {
+            "is_transaction": True, "transaction_type": "card", "amount": 12.5, "establishment": "Merchant 1",
+            "date": "2024-03-15"
+        }
+        print(f"{'record with rollups':<32} {timed(lambda: ledger.record('bench', transaction)):7.1f} ms")
+        start = time.perf_counter()
+        ledger.verify()
+        print(f"{'verify rollups (full scan)':<32} {(time.perf_counter() - start) * 1000:7.1f} ms")
@@ -0,0 +1,68 @@
+import os
+import json
+import time
+import random
+import tempfile
+
+os.environ.setdefault("DEBUG_LEVEL", "WARNING")
+
+from src.service.merchants import MerchantDirectory, normalize_text, trigrams
+
+MERCHANTS = 20_000
+QUERIES = 2_000
+WORDS = ["super", "market", "farmacia", "cafe", "grill", "store", "tienda", "banco", "auto", "motors", "express",
+         "pizza", "hotel", "gas", "online", "shop", "bar", "club", "travel", "market"]
+
+
+def make_names() -> list:
+    random.seed(11)
+    names = set()
+    while len(names) < MERCHANTS:
+        names.add(f"{random.choice(WORDS).title()} {''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=6)).title()}")
+    return sorted(names)
+
+
+def noisy(name: str) -> str:
+    return f"{name.upper()} *{random.randint(100, 9999)} {random.choice(['', 'QUITO', 'GYE'])}"
+
+
+def linear(aliases: list, raw: str, threshold: float = 0.6):
+    grams = trigrams(normalize_text(raw))
+    best_score, best = threshold, None
+    for alias, alias_grams in aliases:
+        score = 2 * len(grams & alias_grams) / (len(grams) + len(alias_grams))
+        if score >= best_score:
+            best_score, best = score, alias
+    return best
+
+
+if __name__ == "__main__":
+    names = make_names()
+    expected = [random.choice(names) for _ in range(QUERIES)]
+    queries = [noisy(name) for name in expected]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dictionary.json")
+        with open(path, "w") as file:
+            json.dump({name: [] for name in names}, file)
+
+        merchants = MerchantDirectory(path=os.path.join(directory, "merchants.sqlite3"))
+        start = time.perf_counter()
+        merchants.load(path)
+        print(f"{MERCHANTS} merchants loaded in {time.perf_counter() - start:.1f}s")
+
+        aliases = [(name, trigrams(normalize_text(name))) for name in names]
+        start = time.perf_counter()
+        for raw in queries[:200]:
+            linear(aliases, raw)
+        print(f"{'linear scan':<24} {(time.perf_counter() - start) / 200 * 1000:8.3f} ms/lookup")
+
+        start = time.perf_counter()
+        resolved = [merchants.resolve(raw) for raw in queries]
+        print(f"{'trigram index':<24} {(time.perf_counter() - start) / QUERIES * 1000:8.3f} ms/lookup")
+
+        start = time.perf_counter()
+        for raw in queries:
+            merchants.resolve(raw)
+        print(f"{'memoized':<24} {(time.perf_counter() - start) / QUERIES * 1000:8.3f} ms/lookup")
+        correct = sum(name == truth for name, truth in zip(resolved, expected))
+        print(f"resolved correctly {correct}/{QUERIES}, {merchants.metrics}")
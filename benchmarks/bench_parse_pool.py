@@ -0,0 +1,42 @@
+import os
+import time
+
+os.environ.setdefault("DEBUG_LEVEL", "WARNING")
+
+from src.service.parse_pool import ParsePool
+from tests.fake_gmail import make_message
+
+SIZE = 2000
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "html")
+
+
+def make_responses() -> list:
+    htmls = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as file:
+            htmls.append(file.read() * 4)
+    return [
+        make_message(message_id=f"{i:016x}", sender="alertas@produbanco.com", subject="consumo", html=htmls[i % len(htmls)])
+        for i in range(SIZE)
+    ]
+
+
+def run(responses: list, workers: int) -> float:
+    pool = ParsePool(workers=workers, chunk_size=32, min_batch=1)
+    try:
+        pool.parse_many(responses[:workers * 32])
+        start = time.perf_counter()
+        pool.parse_many(responses)
+        return time.perf_counter() - start
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    responses = make_responses()
+    print(f"{SIZE} responses, {os.cpu_count()} CPUs")
+    baseline = None
+    for workers in [1, 2, 4, 8]:
+        elapsed = run(responses, workers=workers)
+        baseline = baseline or elapsed
+        print(f"workers={workers}  {elapsed:7.3f}s  {SIZE / elapsed:8.0f} emails/s  {baseline / elapsed:5.2f}x")
@@ -0,0 +1,46 @@
+import os
+import time
+
+os.environ.setdefault("DEBUG_LEVEL", "WARNING")
+
+from src.service.web_gmail import WebGmailService
+from src.service.screening import MessageScreen
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox, make_message
+
+LATENCY = 0.02
+TRANSACTIONS = 40
+NEWSLETTERS = 160
+
+
+def make_fixture_mailbox() -> dict:
+    mailbox = make_mailbox(size=TRANSACTIONS)
+    path = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "html", "uber_receipt.html")
+    with open(path, encoding="utf-8") as file:
+        html = file.read() * 8
+    for i in range(NEWSLETTERS):
+        message_id = f"news{i:012d}"
+        mailbox[message_id] = make_message(
+            message_id=message_id,
+            sender="Tienda <marketing@tienda.com>",
+            subject=f"Newsletter {i}: novedades y ofertas de la semana",
+            html=html
+        )
+    return mailbox
+
+
+def run(screen):
+    http = FakeGmailHttp(messages=make_fixture_mailbox(), latency=LATENCY)
+    gmail = WebGmailService(client_id="", client_secret="", redirect_uri="", token=None, scopes=[])
+    gmail._service = build_fake_service(http=http)
+
+    start = time.perf_counter()
+    emails = gmail.get_emails_by_ids(email_ids=list(http.messages), screen=screen)
+    elapsed = time.perf_counter() - start
+    return elapsed, http.bytes_sent, len(emails)
+
+
+if __name__ == "__main__":
+    print(f"{TRANSACTIONS + NEWSLETTERS} emails ({TRANSACTIONS} transactions), {LATENCY * 1000:.0f} ms round trip")
+    for label, screen in [("full fetch", None), ("screened", MessageScreen())]:
+        elapsed, sent, count = run(screen=screen)
+        print(f"{label:<12} {elapsed:7.3f}s  {sent / 1024:9.1f} KiB transferred  {count} emails parsed")
@@ -27,8 +27,78 @@ else:
     GOOGLE_TOPIC_ID = os.getenv("GOOGLE_TOPIC_ID")
 
 OPEN_AI_API_KEY = os.getenv("OPEN_AI_API_KEY")
+OPEN_AI_MODEL = os.getenv("OPEN_AI_MODEL", "gpt-4o-mini")
 DEBUG_LEVEL = os.getenv("DEBUG_LEVEL")
 
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(BASE_DIR), "data"))
+SYNC_STATE_PATH = os.getenv("SYNC_STATE_PATH", os.path.join(DATA_DIR, "sync_state.json"))
+SYNC_RESYNC_LIMIT = int(os.getenv("SYNC_RESYNC_LIMIT", 100))
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+PARSE_CHUNK_SIZE = int(os.getenv("PARSE_CHUNK_SIZE", 16))
+PARSE_MIN_BATCH = int(os.getenv("PARSE_MIN_BATCH", 64))
+
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+
+LEDGER_PATH = os.getenv("LEDGER_PATH", os.path.join(DATA_DIR, "ledger.sqlite3"))
+BUDGETS = os.getenv("BUDGETS")
+MERCHANTS_DB_PATH = os.getenv("MERCHANTS_DB_PATH", os.path.join(DATA_DIR, "merchants.sqlite3"))
+MERCHANT_DICTIONARY_PATH = os.getenv("MERCHANT_DICTIONARY_PATH")
+MERCHANT_MATCH_THRESHOLD = float(os.getenv("MERCHANT_MATCH_THRESHOLD", 0.6))
+
+ACCOUNTS_DB_PATH = os.getenv("ACCOUNTS_DB_PATH", os.path.join(DATA_DIR, "accounts.sqlite3"))
+ACCOUNTS_STATE_DIR = os.getenv("ACCOUNTS_STATE_DIR", os.path.join(DATA_DIR, "accounts"))
+ACCOUNTS_MAX_LIVE = int(os.getenv("ACCOUNTS_MAX_LIVE", 32))
+ACCOUNT_HTTP_POOL_SIZE = int(os.getenv("ACCOUNT_HTTP_POOL_SIZE", 2))
+NOTIFICATION_SHARDS = int(os.getenv("NOTIFICATION_SHARDS", 4))
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+SCHEDULER_STATE_PATH = os.getenv("SCHEDULER_STATE_PATH", os.path.join(DATA_DIR, "scheduler_state.json"))
+SCHEDULER_RETRY_DELAY = float(os.getenv("SCHEDULER_RETRY_DELAY", 300))
+WATCH_RENEW_MARGIN = float(os.getenv("WATCH_RENEW_MARGIN", 24 * 3600))
+TOKEN_REFRESH_AHEAD = float(os.getenv("TOKEN_REFRESH_AHEAD", 600))
+GMAIL_HTTP_POOL_SIZE = int(os.getenv("GMAIL_HTTP_POOL_SIZE", 10))
+
+SCREENING_ENABLED = os.getenv("SCREENING_ENABLED", "true").lower() == "true"
+BACKFILL_STATE_PATH = os.getenv("BACKFILL_STATE_PATH", os.path.join(DATA_DIR, "backfill_state.json"))
+BACKFILL_PAGE_SIZE = int(os.getenv("BACKFILL_PAGE_SIZE", 500))
+BACKFILL_CHUNK_SIZE = int(os.getenv("BACKFILL_CHUNK_SIZE", 100))
+BACKFILL_LOCK_PATH = os.getenv("BACKFILL_LOCK_PATH", os.path.join(DATA_DIR, "backfill.lock"))
+
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", 4))
+WORK_QUEUE_PATH = os.getenv("WORK_QUEUE_PATH", os.path.join(DATA_DIR, "work_queue.sqlite3"))
+WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", 5))
+WORK_QUEUE_VISIBILITY_TIMEOUT = float(os.getenv("WORK_QUEUE_VISIBILITY_TIMEOUT", 300))
+WORK_QUEUE_RETRY_BACKOFF = float(os.getenv("WORK_QUEUE_RETRY_BACKOFF", 30))
+WORK_QUEUE_POLL_INTERVAL = float(os.getenv("WORK_QUEUE_POLL_INTERVAL", 1))
+WORK_QUEUE_RETENTION = float(os.getenv("WORK_QUEUE_RETENTION", 7 * 24 * 3600))
+NOTIFICATION_QUEUE_SIZE = int(os.getenv("NOTIFICATION_QUEUE_SIZE", 100))
+LEADER_LOCK_PATH = os.getenv("LEADER_LOCK_PATH", os.path.join(DATA_DIR, "leader.lock"))
+LEADER_RETRY_INTERVAL = float(os.getenv("LEADER_RETRY_INTERVAL", 10))
+SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", 30))
+
+DEDUP_DB_PATH = os.getenv("DEDUP_DB_PATH", os.path.join(DATA_DIR, "dedup.sqlite3"))
+DEDUP_CAPACITY = int(os.getenv("DEDUP_CAPACITY", 10000))
+DEDUP_TTL = float(os.getenv("DEDUP_TTL", 7 * 24 * 3600))
+
+MESSAGE_STORE_PATH = os.getenv("MESSAGE_STORE_PATH", os.path.join(DATA_DIR, "messages.sqlite3"))
+MESSAGE_STORE_KEEP_RAW = os.getenv("MESSAGE_STORE_KEEP_RAW", "true").lower() == "true"
+MESSAGE_STORE_MAX_RAW_MB = int(os.getenv("MESSAGE_STORE_MAX_RAW_MB", 256))
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(DATA_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_CAPACITY = int(os.getenv("LLM_CACHE_CAPACITY", 1000))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 100_000))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 30 * 24 * 3600))
+LLM_BATCH_MAX_TOKENS = int(os.getenv("LLM_BATCH_MAX_TOKENS", 8000))
+LLM_BATCH_MAX_ITEMS = int(os.getenv("LLM_BATCH_MAX_ITEMS", 20))
+LLM_CLIENT = os.getenv("LLM_CLIENT", "sync")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", 500))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", 200_000))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 30))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 5))
+PROMPT_MAX_TOKENS = int(os.getenv("PROMPT_MAX_TOKENS", 1500))
+PROMPT_BOILERPLATE_MIN_COUNT = int(os.getenv("PROMPT_BOILERPLATE_MIN_COUNT", 3))
+
 logger.remove()
 logger.add(
     sys.stdout,
@@ -1,22 +1,382 @@
+from src.service.boot import STARTED
 import uvicorn
+import os
+import time
 import json
+import importlib
 import base64
-from typing import Optional
+import threading
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from contextlib import asynccontextmanager
 from fastapi.responses import RedirectResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi import FastAPI, HTTPException, status, Response, Request
 from config.config import (
-    logger, GOOGLE_TOKEN_JSON, GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, OAUTH_REDIRECT_URI, GOOGLE_TOPIC_ID
+    logger, GOOGLE_TOKEN_JSON, GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, OAUTH_REDIRECT_URI, GOOGLE_TOPIC_ID,
+    SYNC_STATE_PATH, SYNC_RESYNC_LIMIT, EMAIL_WORKERS, NOTIFICATION_QUEUE_SIZE, SHUTDOWN_TIMEOUT,
+    DEDUP_DB_PATH, DEDUP_CAPACITY, DEDUP_TTL, MESSAGE_STORE_PATH, MESSAGE_STORE_KEEP_RAW, MESSAGE_STORE_MAX_RAW_MB,
+    OPEN_AI_API_KEY, OPEN_AI_MODEL, LLM_CACHE_PATH, LLM_CACHE_CAPACITY, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL,
+    LLM_BATCH_MAX_TOKENS, LLM_BATCH_MAX_ITEMS, PROMPT_MAX_TOKENS, PROMPT_BOILERPLATE_MIN_COUNT, LLM_CLIENT,
+    LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_TIMEOUT, LLM_MAX_RETRIES,
+    BACKFILL_STATE_PATH, BACKFILL_PAGE_SIZE, BACKFILL_CHUNK_SIZE, SCREENING_ENABLED, PARSE_WORKERS, PARSE_CHUNK_SIZE,
+    PARSE_MIN_BATCH, STARTUP_WARMUP, GMAIL_HTTP_POOL_SIZE, SCHEDULER_ENABLED, SCHEDULER_STATE_PATH,
+    SCHEDULER_RETRY_DELAY, WATCH_RENEW_MARGIN, TOKEN_REFRESH_AHEAD, ACCOUNTS_DB_PATH, ACCOUNTS_STATE_DIR,
+    ACCOUNTS_MAX_LIVE, ACCOUNT_HTTP_POOL_SIZE, NOTIFICATION_SHARDS, WORK_QUEUE_PATH, WORK_QUEUE_MAX_ATTEMPTS,
+    WORK_QUEUE_VISIBILITY_TIMEOUT, WORK_QUEUE_RETRY_BACKOFF, WORK_QUEUE_POLL_INTERVAL, WORK_QUEUE_RETENTION,
+    LEDGER_PATH, BUDGETS, MERCHANTS_DB_PATH, MERCHANT_DICTIONARY_PATH, MERCHANT_MATCH_THRESHOLD, LEADER_LOCK_PATH,
+    LEADER_RETRY_INTERVAL, BACKFILL_LOCK_PATH
 )
-from src.service.web_gmail import WebGmailService
+from src.service.web_gmail import WebGmailService, Email, load_discovery_document
+from src.service.gmail_sync import GmailSyncEngine
+from src.service.backfill import BackfillRunner
+from src.service.screening import MessageScreen
+from src.service.worker_pool import ShardedWorkerPool
+from src.service.work_queue import SqliteWorkQueue, QueueWorker
+from src.service.accounts import SqliteCredentialStore, MailboxRegistry, account_slug, normalize_account
+from src.service.dedup import Deduplicator, MemoryDedupStore, SqliteDedupStore
+from src.service.message_store import SqliteMessageStore
+from src.service.parse_pool import ParsePool
+from src.service.chatgpt_analyzer import ChatGptAnalyzer, count_text_tokens, get_encoding
+from src.service.async_chatgpt_analyzer import AsyncChatGptAnalyzer
+from src.service.prompt_compactor import PromptCompactor
+from src.service.llm_cache import LLMResponseCache
+from src.service.transaction_extractor import TransactionExtractor
+from src.service.ledger import SqliteLedger, GROUP_COLUMNS
+from src.service.budgets import parse_budgets
+from src.service.merchants import MerchantDirectory
+from src.service.startup import StartupTimer
+from src.service.scheduler import Scheduler
+from src.service.process_lock import ProcessLock
 
-app = FastAPI()
+startup = StartupTimer(started=STARTED)
+startup.record(name="imports", since=STARTED)
+services_started = time.perf_counter()
+GMAIL_SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
+store = SqliteMessageStore(
+    path=MESSAGE_STORE_PATH,
+    keep_raw=MESSAGE_STORE_KEEP_RAW,
+    max_raw_bytes=MESSAGE_STORE_MAX_RAW_MB * 1024 * 1024
+) if MESSAGE_STORE_PATH else None
+parse_pool = ParsePool(workers=PARSE_WORKERS, chunk_size=PARSE_CHUNK_SIZE, min_batch=PARSE_MIN_BATCH)
 service = WebGmailService(
     client_id=GOOGLE_CLIENT_ID,
     client_secret=GOOGLE_CLIENT_SECRET,
     redirect_uri=OAUTH_REDIRECT_URI,
     token=GOOGLE_TOKEN_JSON,
-    scopes=["https://www.googleapis.com/auth/gmail.readonly"]
+    scopes=GMAIL_SCOPES,
+    store=store,
+    parse_pool=parse_pool,
+    http_pool_size=GMAIL_HTTP_POOL_SIZE
 )
+screen = MessageScreen() if SCREENING_ENABLED else None
+deduplicator = Deduplicator(
+    memory=MemoryDedupStore(capacity=DEDUP_CAPACITY, ttl=DEDUP_TTL),
+    persistent=SqliteDedupStore(path=DEDUP_DB_PATH, ttl=DEDUP_TTL) if DEDUP_DB_PATH else None
+)
+llm_cache = LLMResponseCache(
+    path=LLM_CACHE_PATH or None,
+    capacity=LLM_CACHE_CAPACITY,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    ttl=LLM_CACHE_TTL
+)
+if not OPEN_AI_API_KEY:
+    llm = None
+elif LLM_CLIENT == "async":
+    llm = AsyncChatGptAnalyzer(
+        model=OPEN_AI_MODEL,
+        api_key=OPEN_AI_API_KEY,
+        cache=llm_cache,
+        max_concurrency=LLM_MAX_CONCURRENCY,
+        requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+        timeout=LLM_TIMEOUT,
+        max_retries=LLM_MAX_RETRIES
+    )
+else:
+    llm = ChatGptAnalyzer(
+        model=OPEN_AI_MODEL,
+        api_key=OPEN_AI_API_KEY,
+        cache=llm_cache,
+        batch_max_tokens=LLM_BATCH_MAX_TOKENS,
+        batch_max_items=LLM_BATCH_MAX_ITEMS
+    )
+merchants = MerchantDirectory(path=MERCHANTS_DB_PATH, threshold=MERCHANT_MATCH_THRESHOLD)
+if MERCHANT_DICTIONARY_PATH:
+    merchants.load(MERCHANT_DICTIONARY_PATH)
+ledger = SqliteLedger(path=LEDGER_PATH, budgets=parse_budgets(BUDGETS), merchants=merchants)
+extractor = TransactionExtractor(
+    llm=llm,
+    compactor=PromptCompactor(
+        count_tokens=lambda text: count_text_tokens(text, OPEN_AI_MODEL),
+        max_tokens=PROMPT_MAX_TOKENS,
+        min_occurrences=PROMPT_BOILERPLATE_MIN_COUNT
+    )
+)
+
+
+def process_email(email: Email) -> None:
+    logger.info(f"[Gmail] New email received: {email.subject}")
+    transaction = extractor.extract(email)
+    if transaction and transaction.get("is_transaction"):
+        logger.success(f"[Gmail] Transaction found in email {email.id}: {transaction}")
+        ledger.record(email_id=email.id, transaction=transaction)
+    deduplicator.mark(f"gmail:{email.id}")
+
+
+def process_emails(emails: List[Email]) -> None:
+    transactions = extractor.extract_many(emails)
+    for email in emails:
+        transaction = transactions.get(email.id)
+        if transaction and transaction.get("is_transaction"):
+            logger.success(f"[Gmail] Transaction found in email {email.id}: {transaction}")
+            ledger.record(email_id=email.id, transaction=transaction)
+        deduplicator.mark(f"gmail:{email.id}")
+
+
+def handle_emails(emails: List[Email]) -> None:
+    for email in emails:
+        work_queue.enqueue(payload={"email": email.model_dump(exclude={"html", "data"})}, key=f"gmail:{email.id}")
+    email_worker.notify()
+
+
+def process_job(payload: dict) -> None:
+    process_email(Email.model_validate(payload["email"]))
+
+
+sync_engine = GmailSyncEngine(
+    mail_service=service,
+    on_emails=handle_emails,
+    state_path=SYNC_STATE_PATH,
+    resync_limit=SYNC_RESYNC_LIMIT,
+    deduplicator=deduplicator,
+    screen=screen
+)
+backfill_runner = BackfillRunner(
+    mail_service=service,
+    on_emails=process_emails,
+    state_path=BACKFILL_STATE_PATH,
+    page_size=BACKFILL_PAGE_SIZE,
+    chunk_size=BACKFILL_CHUNK_SIZE,
+    deduplicator=deduplicator,
+    screen=screen
+)
+
+
+def build_account(account: str, token: str) -> GmailSyncEngine:
+    return GmailSyncEngine(
+        mail_service=WebGmailService(
+            client_id=GOOGLE_CLIENT_ID,
+            client_secret=GOOGLE_CLIENT_SECRET,
+            redirect_uri=OAUTH_REDIRECT_URI,
+            token=token,
+            scopes=GMAIL_SCOPES,
+            store=store,
+            parse_pool=parse_pool,
+            http_pool_size=ACCOUNT_HTTP_POOL_SIZE
+        ),
+        on_emails=handle_emails,
+        state_path=os.path.join(ACCOUNTS_STATE_DIR, f"{account_slug(account)}.json"),
+        resync_limit=SYNC_RESYNC_LIMIT,
+        deduplicator=deduplicator,
+        screen=screen
+    )
+
+
+credential_store = SqliteCredentialStore(path=ACCOUNTS_DB_PATH)
+mailboxes = MailboxRegistry(credentials=credential_store, factory=build_account, capacity=ACCOUNTS_MAX_LIVE)
+
+
+default_account_lock = threading.Lock()
+default_account = None
+
+
+def get_default_account() -> str | None:
+    global default_account
+    with default_account_lock:
+        if default_account is None and GOOGLE_TOKEN_JSON:
+            try:
+                service.ensure_service()
+            except HTTPException:
+                return None
+            address = service.get_email_address()
+            default_account = normalize_account(address) if address else None
+        return default_account
+
+
+def engine_for(account: Optional[str]) -> GmailSyncEngine | None:
+    if account and normalize_account(account) == get_default_account():
+        return sync_engine
+    engine = mailboxes.get(account) if account else None
+    if engine is None and not len(credential_store):
+        return sync_engine
+    return engine
+
+
+def handle_notification(item: tuple) -> None:
+    account, history_id = item
+    engine = engine_for(account)
+    if engine is None:
+        logger.warning(f"[Accounts] Notification for unregistered account {account} ignored")
+        return
+    engine.notify(history_id=history_id)
+
+
+def relay_notification(payload: dict) -> None:
+    account = payload["account"]
+    if not notification_pool.submit(key=account or "", item=(account, payload["historyId"])):
+        raise RuntimeError("Notification pool is full")
+
+
+work_queue = SqliteWorkQueue(
+    path=WORK_QUEUE_PATH,
+    queue="emails",
+    max_attempts=WORK_QUEUE_MAX_ATTEMPTS,
+    retention=WORK_QUEUE_RETENTION
+)
+email_worker = QueueWorker(
+    name="emails",
+    queue=work_queue,
+    handler=process_job,
+    workers=EMAIL_WORKERS,
+    visibility_timeout=WORK_QUEUE_VISIBILITY_TIMEOUT,
+    poll_interval=WORK_QUEUE_POLL_INTERVAL,
+    retry_backoff=WORK_QUEUE_RETRY_BACKOFF
+)
+notification_pool = ShardedWorkerPool(
+    name="notifications",
+    handler=handle_notification,
+    shards=NOTIFICATION_SHARDS,
+    max_queue=NOTIFICATION_QUEUE_SIZE
+)
+notification_queue = SqliteWorkQueue(
+    path=WORK_QUEUE_PATH,
+    queue="notifications",
+    max_attempts=WORK_QUEUE_MAX_ATTEMPTS,
+    retention=WORK_QUEUE_RETENTION
+)
+notification_worker = QueueWorker(
+    name="notifications",
+    queue=notification_queue,
+    handler=relay_notification,
+    workers=1,
+    visibility_timeout=WORK_QUEUE_VISIBILITY_TIMEOUT,
+    poll_interval=WORK_QUEUE_POLL_INTERVAL,
+    retry_backoff=WORK_QUEUE_RETRY_BACKOFF
+)
+scheduler = Scheduler(state_path=SCHEDULER_STATE_PATH, retry_delay=SCHEDULER_RETRY_DELAY)
+leader = ProcessLock(path=LEADER_LOCK_PATH)
+leader_stop = threading.Event()
+backfill_lock = ProcessLock(path=BACKFILL_LOCK_PATH)
+startup.record(name="services", since=services_started)
+
+
+def renew_watch(engine: Optional[GmailSyncEngine] = None) -> dict:
+    engine = engine or sync_engine
+    mail_service = engine.mail_service
+    mail_service.ensure_service()
+    result = mail_service.execute(mail_service.service.users().watch(
+        userId="me",
+        body={
+            "topicName": GOOGLE_TOPIC_ID,
+            "labelIds": ["INBOX"],
+            "labelFilterBehavior": "INCLUDE"
+        }
+    ))
+    engine.seed(history_id=result.get("historyId"))
+    logger.info(f"[Gmail] Watch setup successful. Expires: {result.get('expiration')}, History ID: {result.get('historyId')}")
+    return result
+
+
+def next_watch_renewal(result: dict) -> float:
+    return max(int(result["expiration"]) / 1000 - WATCH_RENEW_MARGIN, time.time() + SCHEDULER_RETRY_DELAY)
+
+
+def schedule_account_watch(account: str) -> None:
+    def run() -> float:
+        engine = mailboxes.get(account)
+        if engine is None:
+            raise LookupError(f"Account {account} is not registered")
+        return next_watch_renewal(renew_watch(engine))
+
+    scheduler.add_job(name=f"renew_watch:{account}", func=run)
+
+
+def refresh_token() -> float:
+    expiry = service.refresh_credentials(margin=timedelta(seconds=TOKEN_REFRESH_AHEAD))
+    if not expiry:
+        return time.time() + 3600
+    return max(expiry.replace(tzinfo=timezone.utc).timestamp() - TOKEN_REFRESH_AHEAD, time.time() + 60)
+
+
+def watch_accounts() -> float:
+    scheduled = {name.split(":", 1)[1] for name in scheduler.status if name.startswith("renew_watch:")}
+    accounts = set(mailboxes.accounts)
+    for account in accounts - scheduled:
+        schedule_account_watch(account)
+    for account in scheduled - accounts:
+        scheduler.remove_job(name=f"renew_watch:{account}")
+    return time.time() + 60
+
+
+def purge_queue() -> float:
+    work_queue.purge()
+    notification_queue.purge()
+    return time.time() + 24 * 3600
+
+
+def warmup_tasks() -> dict:
+    tasks = {
+        "gmail_discovery": lambda: load_discovery_document("gmail", "v1"),
+        "gmail_client": lambda: importlib.import_module("googleapiclient.discovery")
+    }
+    if GOOGLE_TOKEN_JSON:
+        tasks["default_account"] = get_default_account
+    if llm:
+        tasks["openai_client"] = lambda: importlib.import_module("openai")
+        tasks["tokenizer"] = lambda: get_encoding(OPEN_AI_MODEL)
+    return tasks
+
+
+def lead() -> None:
+    while not leader.acquire():
+        if leader_stop.wait(LEADER_RETRY_INTERVAL):
+            return
+    logger.info(f"[Leader] Process {os.getpid()} runs the scheduler and the mailbox sync")
+    notification_pool.start()
+    notification_worker.start()
+    if SCHEDULER_ENABLED:
+        scheduler.add_job(name="refresh_token", func=refresh_token, persist=False)
+        scheduler.add_job(name="purge_queue", func=purge_queue)
+        if GOOGLE_TOPIC_ID:
+            scheduler.add_job(name="renew_watch", func=lambda: next_watch_renewal(renew_watch()))
+            scheduler.add_job(name="watch_accounts", func=watch_accounts, persist=False)
+        scheduler.start()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    email_worker.start()
+    leader_thread = threading.Thread(target=lead, name="leader", daemon=True)
+    leader_thread.start()
+    if STARTUP_WARMUP:
+        startup.warmup(tasks=warmup_tasks())
+    startup.mark_ready()
+    yield
+    leader_stop.set()
+    await run_in_threadpool(leader_thread.join)
+    scheduler.stop(timeout=SHUTDOWN_TIMEOUT)
+    backfill_runner.stop()
+    await run_in_threadpool(notification_worker.stop, SHUTDOWN_TIMEOUT)
+    await run_in_threadpool(notification_pool.stop, SHUTDOWN_TIMEOUT)
+    await run_in_threadpool(email_worker.stop, SHUTDOWN_TIMEOUT)
+    await run_in_threadpool(parse_pool.close)
+    if isinstance(llm, AsyncChatGptAnalyzer):
+        await run_in_threadpool(llm.close)
+    leader.release()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/ping")
@@ -24,6 +384,30 @@ def read_root():
     return {"message": "pong"}
 
 
+@app.get("/metrics")
+def get_metrics():
+    return {
+        "pools": [notification_pool.metrics, notification_worker.metrics, email_worker.metrics],
+        "queue": [work_queue.metrics, notification_queue.metrics],
+        "leader": leader.held,
+        "dedup": deduplicator.metrics,
+        "store": store.metrics if store else None,
+        "screen": screen.metrics if screen else None,
+        "parse": parse_pool.metrics,
+        "gmail_http": service.http_pool.metrics if service.http_pool else None,
+        "extractor": extractor.metrics,
+        "compactor": extractor.compactor.metrics if extractor.compactor else None,
+        "llm_cache": llm_cache.metrics,
+        "llm": llm.metrics if isinstance(llm, AsyncChatGptAnalyzer) else None,
+        "startup": startup.metrics,
+        "scheduler": scheduler.status,
+        "accounts": mailboxes.metrics,
+        "ledger": ledger.metrics,
+        "merchants": merchants.metrics,
+        "historyId": sync_engine.history_id
+    }
+
+
 @app.get("/authorize")
 async def authorize():
     auth_url, flow = service.get_authorization_url()
@@ -32,8 +416,22 @@ async def authorize():
 
 
 @app.get("/oauth2callback")
-async def oauth2callback(code: str, state: Optional[str] = None):
-    token = service.process_oauth_callback(code, state)
+def oauth2callback(code: str, state: Optional[str] = None):
+    authorized = WebGmailService(
+        client_id=GOOGLE_CLIENT_ID,
+        client_secret=GOOGLE_CLIENT_SECRET,
+        redirect_uri=OAUTH_REDIRECT_URI,
+        token=None,
+        scopes=GMAIL_SCOPES
+    )
+    token = authorized.process_oauth_callback(code, state)
+    authorized.ensure_service()
+    account = authorized.get_email_address()
+    if account and normalize_account(account) != get_default_account():
+        account = normalize_account(account)
+        mailboxes.register(account=account, token=token)
+        if SCHEDULER_ENABLED and GOOGLE_TOPIC_ID and leader.held:
+            schedule_account_watch(account)
     return {
         "message": "Autorización completada con éxito. Configura el siguiente token como variable de entorno GOOGLE_TOKEN_JSON en Railway:",
         "token": token
@@ -41,15 +439,13 @@ async def oauth2callback(code: str, state: Optional[str] = None):
 
 @app.get("/refresh")
 def get_refresh():
-    service.authenticate()
-    service.build_service()
+    service.ensure_service()
     return Response(content=service.token, media_type="application/json")
 
 @app.get("/emails/{email_id}")
 def get_email_by_id(email_id: str):
     try:
-        service.authenticate()
-        service.build_service()
+        service.ensure_service()
         email = service.get_email_by_id(email_id=email_id)
         return email.model_dump()
 
@@ -63,25 +459,14 @@ def get_email_by_id(email_id: str):
 @app.post("/setup-watch")
 def setup_gmail_watch():
     try:
-        service.authenticate()
-        service.build_service()
-        result = service.service.users().watch(
-            userId="me",
-            body={
-                "topicName": GOOGLE_TOPIC_ID,
-                "labelIds": ["INBOX"],
-                "labelFilterBehavior": "INCLUDE"
-            }
-        ).execute()
-
-        watch_expiration = result.get("expiration")
-        history_id = result.get("historyId")
-
-        logger.info(f"[Gmail] Watch setup successful. Expires: {watch_expiration}, History ID: {history_id}")
+        result = renew_watch()
+        if SCHEDULER_ENABLED and GOOGLE_TOPIC_ID and leader.held:
+            scheduler.reschedule(name="renew_watch", next_run=next_watch_renewal(result))
+
         return {
             "status": "success",
-            "expiration": watch_expiration,
-            "historyId": history_id
+            "expiration": result.get("expiration"),
+            "historyId": result.get("historyId")
         }
 
     except Exception as e:
@@ -100,21 +485,150 @@ async def receive_notification(request: Request):
         if "message" in data and "data" in data["message"]:
             message_data = json.loads(base64.b64decode(data["message"]["data"]).decode("utf-8"))
 
-            if message_data.get("emailId"):
-                email_id = message_data.get("emailId")
+            if message_data.get("historyId"):
+                history_id = int(message_data.get("historyId"))
+                message_key = f"pubsub:{data['message'].get('messageId') or history_id}"
+                if await run_in_threadpool(deduplicator.check_and_mark, message_key):
+                    return {"status": "duplicate", "message": "Notification already received", "historyId": history_id}
 
-                email = service.get_email_by_id(email_id=email_id)
+                logger.info(f"[Gmail] Notification for {message_data.get('emailAddress')} at history {history_id}")
 
-                logger.info(f"[Gmail] New email received: {email.subject}")
+                account = message_data.get("emailAddress")
+                try:
+                    await run_in_threadpool(
+                        notification_queue.enqueue, {"account": account, "historyId": history_id}, message_key
+                    )
+                except Exception as e:
+                    await run_in_threadpool(deduplicator.forget, message_key)
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=f"Notification could not be queued: {e}"
+                    )
+                notification_worker.notify()
 
-                return {"status": "success", "message": "Email processed", "data": data, "email": email.model_dump()}
+                return {"status": "accepted", "message": "Notification queued", "historyId": history_id}
 
         return {"status": "ignored", "message": "Not a valid email notification"}
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error(f"[Gmail] Error processing notification: {e}")
         return {"status": "error", "message": str(e)}
 
+
+def run_backfill(filters: str, limit: Optional[int], restart: bool) -> None:
+    try:
+        backfill_runner.run(filters=filters, limit=limit, restart=restart)
+    except Exception as e:
+        logger.error(f"[Backfill] Backfill failed, checkpoint kept: {e!r}")
+    finally:
+        backfill_lock.release()
+
+
+@app.post("/backfill", status_code=status.HTTP_202_ACCEPTED)
+def start_backfill(filters: str = "", limit: Optional[int] = None, restart: bool = False):
+    if not backfill_lock.acquire():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Backfill already running")
+
+    threading.Thread(
+        target=run_backfill,
+        kwargs={"filters": filters, "limit": limit, "restart": restart},
+        name="backfill",
+        daemon=True
+    ).start()
+    return {"status": "accepted", "message": "Backfill started", "filters": filters}
+
+
+@app.get("/backfill")
+def get_backfill():
+    return backfill_runner.status
+
+
+@app.get("/accounts")
+def get_accounts():
+    return {"accounts": mailboxes.accounts, **mailboxes.metrics}
+
+
+@app.delete("/accounts/{account}")
+def delete_account(account: str):
+    account = normalize_account(account)
+    mailboxes.remove(account)
+    if SCHEDULER_ENABLED and leader.held:
+        scheduler.remove_job(name=f"renew_watch:{account}")
+    return {"status": "success", "message": f"Account {account} removed"}
+
+
+@app.get("/queue/dead-letters")
+def get_dead_letters(limit: int = 100):
+    return {"jobs": work_queue.dead_letters(limit=limit)}
+
+
+@app.get("/queue/jobs/{job_id}/attempts")
+def get_job_attempts(job_id: int):
+    return {"id": job_id, "attempts": work_queue.attempts(job_id=job_id)}
+
+
+@app.post("/queue/jobs/{job_id}/requeue")
+def requeue_job(job_id: int):
+    if not work_queue.requeue(job_id=job_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Dead-lettered job {job_id} not found")
+    email_worker.notify()
+    return {"status": "success", "message": f"Job {job_id} requeued"}
+
+
+@app.get("/ledger/transactions")
+def get_transactions(start: Optional[str] = None, end: Optional[str] = None, limit: int = 100):
+    return {"transactions": ledger.transactions(start=start, end=end, limit=limit)}
+
+
+@app.delete("/ledger/transactions/{email_id}")
+def delete_transaction(email_id: str):
+    if not ledger.delete(email_id=email_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Transaction {email_id} not found")
+    return {"status": "success", "message": f"Transaction {email_id} deleted"}
+
+
+@app.get("/ledger/spend/{group}")
+def get_spend(group: str, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None):
+    if group not in GROUP_COLUMNS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown group {group}, expected one of: {', '.join(GROUP_COLUMNS)}"
+        )
+    spend = ledger.spend_by(group=group, start=start, end=end, limit=limit)
+    return {"group": group, "start": start, "end": end, "spend": spend}
+
+
+@app.get("/ledger/top-merchants")
+def get_top_merchants(n: int = 10, start: Optional[str] = None, end: Optional[str] = None):
+    return {"start": start, "end": end, "merchants": ledger.top_merchants(n=n, start=start, end=end)}
+
+
+@app.get("/merchants")
+def get_merchants():
+    return {"merchants": merchants.merchants()}
+
+
+@app.post("/merchants/aliases")
+def learn_merchant_alias(raw: str, merchant: str):
+    merchants.learn(raw=raw, merchant=merchant)
+    updated = ledger.normalize_merchants()
+    return {"status": "success", "message": f"{raw} mapped to {merchant}, {updated} transactions updated"}
+
+
+@app.get("/ledger/budgets")
+def get_budgets(month: Optional[str] = None):
+    month = month or datetime.now(timezone.utc).strftime("%Y-%m")
+    return {"month": month, "budgets": ledger.budget_status(month=month)}
+
+
+@app.get("/ledger/alerts")
+def get_budget_alerts(limit: int = 100):
+    return {"alerts": ledger.alerts(limit=limit)}
+
+
 @app.get("/renew-watch")
 def renew_gmail_watch():
     setup_gmail_watch()
@@ -0,0 +1,24 @@
+import sys
+import argparse
+from config.config import logger, LEDGER_PATH
+from src.service.ledger import SqliteLedger
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the ledger spending rollups from the transactions table")
+    parser.add_argument("--verify", action="store_true", help="Only check the rollups, exit with 1 if they drifted")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    ledger = SqliteLedger(path=LEDGER_PATH)
+    if args.verify:
+        mismatches = ledger.verify()
+        if mismatches:
+            logger.error(f"[Rollups] {mismatches} rollup rows do not match the transactions")
+            sys.exit(1)
+        logger.success(f"[Rollups] Rollups are consistent with the transactions")
+    else:
+        fixed = ledger.rebuild()
+        logger.success(f"[Rollups] Rollups rebuilt, {fixed} inconsistent rows fixed")
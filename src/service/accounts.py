@@ -0,0 +1,134 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from config import logger
+from collections import OrderedDict
+from typing import Callable, List
+from .gmail_sync import GmailSyncEngine
+
+
+def normalize_account(account: str) -> str:
+    return account.strip().lower()
+
+
+def account_slug(account: str) -> str:
+    return re.sub(r"[^\w.@-]", "_", normalize_account(account))
+
+
+class SqliteCredentialStore:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS accounts (account TEXT PRIMARY KEY, token TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info(f"[Accounts] SQLite credential store opened at {path}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+
+    def accounts(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT account FROM accounts ORDER BY account")]
+
+    def get(self, account: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT token FROM accounts WHERE account = ?", (normalize_account(account),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, account: str, token: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO accounts (account, token, updated_at) VALUES (?, ?, ?)",
+                (normalize_account(account), token, time.time())
+            )
+
+    def delete(self, account: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM accounts WHERE account = ?", (normalize_account(account),))
+
+
+class MailboxRegistry:
+    def __init__(
+            self,
+            credentials: SqliteCredentialStore,
+            factory: Callable[[str, str], GmailSyncEngine],
+            capacity: int = 32
+    ):
+        self._credentials = credentials
+        self._factory = factory
+        self._capacity = capacity
+        self._live = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "loads": 0, "evictions": 0, "unknown": 0}
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return {**self._counters, "live": len(self._live), "capacity": self._capacity}
+
+    @property
+    def accounts(self) -> List[str]:
+        return self._credentials.accounts()
+
+    def register(self, account: str, token: str) -> None:
+        account = normalize_account(account)
+        self._credentials.put(account, token)
+        self._drop(account)
+        logger.success(f"[Accounts] Account {account} registered")
+
+    def remove(self, account: str) -> None:
+        account = normalize_account(account)
+        self._credentials.delete(account)
+        self._drop(account)
+        logger.info(f"[Accounts] Account {account} removed")
+
+    def get(self, account: str) -> GmailSyncEngine | None:
+        account = normalize_account(account)
+        with self._lock:
+            engine = self._live.get(account)
+            if engine:
+                self._live.move_to_end(account)
+                self._counters["hits"] += 1
+                return engine
+
+        token = self._credentials.get(account)
+        if token is None:
+            with self._lock:
+                self._counters["unknown"] += 1
+            return None
+
+        engine = self._factory(account, token)
+        evicted = []
+        with self._lock:
+            engine = self._live.setdefault(account, engine)
+            self._live.move_to_end(account)
+            self._counters["loads"] += 1
+            while len(self._live) > self._capacity:
+                evicted.append(self._live.popitem(last=False))
+                self._counters["evictions"] += 1
+
+        for name, stale in evicted:
+            self._release(name, stale)
+        logger.info(f"[Accounts] Gmail client loaded for {account}")
+        return engine
+
+    def _drop(self, account: str) -> None:
+        with self._lock:
+            engine = self._live.pop(account, None)
+        if engine:
+            self._release(account, engine)
+
+    @staticmethod
+    def _release(account: str, engine: GmailSyncEngine) -> None:
+        if engine.mail_service.http_pool:
+            engine.mail_service.http_pool.clear()
+        logger.info(f"[Accounts] Gmail client for {account} released")
@@ -0,0 +1,229 @@
+import json
+import random
+import asyncio
+import threading
+from config import logger
+from typing import Callable, Dict, List, Optional
+from .model import LLMService
+from .llm_cache import LLMResponseCache, make_cache_key
+from .rate_limiter import AsyncTokenBucket
+from .chatgpt_analyzer import ChatGptAnalyzer, RESPONSE_FORMAT
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error: Exception) -> bool:
+    from openai import APIConnectionError, APIStatusError
+
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS
+    return isinstance(error, (APIConnectionError, asyncio.TimeoutError))
+
+
+def retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class AsyncChatGptAnalyzer(LLMService):
+    def __init__(
+            self,
+            model: str,
+            api_key: str,
+            cache: Optional[LLMResponseCache] = None,
+            max_concurrency: int = 8,
+            requests_per_minute: int = 500,
+            tokens_per_minute: int = 200_000,
+            completion_tokens: int = 200,
+            timeout: float = 30,
+            max_retries: int = 5,
+            backoff: float = 1.0,
+            base_url: Optional[str] = None
+    ):
+        self._model = model
+        self._api_key = api_key
+        self._base_url = base_url
+        self._client = None
+        self._cache = cache
+        self._max_concurrency = max_concurrency
+        self._requests_per_minute = requests_per_minute
+        self._tokens_per_minute = tokens_per_minute
+        self._completion_tokens = completion_tokens
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._request_bucket = None
+        self._token_bucket = None
+        self._start_lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0, "in_flight": 0}
+
+    @property
+    def metrics(self) -> dict:
+        return {
+            **self._counters,
+            "max_concurrency": self._max_concurrency,
+            "rate_limited_seconds": (self._request_bucket.waited + self._token_bucket.waited)
+            if self._request_bucket else 0.0
+        }
+
+    @staticmethod
+    def count_tokens(messages: List[dict], model: str) -> int:
+        return ChatGptAnalyzer.count_tokens(messages=messages, model=model)
+
+    def invoke(
+            self,
+            messages: List[dict],
+            cache_messages: Optional[List[dict]] = None,
+            bypass_cache: bool = False
+    ) -> dict:
+        return asyncio.run_coroutine_threadsafe(
+            self.ainvoke(messages, cache_messages=cache_messages, bypass_cache=bypass_cache), self._ensure_loop()
+        ).result()
+
+    def invoke_many(self, requests: List[List[dict]], cache_requests: Optional[List[List[dict]]] = None) -> List[dict]:
+        return asyncio.run_coroutine_threadsafe(
+            self.ainvoke_many(requests, cache_requests=cache_requests), self._ensure_loop()
+        ).result()
+
+    def invoke_batch(
+            self,
+            items: List[dict],
+            build_batch: Callable[[List[dict]], List[dict]],
+            build_single: Callable[[dict], List[dict]],
+            validate: Optional[Callable[[dict], bool]] = None,
+            build_key: Optional[Callable[[dict], List[dict]]] = None
+    ) -> Dict[str, dict]:
+        build_key = build_key or build_single
+        answers = self.invoke_many(
+            requests=[build_single(item) for item in items],
+            cache_requests=[build_key(item) for item in items]
+        )
+        return {item["id"]: answer for item, answer in zip(items, answers)}
+
+    async def ainvoke_many(
+            self,
+            requests: List[List[dict]],
+            cache_requests: Optional[List[List[dict]]] = None
+    ) -> List[dict]:
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is not loop:
+            return await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self.ainvoke_many(requests, cache_requests=cache_requests), loop)
+            )
+        answers = await asyncio.gather(
+            *(
+                self.ainvoke(messages, cache_messages=cache_messages)
+                for messages, cache_messages in zip(requests, cache_requests or requests)
+            ),
+            return_exceptions=True
+        )
+        for answer in answers:
+            if isinstance(answer, Exception):
+                logger.error(f"[ChatGpt] Request failed after retries: {answer!r}")
+        return [{} if isinstance(answer, Exception) else answer for answer in answers]
+
+    async def ainvoke(
+            self,
+            messages: List[dict],
+            cache_messages: Optional[List[dict]] = None,
+            bypass_cache: bool = False
+    ) -> dict:
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is not loop:
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+                self.ainvoke(messages, cache_messages=cache_messages, bypass_cache=bypass_cache), loop
+            ))
+        cache_key = None
+        if self._cache:
+            cache_key = make_cache_key(
+                model=self._model, messages=cache_messages or messages, response_format=RESPONSE_FORMAT
+            )
+        if cache_key and not bypass_cache:
+            answer = self._cache.get(cache_key)
+            if answer is not None:
+                return answer
+
+        tokens = self.count_tokens(messages=messages, model=self._model) + self._completion_tokens
+        for attempt in range(self._max_retries + 1):
+            await self._request_bucket.acquire(1)
+            await self._token_bucket.acquire(tokens)
+            try:
+                async with self._semaphore:
+                    self._counters["requests"] += 1
+                    self._counters["in_flight"] += 1
+                    try:
+                        completion = await asyncio.wait_for(
+                            self._client.chat.completions.create(
+                                model=self._model,
+                                messages=messages,
+                                response_format=RESPONSE_FORMAT
+                            ),
+                            timeout=self._timeout
+                        )
+                    finally:
+                        self._counters["in_flight"] -= 1
+                break
+
+            except Exception as error:
+                if not is_retryable(error) or attempt == self._max_retries:
+                    self._counters["failures"] += 1
+                    raise
+                delay = retry_after(error) or self._backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                logger.warning(f"[ChatGpt] Retryable error {error!r}, retrying in {delay:.2f}s")
+                self._counters["retries"] += 1
+                await asyncio.sleep(delay)
+
+        try:
+            answer = json.loads(completion.choices[0].message.content)
+        except (json.JSONDecodeError, KeyError, IndexError) as error:
+            logger.error(f"[ChatGpt] Error parsing the answer in JSON format: {error}")
+            return {}
+
+        if cache_key and answer:
+            usage = getattr(completion, "usage", None)
+            self._cache.put(cache_key, answer=answer, tokens=usage.total_tokens if usage else tokens)
+        return answer
+
+    def close(self) -> None:
+        with self._start_lock:
+            if self._loop is None:
+                return
+            if self._client is not None:
+                asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result()
+                self._client = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+        logger.info(f"[ChatGpt] Async client closed")
+
+    def _create_limits(self) -> None:
+        from openai import AsyncOpenAI
+
+        self._client = AsyncOpenAI(
+            api_key=self._api_key,
+            base_url=self._base_url,
+            max_retries=0,
+            timeout=self._timeout
+        )
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._request_bucket = AsyncTokenBucket(rate_per_minute=self._requests_per_minute)
+        self._token_bucket = AsyncTokenBucket(rate_per_minute=self._tokens_per_minute)
+        logger.info(f"[ChatGpt] Async OpenAI client created with model: {self._model}")
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                self._create_limits()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="llm-loop", daemon=True)
+                self._thread.start()
+            return self._loop
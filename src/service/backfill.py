@@ -0,0 +1,140 @@
+import os
+import json
+import threading
+from config import logger
+from typing import Callable, List, Optional
+from .dedup import Deduplicator
+from .screening import MessageScreen
+from .web_gmail import WebGmailService, Email
+
+
+class BackfillRunner:
+    def __init__(
+            self,
+            mail_service: WebGmailService,
+            on_emails: Callable[[List[Email]], None],
+            state_path: Optional[str] = None,
+            page_size: int = 500,
+            chunk_size: int = 100,
+            deduplicator: Optional[Deduplicator] = None,
+            screen: Optional[MessageScreen] = None
+    ):
+        self._mail_service = mail_service
+        self._on_emails = on_emails
+        self._state_path = state_path
+        self._page_size = page_size
+        self._chunk_size = chunk_size
+        self._deduplicator = deduplicator
+        self._screen = screen
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._running = False
+        self._state = self._load_state()
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def status(self) -> dict:
+        return {"running": self._running, **self._state}
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self, filters: str = "", limit: Optional[int] = None, restart: bool = False) -> int:
+        with self._lock:
+            if self._running:
+                logger.warning("[Backfill] Backfill already running")
+                return 0
+            self._running = True
+            self._stop.clear()
+
+        try:
+            self._save_state({**self._state, "error": None})
+            return self._run(filters=filters, limit=limit, restart=restart)
+        except Exception as error:
+            self._save_state({**self._state, "error": repr(error)})
+            raise
+        finally:
+            with self._lock:
+                self._running = False
+
+    def _run(self, filters: str, limit: Optional[int], restart: bool) -> int:
+        self._mail_service.ensure_service()
+        if restart or self._state.get("filters") != filters or self._state.get("done"):
+            self._save_state({
+                "filters": filters, "pageToken": None, "lastId": None, "processed": 0, "done": False, "error": None
+            })
+        else:
+            logger.info(f"[Backfill] Resuming after email {self._state['lastId']} ({self._state['processed']} done)")
+
+        processed = 0
+        page_token = self._state["pageToken"]
+        last_id = self._state["lastId"]
+        for email_ids, next_page_token in self._mail_service.iter_email_id_pages(
+                filters=filters, page_size=self._page_size, page_token=page_token
+        ):
+            if last_id in email_ids:
+                email_ids = email_ids[email_ids.index(last_id) + 1:]
+
+            for start in range(0, len(email_ids), self._chunk_size):
+                if self._stop.is_set() or (limit is not None and processed >= limit):
+                    logger.info(f"[Backfill] Stopped after {processed} emails, checkpoint kept")
+                    return processed
+
+                chunk = email_ids[start:start + self._chunk_size]
+                if limit is not None:
+                    chunk = chunk[:limit - processed]
+                if not self._process(chunk):
+                    logger.error(f"[Backfill] Fetching emails failed, checkpoint kept at {last_id}")
+                    self._save_state({**self._state, "error": f"Fetching emails after {last_id} failed"})
+                    return processed
+
+                processed += len(chunk)
+                last_id = chunk[-1]
+                self._save_state({**self._state, "pageToken": page_token, "lastId": last_id,
+                                  "processed": self._state["processed"] + len(chunk)})
+
+            page_token = next_page_token
+            last_id = None
+            self._save_state({**self._state, "pageToken": page_token, "lastId": None})
+
+        self._save_state({**self._state, "done": True})
+        logger.success(f"[Backfill] Backfill finished, {self._state['processed']} emails processed")
+        return processed
+
+    def _process(self, email_ids: List[str]) -> bool:
+        if self._deduplicator:
+            email_ids = [i for i in email_ids if not self._deduplicator.seen(f"gmail:{i}")]
+        if not email_ids:
+            return True
+
+        result = self._mail_service.fetch_emails(email_ids=email_ids, screen=self._screen)
+        if result is None:
+            return False
+        emails, skipped = result
+        if emails:
+            self._on_emails(emails)
+
+        missing = set(email_ids) - {email.id for email in emails} - set(skipped)
+        if missing:
+            logger.error(f"[Backfill] {len(missing)} emails could not be fetched")
+        return not missing
+
+    def _load_state(self) -> dict:
+        if self._state_path and os.path.isfile(self._state_path):
+            with open(self._state_path) as file:
+                state = json.load(file)
+                logger.info(f"[Backfill] Loaded checkpoint from {self._state_path}")
+                return state
+        return {"filters": None, "pageToken": None, "lastId": None, "processed": 0, "done": False, "error": None}
+
+    def _save_state(self, state: dict) -> None:
+        self._state = state
+        if self._state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self._state_path)), exist_ok=True)
+            tmp_path = f"{self._state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(state, file)
+            os.replace(tmp_path, self._state_path)
@@ -0,0 +1,55 @@
+import json
+from config import logger
+from typing import List, Optional, Sequence, Tuple
+
+
+class Budget:
+    def __init__(
+            self,
+            name: str,
+            limit: float,
+            transaction_type: Optional[str] = None,
+            merchant: Optional[str] = None,
+            thresholds: Sequence[float] = (0.8, 1.0)
+    ):
+        self.name = name
+        self.limit_cents = int(round(float(limit) * 100))
+        self.transaction_type = transaction_type
+        self.merchant = merchant
+        self.thresholds = tuple(sorted(thresholds))
+
+    def matches(self, transaction_type: str, merchant: str) -> bool:
+        if self.transaction_type and self.transaction_type != transaction_type:
+            return False
+        return not self.merchant or self.merchant == merchant
+
+    def rollup(self, month: str) -> Tuple[str, str]:
+        if self.merchant:
+            return "month_merchant", f"{month}|{self.merchant}"
+        if self.transaction_type:
+            return "month_type", f"{month}|{self.transaction_type}"
+        return "month", month
+
+    def crossed(self, before_cents: int, after_cents: int) -> List[float]:
+        return [t for t in self.thresholds if before_cents < t * self.limit_cents <= after_cents]
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "limit": self.limit_cents / 100,
+            "transaction_type": self.transaction_type,
+            "merchant": self.merchant,
+            "thresholds": list(self.thresholds)
+        }
+
+
+def parse_budgets(value: Optional[str]) -> List[Budget]:
+    if not value:
+        return []
+    try:
+        budgets = [Budget(**budget) for budget in json.loads(value)]
+    except (TypeError, ValueError) as error:
+        logger.error(f"[Budgets] Invalid budget configuration, budgets disabled: {error}")
+        return []
+    logger.info(f"[Budgets] {len(budgets)} monthly budgets configured")
+    return budgets
@@ -1,38 +1,214 @@
 import json
-import tiktoken
-from typing import List
+import threading
 from config import logger
-from openai import OpenAI
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from .model import LLMService
+from .llm_cache import LLMResponseCache, make_cache_key
+
+RESPONSE_FORMAT = {"type": "json_object"}
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> "tiktoken.Encoding":
+    import tiktoken
+
+    return tiktoken.encoding_for_model(model)
+
+
+def count_text_tokens(text: str, model: str) -> int:
+    return len(get_encoding(model).encode(text))
 
 
 class ChatGptAnalyzer(LLMService):
-    def __init__(self, model: str, api_key: str):
+    def __init__(
+            self,
+            model: str,
+            api_key: str,
+            cache: Optional[LLMResponseCache] = None,
+            batch_max_tokens: int = 8000,
+            batch_max_items: int = 20
+    ):
         self._model = model
-        self._client = OpenAI(api_key=api_key)
-        logger.info(f"[ChatGpt] OpenAI client created with model: {self._model}")
+        self._api_key = api_key
+        self._openai = None
+        self._client_lock = threading.Lock()
+        self._cache = cache
+        self._batch_max_tokens = batch_max_tokens
+        self._batch_max_items = batch_max_items
+
+    @property
+    def _client(self) -> "OpenAI":
+        with self._client_lock:
+            if self._openai is None:
+                from openai import OpenAI
+
+                self._openai = OpenAI(api_key=self._api_key)
+                logger.info(f"[ChatGpt] OpenAI client created with model: {self._model}")
+            return self._openai
+
+    @_client.setter
+    def _client(self, client) -> None:
+        self._openai = client
+
+    @property
+    def cache(self) -> LLMResponseCache | None:
+        return self._cache
+
+    def invoke(
+            self,
+            messages: List[dict],
+            cache_messages: Optional[List[dict]] = None,
+            bypass_cache: bool = False
+    ) -> dict:
+        cache_messages = cache_messages or messages
+        if self._cache and not bypass_cache:
+            answer = self._cached(messages=cache_messages)
+            if answer is not None:
+                logger.info(f"[ChatGpt] Answer served from cache")
+                return answer
+
+        answer, tokens = self._complete(messages=messages)
+        if self._cache and answer:
+            self._cache.put(self._cache_key(messages=cache_messages), answer=answer, tokens=tokens)
+        return answer
+
+    def invoke_batch(
+            self,
+            items: List[dict],
+            build_batch: Callable[[List[dict]], List[dict]],
+            build_single: Callable[[dict], List[dict]],
+            validate: Optional[Callable[[dict], bool]] = None,
+            build_key: Optional[Callable[[dict], List[dict]]] = None
+    ) -> Dict[str, dict]:
+        build_key = build_key or build_single
+        results = {}
+        pending = []
+        for item in items:
+            answer = self._cached(build_key(item))
+            if answer is not None:
+                results[item["id"]] = answer
+            else:
+                pending.append(item)
+
+        failed = []
+        for chunk in self._pack(items=pending, build_batch=build_batch):
+            if len(chunk) == 1:
+                failed.extend(chunk)
+                continue
 
-    def invoke(self, messages: List[dict]) -> dict:
-        logger.info(f"[ChatGpt] Calculating prompt number of tokens...")
-        tokens = self.count_tokens(messages=messages, model=self._model)
-        logger.info(f"[ChatGpt] Prompt of {tokens} tokens requested to the AI service")
+            answer, tokens = self._complete(messages=build_batch(chunk))
+            parsed = self._parse_batch_answer(answer=answer, chunk=chunk, validate=validate)
+            for item in chunk:
+                if item["id"] not in parsed:
+                    failed.append(item)
+                    continue
+                results[item["id"]] = parsed[item["id"]]
+                if self._cache:
+                    self._cache.put(
+                        self._cache_key(messages=build_key(item)),
+                        answer=parsed[item["id"]],
+                        tokens=tokens // len(chunk)
+                    )
+            logger.info(f"[ChatGpt] Batch of {len(chunk)} emails answered, {len(chunk) - len(parsed)} to retry")
+
+        for item in failed:
+            results[item["id"]] = self.invoke(messages=build_single(item), cache_messages=build_key(item))
+        return results
+
+    def write_batch_file(self, path: str, requests: Dict[str, List[dict]]) -> int:
+        with open(path, "w", encoding="utf-8") as file:
+            for custom_id, messages in requests.items():
+                file.write(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": {"model": self._model, "messages": messages, "response_format": RESPONSE_FORMAT}
+                }, ensure_ascii=False) + "\n")
+        logger.info(f"[ChatGpt] {len(requests)} requests written to batch file {path}")
+        return len(requests)
+
+    @staticmethod
+    def read_batch_results(path: str) -> Dict[str, dict]:
+        results = {}
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    logger.error(f"[ChatGpt] Batch request {record.get('custom_id')} failed: {record.get('error')}")
+                    continue
+                try:
+                    results[record["custom_id"]] = json.loads(response["body"]["choices"][0]["message"]["content"])
+                except (json.JSONDecodeError, KeyError, IndexError, TypeError) as error:
+                    logger.error(f"[ChatGpt] Error parsing batch answer {record.get('custom_id')}: {error}")
+        logger.info(f"[ChatGpt] {len(results)} answers read from batch results {path}")
+        return results
+
+    @staticmethod
+    def count_tokens(messages: List[dict], model: str) -> int:
+        return sum(count_text_tokens(message.get("content") or "", model) for message in messages)
+
+    def _complete(self, messages: List[dict]) -> Tuple[dict, int]:
         completion = self._client.chat.completions.create(
             model=self._model,
             messages=messages,
-            response_format={"type": "json_object"}
+            response_format=RESPONSE_FORMAT
         )
-        logger.info(f"[ChatGpt] Answer received from the AI service")
+        usage = getattr(completion, "usage", None)
+        tokens = usage.total_tokens if usage else self.count_tokens(messages=messages, model=self._model)
+        logger.info(f"[ChatGpt] Answer received from the AI service, {tokens} tokens used")
         try:
             answer = json.loads(completion.choices[0].message.content)
             logger.success(f"[ChatGpt] Answer successfully parsed in JSON format")
-            return answer
+            return answer, tokens
 
         except (json.JSONDecodeError, KeyError, IndexError) as error:
             logger.error(f"[ChatGpt] Error parsing the answer in JSON format: {error}")
-            return {}
+            return {}, tokens
+
+    def _cache_key(self, messages: List[dict]) -> str:
+        return make_cache_key(model=self._model, messages=messages, response_format=RESPONSE_FORMAT)
+
+    def _cached(self, messages: List[dict]) -> dict | None:
+        if not self._cache:
+            return None
+        return self._cache.get(self._cache_key(messages=messages))
+
+    def _pack(self, items: List[dict], build_batch: Callable[[List[dict]], List[dict]]) -> List[List[dict]]:
+        if not items:
+            return []
+
+        overhead = self.count_tokens(messages=build_batch([]), model=self._model)
+        chunks = [[]]
+        used = overhead
+        for item in items:
+            tokens = self.count_tokens(messages=[{"role": "user", "content": str(item)}], model=self._model)
+            chunk = chunks[-1]
+            if chunk and (used + tokens > self._batch_max_tokens or len(chunk) >= self._batch_max_items):
+                chunks.append([])
+                used = overhead
+            chunks[-1].append(item)
+            used += tokens
+        return chunks
 
     @staticmethod
-    def count_tokens(messages: List[dict], model: str) -> int:
-        encoding = tiktoken.encoding_for_model(model)
-        messages_text = json.dumps(messages, ensure_ascii=False)
-        return len(encoding.encode(messages_text))
+    def _parse_batch_answer(
+            answer: dict,
+            chunk: List[dict],
+            validate: Optional[Callable[[dict], bool]] = None
+    ) -> Dict[str, dict]:
+        ids = {item["id"] for item in chunk}
+        parsed = {}
+        results = answer.get("results") if isinstance(answer, dict) else None
+        for result in results if isinstance(results, list) else []:
+            if not isinstance(result, dict) or result.get("id") not in ids:
+                continue
+            result = dict(result)
+            email_id = result.pop("id")
+            if validate is None or validate(result):
+                parsed[email_id] = result
+        return parsed
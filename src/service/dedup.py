@@ -0,0 +1,144 @@
+import os
+import time
+import sqlite3
+import threading
+from config import logger
+from typing import Optional
+from collections import OrderedDict
+from .model import DedupStore
+
+
+class MemoryDedupStore(DedupStore):
+    def __init__(self, capacity: int = 10000, ttl: float = 7 * 24 * 3600):
+        self._capacity = capacity
+        self._ttl = ttl
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, key: str) -> bool:
+        added_at = self._entries.get(key)
+        if added_at is None:
+            return False
+        if time.time() - added_at > self._ttl:
+            del self._entries[key]
+            return False
+        self._entries.move_to_end(key)
+        return True
+
+    def add(self, key: str) -> None:
+        self._entries[key] = time.time()
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def add_if_absent(self, key: str) -> bool:
+        if self.contains(key):
+            return False
+        self.add(key)
+        return True
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class SqliteDedupStore(DedupStore):
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS dedup (key TEXT PRIMARY KEY, added_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS dedup_added_at ON dedup (added_at)")
+        self._conn.execute("DELETE FROM dedup WHERE added_at < ?", (time.time() - ttl,))
+        self._conn.commit()
+        logger.info(f"[Dedup] SQLite store opened at {path}")
+
+    def contains(self, key: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM dedup WHERE key = ? AND added_at >= ?", (key, time.time() - self._ttl)
+        ).fetchone()
+        return row is not None
+
+    def add(self, key: str) -> None:
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO dedup (key, added_at) VALUES (?, ?)", (key, time.time()))
+
+    def add_if_absent(self, key: str) -> bool:
+        now = time.time()
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO dedup (key, added_at) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET added_at = excluded.added_at WHERE dedup.added_at < ?",
+                (key, now, now - self._ttl)
+            )
+        return cursor.rowcount > 0
+
+    def discard(self, key: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM dedup WHERE key = ?", (key,))
+
+
+class Deduplicator:
+    def __init__(self, memory: MemoryDedupStore, persistent: Optional[DedupStore] = None):
+        self._memory = memory
+        self._persistent = persistent
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "memory_size": len(self._memory),
+                "persistent": self._persistent is not None
+            }
+
+    def seen(self, key: str) -> bool:
+        with self._lock:
+            return self._seen(key)
+
+    def mark(self, key: str) -> None:
+        with self._lock:
+            self._mark(key)
+
+    def check_and_mark(self, key: str) -> bool:
+        with self._lock:
+            if self._memory.contains(key):
+                return self._count(key=key, found=True)
+            store = self._persistent or self._memory
+            found = not store.add_if_absent(key)
+            self._memory.add(key)
+            return self._count(key=key, found=found)
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._memory.discard(key)
+            if self._persistent:
+                self._persistent.discard(key)
+
+    def _seen(self, key: str) -> bool:
+        found = self._memory.contains(key)
+        if not found and self._persistent and self._persistent.contains(key):
+            self._memory.add(key)
+            found = True
+        return self._count(key=key, found=found)
+
+    def _count(self, key: str, found: bool) -> bool:
+        if found:
+            self._hits += 1
+            logger.info(f"[Dedup] Duplicate skipped: {key}")
+        else:
+            self._misses += 1
+        return found
+
+    def _mark(self, key: str) -> None:
+        self._memory.add(key)
+        if self._persistent:
+            self._persistent.add(key)
@@ -0,0 +1,96 @@
+import json
+import time
+import random
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, List, Dict, Optional
+from config import logger
+from googleapiclient.errors import HttpError
+
+if TYPE_CHECKING:
+    from .http_pool import HttpPool
+
+DEFAULT_BATCH_SIZE = 50
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+def is_retryable(error: HttpError) -> bool:
+    if error.resp.status in RETRYABLE_STATUS:
+        return True
+
+    if error.resp.status == 403:
+        try:
+            content = json.loads(error.content)
+            reasons = {e.get("reason") for e in content.get("error", {}).get("errors", [])}
+            return bool(reasons & RATE_LIMIT_REASONS)
+        except (ValueError, AttributeError):
+            return False
+
+    return False
+
+
+def batch_get_messages(
+        service,
+        message_ids: List[str],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        message_format: str = "full",
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        metadata_headers: Optional[List[str]] = None,
+        fields: Optional[str] = None,
+        http_pool: Optional["HttpPool"] = None,
+        gone: Optional[List[str]] = None
+) -> List[dict]:
+    responses: Dict[str, dict] = {}
+    pending = list(dict.fromkeys(message_ids))
+    retry_ids: List[str] = []
+
+    def callback(request_id: str, response: dict, exception: HttpError):
+        if exception is None:
+            responses[request_id] = response
+        elif is_retryable(exception):
+            retry_ids.append(request_id)
+        elif exception.resp.status == 404:
+            logger.info(f"[Gmail] Email {request_id} no longer exists")
+            if gone is not None:
+                gone.append(request_id)
+        else:
+            logger.error(f"[Gmail] Error obtaining email {request_id}: {exception}")
+
+    for attempt in range(max_retries + 1):
+        retry_ids.clear()
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            batch = service.new_batch_http_request(callback=callback)
+            for message_id in chunk:
+                request = service.users().messages().get(
+                    userId="me",
+                    id=message_id,
+                    format=message_format,
+                    metadataHeaders=metadata_headers,
+                    fields=fields
+                )
+                batch.add(request, request_id=message_id)
+            try:
+                with http_pool.acquire() if http_pool else nullcontext() as http:
+                    batch.execute(http=http)
+            except HttpError as error:
+                if not is_retryable(error):
+                    raise
+                logger.warning(f"[Gmail] Batch of {len(chunk)} emails throttled: {error.resp.status}")
+                retry_ids.extend(chunk)
+
+        if not retry_ids:
+            break
+
+        if attempt == max_retries:
+            logger.error(f"[Gmail] Giving up on {len(retry_ids)} throttled emails after {max_retries} retries")
+            break
+
+        delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+        logger.warning(f"[Gmail] Retrying {len(retry_ids)} throttled emails in {delay:.2f}s")
+        time.sleep(delay)
+        pending = list(retry_ids)
+
+    logger.info(f"[Gmail] Batch fetched {len(responses)}/{len(message_ids)} emails")
+    return [responses[message_id] for message_id in dict.fromkeys(message_ids) if message_id in responses]
@@ -0,0 +1,199 @@
+import base64
+from config import logger
+from pydantic import BaseModel
+from email.message import Message
+from typing import Iterator, List, Optional, Tuple
+from ..utils import process_html, process_plain
+
+EMAIL_HEADERS = {"from": "sender", "to": "recipient", "date": "date", "subject": "subject", "content-type": "content_type"}
+BODY_TYPES = ("text/plain", "text/html")
+
+
+def header_map(headers: Optional[List[dict]]) -> dict:
+    return {h["name"].lower(): h["value"] for h in headers or []}
+
+
+def is_attachment(part: dict) -> bool:
+    body = part.get("body") or {}
+    disposition = header_map(part.get("headers")).get("content-disposition", "")
+    return bool(part.get("filename") or body.get("attachmentId") or disposition.lower().startswith("attachment"))
+
+
+def walk_parts(part: dict) -> Iterator[dict]:
+    if is_attachment(part):
+        return
+    children = part.get("parts")
+    if children:
+        for child in children:
+            yield from walk_parts(child)
+    else:
+        yield part
+
+
+def content_charset(part: dict) -> str:
+    content_type = header_map(part.get("headers")).get("content-type")
+    if not content_type:
+        return "utf-8"
+    message = Message()
+    message["content-type"] = content_type
+    return message.get_content_charset() or "utf-8"
+
+
+def select_body(payload: dict) -> Tuple[str | None, bytes | None]:
+    found = {}
+    for part in walk_parts(payload):
+        mime_type = (part.get("mimeType") or "").lower()
+        data = (part.get("body") or {}).get("data")
+        if mime_type in BODY_TYPES and data and mime_type not in found:
+            found[mime_type] = part
+            if mime_type == "text/plain":
+                break
+
+    for mime_type in BODY_TYPES:
+        part = found.get(mime_type)
+        if part:
+            raw = base64.urlsafe_b64decode(part["body"]["data"].encode("ASCII"))
+            charset = content_charset(part)
+            if charset.lower() not in ("utf-8", "utf8", "us-ascii", "ascii"):
+                try:
+                    raw = raw.decode(charset, errors="replace").encode("utf-8")
+                except LookupError:
+                    logger.warning(f"[Gmail] Unknown charset {charset}, decoding body as utf-8")
+            return mime_type, raw
+    return None, None
+
+
+class Email:
+    __slots__ = (
+        "id", "mimeType", "sender", "recipient", "date", "subject", "content_type", "body_type", "_raw", "_html",
+        "_text"
+    )
+    FIELDS = (
+        "id", "mimeType", "sender", "recipient", "date", "subject", "content_type", "body_type", "data", "html", "text"
+    )
+
+    def __init__(
+            self,
+            id: str,
+            mimeType: str,
+            sender: Optional[str] = None,
+            recipient: Optional[str] = None,
+            date: Optional[str] = None,
+            subject: Optional[str] = None,
+            content_type: Optional[str] = None,
+            body_type: Optional[str] = "text/html",
+            data: Optional[str] = None,
+            html: Optional[str] = None,
+            text: Optional[str] = None,
+            raw: Optional[bytes] = None
+    ):
+        self.id = id
+        self.mimeType = mimeType
+        self.sender = sender
+        self.recipient = recipient
+        self.date = date
+        self.subject = subject
+        self.content_type = content_type
+        self.body_type = body_type
+        self._raw = raw if raw is not None else (base64.urlsafe_b64decode(data.encode("ASCII")) if data else None)
+        self._html = html
+        self._text = text
+
+    @classmethod
+    def from_gmail(cls, response: dict) -> "Email":
+        payload = response["payload"]
+        body_type, raw = select_body(payload)
+        if body_type is None:
+            logger.warning(f"[Gmail] Email {response['id']} of type {payload.get('mimeType')} has no text body")
+
+        headers = header_map(payload.get("headers"))
+        return cls(
+            id=response["id"],
+            mimeType=payload.get("mimeType"),
+            body_type=body_type,
+            raw=raw,
+            **{field: headers.get(name) for name, field in EMAIL_HEADERS.items()}
+        )
+
+    @classmethod
+    def model_validate(cls, value: dict) -> "Email":
+        return cls(**{field: value.get(field) for field in cls.FIELDS if field in value})
+
+    @property
+    def data(self) -> str | None:
+        return base64.urlsafe_b64encode(self._raw).decode("ASCII") if self._raw is not None else None
+
+    @data.setter
+    def data(self, value: Optional[str]) -> None:
+        self._raw = base64.urlsafe_b64decode(value.encode("ASCII")) if value else None
+        self._html = None
+        self._text = None
+
+    @property
+    def html(self) -> str | None:
+        if self._html is None and self._raw is not None and self.body_type == "text/html":
+            self._html = self._raw.decode("utf-8", errors="replace")
+        return self._html
+
+    @html.setter
+    def html(self, value: Optional[str]) -> None:
+        self._html = value
+
+    @property
+    def text(self) -> str | None:
+        if self._text is None:
+            if self._html is not None:
+                self._text = process_html(html=self._html)
+            elif self._raw is not None and self.body_type == "text/plain":
+                self._text = process_plain(text=self._raw.decode("utf-8", errors="replace"))
+            elif self._raw is not None:
+                self._text = process_html(html=self._raw.decode("utf-8", errors="replace"))
+        return self._text
+
+    @text.setter
+    def text(self, value: Optional[str]) -> None:
+        self._text = value
+
+    def model_dump(self, exclude: Optional[set] = None) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS if not exclude or field not in exclude}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Email) and self.model_dump() == other.model_dump()
+
+    def __repr__(self) -> str:
+        return f"Email(id={self.id!r}, sender={self.sender!r}, subject={self.subject!r})"
+
+
+class Header(BaseModel):
+    name: str
+    value: str
+
+
+class Body(BaseModel):
+    data: Optional[str] = None
+    attachmentId: Optional[str] = None
+    size: Optional[int] = None
+
+
+class Part(BaseModel):
+    mimeType: str
+    filename: Optional[str] = None
+    headers: Optional[List[Header]] = None
+    body: Optional[Body] = None
+    parts: Optional[List["Part"]] = None
+
+
+class Payload(Part):
+    headers: List[Header]
+
+    def extract_headers(self, header_names: List[str]) -> dict:
+        headers = header_map([h.model_dump() for h in self.headers])
+        return {name: headers.get(name.lower()) for name in header_names}
+
+
+class Response(BaseModel):
+    id: str
+    payload: Payload
+
+    def parse(self) -> Email:
+        return Email.from_gmail(self.model_dump(exclude_none=True))
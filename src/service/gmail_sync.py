@@ -0,0 +1,146 @@
+import os
+import json
+import threading
+from config import logger
+from typing import Callable, List, Optional
+from googleapiclient.errors import HttpError
+from .dedup import Deduplicator
+from .screening import MessageScreen
+from .web_gmail import WebGmailService, Email
+
+
+class IncompleteSyncError(RuntimeError):
+    pass
+
+
+class GmailSyncEngine:
+    def __init__(
+            self,
+            mail_service: WebGmailService,
+            on_emails: Callable[[List[Email]], None],
+            state_path: Optional[str] = None,
+            resync_limit: int = 100,
+            deduplicator: Optional[Deduplicator] = None,
+            screen: Optional[MessageScreen] = None
+    ):
+        self._mail_service = mail_service
+        self._on_emails = on_emails
+        self._state_path = state_path
+        self._resync_limit = resync_limit
+        self._deduplicator = deduplicator
+        self._screen = screen
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending_history_id = None
+        self._history_id = self._load_state()
+
+    @property
+    def mail_service(self) -> WebGmailService:
+        return self._mail_service
+
+    @property
+    def history_id(self) -> int | None:
+        return self._history_id
+
+    def seed(self, history_id: int) -> None:
+        with self._lock:
+            if self._history_id is None:
+                logger.info(f"[Sync] Seeding history at {history_id}")
+                self._save_state(int(history_id))
+
+    def notify(self, history_id: int) -> bool:
+        with self._lock:
+            self._pending_history_id = max(self._pending_history_id or 0, int(history_id))
+            if self._running:
+                logger.info(f"[Sync] Sync in progress, history {history_id} coalesced")
+                return False
+            self._running = True
+
+        try:
+            while True:
+                with self._lock:
+                    target = self._pending_history_id
+                    self._pending_history_id = None
+                    if target is None or (self._history_id is not None and target <= self._history_id):
+                        self._running = False
+                        return True
+                self._sync()
+        except Exception:
+            with self._lock:
+                self._running = False
+            raise
+
+    def _sync(self) -> None:
+        self._mail_service.ensure_service()
+
+        if self._history_id is None:
+            logger.warning("[Sync] No saved history, running bounded resync")
+            self._resync()
+            return
+
+        try:
+            result = self._mail_service.get_history(start_history_id=self._history_id)
+        except HttpError as error:
+            if error.resp.status == 404:
+                logger.warning(f"[Sync] History {self._history_id} expired, running bounded resync")
+                self._resync()
+                return
+            raise
+
+        if result is None:
+            return
+
+        email_ids, history_id = result
+        if not self._process(email_ids=email_ids):
+            raise IncompleteSyncError(f"Not every email after history {self._history_id} was fetched, will retry")
+        self._save_state(history_id)
+        logger.success(f"[Sync] Synced {len(email_ids)} new emails up to history {history_id}")
+
+    def _resync(self) -> None:
+        history_id = self._mail_service.get_history_id()
+        if history_id is None:
+            return
+
+        email_ids = self._mail_service.get_email_ids(max_results=self._resync_limit, filters="")
+        if email_ids is None:
+            return
+
+        if not self._process(email_ids=email_ids):
+            raise IncompleteSyncError("Not every email of the resync was fetched, will retry")
+        self._save_state(history_id)
+        logger.success(f"[Sync] Resynced {len(email_ids)} recent emails up to history {history_id}")
+
+    def _process(self, email_ids: List[str]) -> bool:
+        if self._deduplicator:
+            email_ids = [i for i in email_ids if not self._deduplicator.seen(f"gmail:{i}")]
+        if not email_ids:
+            return True
+
+        result = self._mail_service.fetch_emails(email_ids=email_ids, screen=self._screen)
+        if result is None:
+            return False
+        emails, skipped = result
+        if emails:
+            self._on_emails(emails)
+
+        missing = set(email_ids) - {email.id for email in emails} - set(skipped)
+        if missing:
+            logger.error(f"[Sync] {len(missing)} emails could not be fetched, history not advanced")
+        return not missing
+
+    def _load_state(self) -> int | None:
+        if self._state_path and os.path.isfile(self._state_path):
+            with open(self._state_path) as file:
+                history_id = json.load(file).get("historyId")
+                logger.info(f"[Sync] Loaded history {history_id} from {self._state_path}")
+                return history_id
+        return None
+
+    def _save_state(self, history_id: int) -> None:
+        self._history_id = history_id
+        if self._state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self._state_path)), exist_ok=True)
+            tmp_path = f"{self._state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump({"historyId": history_id}, file)
+            os.replace(tmp_path, self._state_path)
@@ -0,0 +1,96 @@
+import time
+import queue
+import threading
+from config import logger
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+
+class HttpPool:
+    def __init__(self, factory: Callable[[], Any], size: int = 10):
+        self._factory = factory
+        self._size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._in_use = 0
+        self._counters = {"created": 0, "acquired": 0, "waits": 0, "wait_seconds": 0.0, "discarded": 0}
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"size": self._size, "idle": self._idle.qsize(), "in_use": self._in_use, **self._counters}
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        if not self._slots.acquire(blocking=False):
+            start = time.perf_counter()
+            self._slots.acquire()
+            with self._lock:
+                self._counters["waits"] += 1
+                self._counters["wait_seconds"] += time.perf_counter() - start
+
+        try:
+            generation, http = self._take()
+            try:
+                yield http
+            finally:
+                self._give(generation=generation, http=http)
+        finally:
+            self._slots.release()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+        discarded = self._drain()
+        logger.info(f"[HttpPool] Pool cleared, {discarded} idle transports discarded")
+
+    def _take(self) -> tuple:
+        with self._lock:
+            self._in_use += 1
+            self._counters["acquired"] += 1
+            current = self._generation
+
+        while True:
+            try:
+                generation, http = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if generation == current:
+                return generation, http
+            self._discard()
+
+        try:
+            http = self._factory()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+        with self._lock:
+            self._counters["created"] += 1
+        logger.debug(f"[HttpPool] New transport created")
+        return current, http
+
+    def _give(self, generation: int, http: Any) -> None:
+        with self._lock:
+            self._in_use -= 1
+            stale = generation != self._generation
+        if stale:
+            self._discard()
+        else:
+            self._idle.put((generation, http))
+
+    def _drain(self) -> int:
+        discarded = 0
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                return discarded
+            self._discard()
+            discarded += 1
+
+    def _discard(self) -> None:
+        with self._lock:
+            self._counters["discarded"] += 1
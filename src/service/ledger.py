@@ -0,0 +1,404 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from config import logger
+from typing import Callable, List, Optional, Tuple
+from .budgets import Budget
+from .merchants import MerchantDirectory
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+GROUP_COLUMNS = {"month": "month", "merchant": "merchant", "type": "transaction_type"}
+ROLLUP_DIMENSIONS = {
+    "day": "date",
+    "month": "month",
+    "merchant": "merchant",
+    "type": "transaction_type",
+    "month_type": "month || '|' || transaction_type",
+    "month_merchant": "month || '|' || merchant"
+}
+EXPECTED_ROLLUPS = " UNION ALL ".join(
+    f"SELECT '{dimension}' AS dimension, {expression} AS key, SUM(amount_cents) AS total_cents, COUNT(*) AS count "
+    f"FROM transactions GROUP BY {expression}"
+    for dimension, expression in ROLLUP_DIMENSIONS.items()
+)
+
+
+def to_cents(amount: float) -> int:
+    return int(round(float(amount) * 100))
+
+
+def merchant_name(transaction: dict, merchants: Optional[MerchantDirectory] = None) -> str:
+    name = " ".join((transaction.get("establishment") or transaction.get("beneficiary") or "").split())
+    if merchants and name:
+        name = merchants.resolve(name) or name
+    return name or "unknown"
+
+
+def rollup_keys(transaction_type: str, date: str, merchant: str) -> List[Tuple[str, str]]:
+    month = date[:7]
+    return [
+        ("day", date),
+        ("month", month),
+        ("merchant", merchant),
+        ("type", transaction_type),
+        ("month_type", f"{month}|{transaction_type}"),
+        ("month_merchant", f"{month}|{merchant}")
+    ]
+
+
+class SqliteLedger:
+    def __init__(
+            self,
+            path: str,
+            budgets: Optional[List[Budget]] = None,
+            on_alert: Optional[Callable[[dict], None]] = None,
+            merchants: Optional[MerchantDirectory] = None
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._budgets = list(budgets or [])
+        self._merchants = merchants
+        self._on_alert = on_alert
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transactions ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, email_id TEXT NOT NULL UNIQUE, account TEXT, "
+            "transaction_type TEXT NOT NULL, amount_cents INTEGER NOT NULL, date TEXT NOT NULL, month TEXT NOT NULL, "
+            "merchant TEXT NOT NULL, establishment TEXT, beneficiary TEXT, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS transactions_month ON transactions (month, amount_cents)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS transactions_merchant ON transactions (merchant, date, amount_cents)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS transactions_type ON transactions (transaction_type, date, amount_cents)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollups (dimension TEXT NOT NULL, key TEXT NOT NULL, "
+            "total_cents INTEGER NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (dimension, key)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS budget_alerts (budget TEXT NOT NULL, period TEXT NOT NULL, "
+            "threshold REAL NOT NULL, total_cents INTEGER NOT NULL, limit_cents INTEGER NOT NULL, "
+            "email_id TEXT NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (budget, period, threshold))"
+        )
+        self._conn.commit()
+        logger.info(f"[Ledger] SQLite ledger opened at {path}")
+
+        has_transactions = self._conn.execute("SELECT 1 FROM transactions LIMIT 1").fetchone()
+        has_rollups = self._conn.execute("SELECT 1 FROM rollups LIMIT 1").fetchone()
+        if has_transactions and not has_rollups:
+            self.rebuild()
+
+    @property
+    def budgets(self) -> List[Budget]:
+        return list(self._budgets)
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(amount_cents), 0) FROM transactions"
+            ).fetchone()
+        return {"transactions": count, "total": total / 100}
+
+    def record(self, email_id: str, transaction: dict, account: Optional[str] = None) -> bool:
+        if not transaction or not transaction.get("is_transaction"):
+            return False
+        try:
+            row = (
+                email_id,
+                account,
+                transaction["transaction_type"],
+                to_cents(transaction["amount"]),
+                transaction["date"],
+                transaction["date"][:7],
+                merchant_name(transaction, merchants=self._merchants),
+                transaction.get("establishment"),
+                transaction.get("beneficiary"),
+                time.time()
+            )
+            if not DATE_PATTERN.match(row[4]):
+                raise ValueError(f"date {row[4]!r} is not in YYYY-MM-DD format")
+            datetime.strptime(row[4], "%Y-%m-%d")
+            if row[3] <= 0:
+                raise ValueError(f"amount {transaction['amount']!r} is not positive")
+        except (KeyError, TypeError, ValueError, OverflowError) as error:
+            logger.error(f"[Ledger] Invalid transaction for email {email_id}: {error}")
+            return False
+
+        with self._lock, self._conn:
+            old = self._conn.execute(
+                "SELECT transaction_type, amount_cents, date, merchant FROM transactions WHERE email_id = ?", (email_id,)
+            ).fetchone()
+            before = self._budget_totals(transaction_type=row[2], month=row[5], merchant=row[6])
+            self._conn.execute(
+                "INSERT INTO transactions (email_id, account, transaction_type, amount_cents, date, month, merchant, "
+                "establishment, beneficiary, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (email_id) DO UPDATE SET account = excluded.account, "
+                "transaction_type = excluded.transaction_type, amount_cents = excluded.amount_cents, "
+                "date = excluded.date, month = excluded.month, merchant = excluded.merchant, "
+                "establishment = excluded.establishment, beneficiary = excluded.beneficiary",
+                row
+            )
+            if old:
+                self._apply(transaction_type=old[0], amount_cents=-old[1], date=old[2], merchant=old[3], count=-1)
+            self._apply(transaction_type=row[2], amount_cents=row[3], date=row[4], merchant=row[6], count=1)
+            alerts = self._check_budgets(before=before, email_id=email_id, month=row[5])
+        logger.info(f"[Ledger] Transaction from email {email_id} recorded: {row[6]} {row[3] / 100:.2f}")
+
+        for alert in alerts:
+            logger.warning(
+                f"[Budgets] Budget {alert['budget']} reached {alert['threshold']:.0%} in {alert['period']}: "
+                f"{alert['total']:.2f} of {alert['limit']:.2f}"
+            )
+            if self._on_alert:
+                self._on_alert(alert)
+        return True
+
+    def delete(self, email_id: str) -> bool:
+        with self._lock, self._conn:
+            old = self._conn.execute(
+                "SELECT transaction_type, amount_cents, date, merchant FROM transactions WHERE email_id = ?", (email_id,)
+            ).fetchone()
+            if not old:
+                return False
+            self._conn.execute("DELETE FROM transactions WHERE email_id = ?", (email_id,))
+            self._apply(transaction_type=old[0], amount_cents=-old[1], date=old[2], merchant=old[3], count=-1)
+        return True
+
+    def normalize_merchants(self) -> int:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT establishment, beneficiary, merchant FROM transactions"
+            ).fetchall()
+        changes = []
+        for establishment, beneficiary, merchant in rows:
+            canonical = merchant_name(
+                {"establishment": establishment, "beneficiary": beneficiary}, merchants=self._merchants
+            )
+            if canonical != merchant:
+                changes.append((canonical, establishment, beneficiary, merchant))
+        if not changes:
+            return 0
+
+        affected = {name for canonical, _, _, merchant in changes for name in (canonical, merchant)}
+        with self._lock, self._conn:
+            updated = sum(
+                self._conn.execute(
+                    "UPDATE transactions SET merchant = ? WHERE establishment IS ? AND beneficiary IS ? AND merchant = ?",
+                    change
+                ).rowcount
+                for change in changes
+            )
+            for name in affected:
+                self._conn.execute(
+                    "DELETE FROM rollups WHERE (dimension = 'merchant' AND key = ?) OR "
+                    "(dimension = 'month_merchant' AND substr(key, 9) = ?)",
+                    (name, name)
+                )
+                self._conn.execute(
+                    "INSERT INTO rollups (dimension, key, total_cents, count) "
+                    "SELECT 'merchant', merchant, SUM(amount_cents), COUNT(*) FROM transactions "
+                    "WHERE merchant = ? GROUP BY merchant "
+                    "UNION ALL SELECT 'month_merchant', month || '|' || merchant, SUM(amount_cents), COUNT(*) "
+                    "FROM transactions WHERE merchant = ? GROUP BY month",
+                    (name, name)
+                )
+        logger.info(f"[Ledger] {updated} transactions moved to canonical merchants")
+        return updated
+
+    def verify(self) -> int:
+        with self._lock:
+            return self._mismatches()
+
+    def rebuild(self) -> int:
+        with self._lock, self._conn:
+            mismatches = self._mismatches()
+            self._conn.execute("DELETE FROM rollups")
+            self._conn.execute(f"INSERT INTO rollups (dimension, key, total_cents, count) {EXPECTED_ROLLUPS}")
+        logger.info(f"[Ledger] Rollups rebuilt, {mismatches} inconsistent rows fixed")
+        return mismatches
+
+    def alerts(self, limit: int = 100) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT budget, period, threshold, total_cents, limit_cents, email_id, created_at FROM budget_alerts "
+                "ORDER BY created_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [
+            {
+                "budget": budget,
+                "period": period,
+                "threshold": threshold,
+                "total": total / 100,
+                "limit": limit_cents / 100,
+                "email_id": email_id,
+                "created_at": created_at
+            }
+            for budget, period, threshold, total, limit_cents, email_id, created_at in rows
+        ]
+
+    def budget_status(self, month: str) -> List[dict]:
+        with self._lock:
+            status = []
+            for budget in self._budgets:
+                total = self._rollup_total(*budget.rollup(month))
+                status.append({
+                    **budget.to_dict(),
+                    "period": month,
+                    "total": total / 100,
+                    "used": total / budget.limit_cents if budget.limit_cents else 0.0
+                })
+        return status
+
+    def get(self, email_id: str) -> dict | None:
+        rows = self._select("WHERE email_id = ?", (email_id,))
+        return rows[0] if rows else None
+
+    def transactions(self, start: Optional[str] = None, end: Optional[str] = None, limit: int = 100) -> List[dict]:
+        where, params = self._range(start=start, end=end)
+        return self._select(f"{where} ORDER BY date DESC, id DESC LIMIT ?", (*params, limit))
+
+    def spend_by(
+            self,
+            group: str,
+            start: Optional[str] = None,
+            end: Optional[str] = None,
+            limit: Optional[int] = None
+    ) -> List[dict]:
+        column = GROUP_COLUMNS[group]
+        if group == "month" or not (start or end):
+            return self._spend_from_rollups(group=group, start=start, end=end, limit=limit)
+        where, params = self._range(start=start, end=end)
+        query = (
+            f"SELECT {column}, SUM(amount_cents), COUNT(*) FROM transactions {where} "
+            f"GROUP BY {column} ORDER BY SUM(amount_cents) DESC"
+        )
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [{group: key, "total": cents / 100, "count": count} for key, cents, count in rows]
+
+    def top_merchants(self, n: int = 10, start: Optional[str] = None, end: Optional[str] = None) -> List[dict]:
+        return self.spend_by(group="merchant", start=start, end=end, limit=n)
+
+    def _spend_from_rollups(
+            self,
+            group: str,
+            start: Optional[str],
+            end: Optional[str],
+            limit: Optional[int]
+    ) -> List[dict]:
+        where, params = self._range(start=start, end=end, column="key", length=7)
+        where = f"{where} AND dimension = ?" if where else "WHERE dimension = ?"
+        order = "key" if group == "month" else "total_cents DESC"
+        query = f"SELECT key, total_cents, count FROM rollups {where} ORDER BY {order}"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._conn.execute(query, (*params, group)).fetchall()
+        return [{group: key, "total": cents / 100, "count": count} for key, cents, count in rows]
+
+    def _apply(self, transaction_type: str, amount_cents: int, date: str, merchant: str, count: int) -> None:
+        keys = rollup_keys(transaction_type=transaction_type, date=date, merchant=merchant)
+        self._conn.executemany(
+            "INSERT INTO rollups (dimension, key, total_cents, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (dimension, key) DO UPDATE SET "
+            "total_cents = total_cents + excluded.total_cents, count = count + excluded.count",
+            [(dimension, key, amount_cents, count) for dimension, key in keys]
+        )
+        if count < 0:
+            self._conn.executemany(
+                "DELETE FROM rollups WHERE dimension = ? AND key = ? AND count <= 0", keys
+            )
+
+    def _rollup_total(self, dimension: str, key: str) -> int:
+        row = self._conn.execute(
+            "SELECT total_cents FROM rollups WHERE dimension = ? AND key = ?", (dimension, key)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _budget_totals(self, transaction_type: str, month: str, merchant: str) -> dict:
+        return {
+            budget.name: self._rollup_total(*budget.rollup(month))
+            for budget in self._budgets if budget.matches(transaction_type=transaction_type, merchant=merchant)
+        }
+
+    def _check_budgets(self, before: dict, email_id: str, month: str) -> List[dict]:
+        alerts = []
+        for budget in self._budgets:
+            if budget.name not in before:
+                continue
+            after = self._rollup_total(*budget.rollup(month))
+            for threshold in budget.crossed(before_cents=before[budget.name], after_cents=after):
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO budget_alerts "
+                    "(budget, period, threshold, total_cents, limit_cents, email_id, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (budget.name, month, threshold, after, budget.limit_cents, email_id, time.time())
+                )
+                if cursor.rowcount:
+                    alerts.append({
+                        "budget": budget.name,
+                        "period": month,
+                        "threshold": threshold,
+                        "total": after / 100,
+                        "limit": budget.limit_cents / 100,
+                        "email_id": email_id
+                    })
+        return alerts
+
+    def _mismatches(self) -> int:
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM ("
+            f"SELECT dimension, key FROM (SELECT * FROM ({EXPECTED_ROLLUPS}) EXCEPT SELECT * FROM rollups) "
+            f"UNION SELECT dimension, key FROM (SELECT * FROM rollups EXCEPT SELECT * FROM ({EXPECTED_ROLLUPS})))"
+        ).fetchone()[0]
+
+    def _select(self, clause: str, params: tuple) -> List[dict]:
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT email_id, account, transaction_type, amount_cents, date, merchant, establishment, beneficiary "
+                f"FROM transactions {clause}",
+                params
+            )
+            rows = cursor.fetchall()
+        return [
+            {
+                "email_id": email_id,
+                "account": account,
+                "transaction_type": transaction_type,
+                "amount": cents / 100,
+                "date": date,
+                "merchant": merchant,
+                "establishment": establishment,
+                "beneficiary": beneficiary
+            }
+            for email_id, account, transaction_type, cents, date, merchant, establishment, beneficiary in rows
+        ]
+
+    @staticmethod
+    def _range(
+            start: Optional[str],
+            end: Optional[str],
+            column: str = "date",
+            length: int = 10
+    ) -> Tuple[str, tuple]:
+        conditions, params = [], []
+        if start:
+            conditions.append(f"{column} >= ?")
+            params.append(start[:length])
+        if end:
+            conditions.append(f"{column} <= ?")
+            params.append(end[:length])
+        return ("WHERE " + " AND ".join(conditions) if conditions else ""), tuple(params)
@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from config import logger
+from collections import OrderedDict
+from typing import List, Optional
+
+
+def normalize_messages(messages: List[dict]) -> List[dict]:
+    normalized = []
+    for message in messages:
+        message = dict(message)
+        if isinstance(message.get("content"), str):
+            message["content"] = " ".join(message["content"].split())
+        normalized.append(message)
+    return normalized
+
+
+def make_cache_key(model: str, messages: List[dict], response_format: Optional[dict] = None) -> str:
+    payload = json.dumps(
+        {"model": model, "messages": normalize_messages(messages), "response_format": response_format},
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            capacity: int = 1000,
+            max_entries: int = 100_000,
+            ttl: float = 30 * 24 * 3600
+    ):
+        self._capacity = capacity
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "tokens_saved": 0}
+        self._conn = None
+        self._disk_entries = 0
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, answer TEXT NOT NULL, tokens INTEGER NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_created_at ON llm_cache (created_at)")
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - ttl,))
+            self._conn.commit()
+            self._disk_entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            logger.info(f"[LLMCache] SQLite cache opened at {path}")
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            total = hits + self._counters["misses"]
+            return {**self._counters, "hit_rate": hits / total if total else 0.0, "memory_size": len(self._memory)}
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and time.time() - entry[2] <= self._ttl:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                self._counters["tokens_saved"] += entry[1]
+                return json.loads(entry[0])
+
+            if entry:
+                del self._memory[key]
+
+            if self._conn:
+                row = self._conn.execute(
+                    "SELECT answer, tokens, created_at FROM llm_cache WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self._ttl)
+                ).fetchone()
+                if row:
+                    self._remember(key, row)
+                    self._counters["disk_hits"] += 1
+                    self._counters["tokens_saved"] += row[1]
+                    return json.loads(row[0])
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, answer: dict, tokens: int = 0) -> None:
+        entry = (json.dumps(answer, ensure_ascii=False), tokens, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, answer, tokens, created_at) VALUES (?, ?, ?, ?)",
+                    (key, *entry)
+                )
+                self._disk_entries += 1
+                if self._disk_entries > self._max_entries:
+                    self._evict()
+                self._conn.commit()
+
+    def _evict(self) -> None:
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self._max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY created_at LIMIT ?)",
+                (count - self._max_entries,)
+            )
+            logger.info(f"[LLMCache] Evicted {count - self._max_entries} cached answers")
+        self._disk_entries = min(count, self._max_entries)
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._capacity:
+            self._memory.popitem(last=False)
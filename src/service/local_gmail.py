@@ -1,10 +1,9 @@
 import os
-from typing import Literal
 from config import logger
-from pydantic import BaseModel
 from typing import List, Optional
 from .model import MailService
-from ..utils import bs64_to_utf8, process_html
+from .gmail_batch import batch_get_messages, DEFAULT_BATCH_SIZE
+from .gmail_message import Email, Response
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
@@ -12,75 +11,6 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 
-class Header(BaseModel):
-    name: str
-    value: str
-
-
-class Body(BaseModel):
-    data: Optional[str] = None
-
-
-class Part(BaseModel):
-    mimeType: str
-    body: Body
-
-
-class Payload(BaseModel):
-    mimeType: Literal["text/html", "multipart/related"]
-    headers: List[Header]
-    body: Body
-    parts: Optional[List[Part]] = None
-
-    def extract_headers(self, header_names: List[str]) -> dict:
-        header_map = {h.name.lower(): h.value for h in self.headers}
-        return {name: header_map.get(name.lower()) for name in header_names}
-
-
-class Email(BaseModel):
-    id: str
-    mimeType: Literal["text/html", "multipart/related"]
-    sender: Optional[str] = None
-    recipient: Optional[str] = None
-    date: Optional[str] = None
-    subject: Optional[str] = None
-    content_type: Optional[str] = None
-    data: Optional[str] = None
-    html: Optional[str] = None
-    text: Optional[str] = None
-
-
-class Response(BaseModel):
-    id: str
-    payload: Payload
-
-    def parse(self) -> Email:
-        headers_needed = ["From", "To", "Date", "Subject", "Content-Type"]
-        extracted_headers = self.payload.extract_headers(headers_needed)
-
-        email = Email(
-            id=self.id,
-            mimeType=self.payload.mimeType,
-            sender=extracted_headers.get("From"),
-            recipient=extracted_headers.get("To"),
-            date=extracted_headers.get("Date"),
-            subject=extracted_headers.get("Subject"),
-            content_type=extracted_headers.get("Content-Type")
-        )
-
-        if self.payload.mimeType == "text/html":
-            email.data = self.payload.body.data
-
-        elif self.payload.mimeType == "multipart/related":
-            if len(self.payload.parts) > 1:
-                logger.warning(f"[Gmail] {self.payload.mimeType} email: {self.id} with more than one parts")
-            email.data = self.payload.parts[0].body.data
-
-        email.html = bs64_to_utf8(encoded_data=email.data)
-        email.text = process_html(html=email.html)
-        return email
-
-
 class LocalGmailService(MailService):
     def __init__(self):
         self._credentials = None
@@ -130,7 +60,7 @@ class LocalGmailService(MailService):
             logger.error("[Gmail] Credentials not found, building service process failed")
         self._service = service
 
-    def get_emails(self, max_results: int, filters: str) -> List[Email] | None:
+    def get_emails(self, max_results: int, filters: str, batch_size: Optional[int] = DEFAULT_BATCH_SIZE) -> List[Email] | None:
         if self._service:
             try:
                 results = self._service.users().messages().list(
@@ -148,12 +78,18 @@ class LocalGmailService(MailService):
 
                 else:
                     logger.info(f"[Gmail] Getting {max_results} emails information...")
-                    responses = [
-                        self._service.users().messages().get(userId="me", id=msj.get("id"), format="full").execute() for
-                        msj
-                        in messages
-                    ]
-                    emails = [Response.model_validate(rsp).parse() for rsp in responses]
+                    if batch_size:
+                        responses = batch_get_messages(
+                            service=self._service,
+                            message_ids=[msj.get("id") for msj in messages],
+                            batch_size=batch_size
+                        )
+                    else:
+                        responses = [
+                            self._service.users().messages().get(userId="me", id=msj.get("id"), format="full").execute()
+                            for msj in messages
+                        ]
+                    emails = [Email.from_gmail(rsp) for rsp in responses]
                     logger.success(f"[Gmail] Information successfully extracted for {max_results} emails")
                     return emails
 
@@ -174,7 +110,7 @@ class LocalGmailService(MailService):
                     id=email_id,
                     format="full"
                 ).execute()
-                email = Response.model_validate(response).parse()
+                email = Email.from_gmail(response)
                 logger.success(f"[Gmail] Email {email_id} retrieved and parsed successfully")
                 return email
 
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import unicodedata
+from config import logger
+from typing import Dict, Iterable, List, Optional, Set
+from collections import Counter, OrderedDict
+
+
+def normalize_text(raw: str) -> str:
+    text = unicodedata.normalize("NFKD", raw or "")
+    text = "".join(char if char.isalnum() else " " for char in text if not unicodedata.combining(char))
+    return " ".join(token for token in text.casefold().split() if not token.isdigit())
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MerchantDirectory:
+    def __init__(self, path: str, threshold: float = 0.6, memo_capacity: int = 10000):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._threshold = threshold
+        self._memo_capacity = memo_capacity
+        self._lock = threading.Lock()
+        self._names: Dict[int, str] = {}
+        self._ids: Dict[str, int] = {}
+        self._aliases: List[tuple] = []
+        self._alias_ids: Dict[str, int] = {}
+        self._index: Dict[str, List[int]] = {}
+        self._memo = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "exact": 0, "fuzzy": 0, "unmatched": 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS merchants (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS merchant_aliases (alias TEXT PRIMARY KEY, merchant_id INTEGER NOT NULL, "
+            "source TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        for merchant_id, name in self._conn.execute("SELECT id, name FROM merchants"):
+            self._names[merchant_id] = name
+            self._ids[name] = merchant_id
+        for alias, merchant_id in self._conn.execute("SELECT alias, merchant_id FROM merchant_aliases"):
+            self._index_alias(alias=alias, merchant_id=merchant_id)
+        logger.info(f"[Merchants] Directory opened at {path} with {len(self._names)} merchants")
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "merchants": len(self._names),
+                "aliases": len(self._alias_ids),
+                "trigrams": len(self._index),
+                "memo": len(self._memo),
+                **self._counters
+            }
+
+    def merchants(self) -> List[dict]:
+        with self._lock:
+            counts = Counter(merchant_id for merchant_id, _ in self._aliases)
+            return [
+                {"id": merchant_id, "name": name, "aliases": counts[merchant_id]}
+                for merchant_id, name in sorted(self._names.items(), key=lambda item: item[1].casefold())
+            ]
+
+    def add(self, name: str, aliases: Iterable[str] = (), source: str = "dictionary") -> int:
+        with self._lock, self._conn:
+            return self._add(name=name, aliases=aliases, source=source)
+
+    def learn(self, raw: str, merchant: str) -> int:
+        merchant_id = self.add(name=merchant, aliases=(raw,), source="learned")
+        logger.info(f"[Merchants] Learned alias {raw!r} for {merchant}")
+        return merchant_id
+
+    def load(self, path: str) -> int:
+        with open(path) as file:
+            dictionary = json.load(file)
+        with self._lock, self._conn:
+            for name, aliases in dictionary.items():
+                self._add(name=name, aliases=aliases, source="dictionary")
+        logger.info(f"[Merchants] Loaded {len(dictionary)} merchants from {path}")
+        return len(dictionary)
+
+    def match(self, raw: str) -> Optional[int]:
+        with self._lock:
+            if raw in self._memo:
+                self._memo.move_to_end(raw)
+                self._counters["hits"] += 1
+                return self._memo[raw]
+            self._counters["misses"] += 1
+
+            text = normalize_text(raw)
+            alias_id = self._alias_ids.get(text)
+            if alias_id is not None:
+                merchant_id = self._aliases[alias_id][0]
+                self._counters["exact"] += 1
+            else:
+                merchant_id = self._fuzzy(text) if text else None
+                self._counters["fuzzy" if merchant_id is not None else "unmatched"] += 1
+
+            self._memo[raw] = merchant_id
+            while len(self._memo) > self._memo_capacity:
+                self._memo.popitem(last=False)
+            return merchant_id
+
+    def resolve(self, raw: str) -> Optional[str]:
+        merchant_id = self.match(raw)
+        return None if merchant_id is None else self._names[merchant_id]
+
+    def _fuzzy(self, text: str) -> Optional[int]:
+        grams = trigrams(text)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._index.get(gram, ()))
+
+        best_score, best_id = self._threshold, None
+        for alias_id, count in shared.items():
+            merchant_id, size = self._aliases[alias_id]
+            score = 2 * count / (len(grams) + size)
+            if score >= best_score:
+                best_score, best_id = score, merchant_id
+        return best_id
+
+    def _add(self, name: str, aliases: Iterable[str], source: str) -> int:
+        name = " ".join(name.split())
+        merchant_id = self._ids.get(name)
+        if merchant_id is None:
+            merchant_id = self._conn.execute("INSERT INTO merchants (name) VALUES (?)", (name,)).lastrowid
+            self._names[merchant_id] = name
+            self._ids[name] = merchant_id
+        for alias in (name, *aliases):
+            self._add_alias(alias=normalize_text(alias), merchant_id=merchant_id, source=source)
+        return merchant_id
+
+    def _add_alias(self, alias: str, merchant_id: int, source: str) -> None:
+        if not alias:
+            return
+        self._conn.execute(
+            "INSERT INTO merchant_aliases (alias, merchant_id, source, created_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (alias) DO UPDATE SET merchant_id = excluded.merchant_id, source = excluded.source "
+            "WHERE excluded.source = 'learned' OR merchant_aliases.source != 'learned'",
+            (alias, merchant_id, source, time.time())
+        )
+        merchant_id = self._conn.execute(
+            "SELECT merchant_id FROM merchant_aliases WHERE alias = ?", (alias,)
+        ).fetchone()[0]
+        self._index_alias(alias=alias, merchant_id=merchant_id)
+        self._memo.clear()
+
+    def _index_alias(self, alias: str, merchant_id: int) -> None:
+        grams = trigrams(alias)
+        alias_id = self._alias_ids.get(alias)
+        if alias_id is not None:
+            self._aliases[alias_id] = (merchant_id, len(grams))
+            return
+        alias_id = len(self._aliases)
+        self._aliases.append((merchant_id, len(grams)))
+        self._alias_ids[alias] = alias_id
+        for gram in grams:
+            self._index.setdefault(gram, []).append(alias_id)
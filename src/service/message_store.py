@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from config import logger
+from typing import Callable, Dict, List, Optional
+from .model import MessageStore
+from .web_gmail import Email
+from .parse_pool import parse_response
+from ..utils import PARSER_VERSION
+
+SCHEMA_VERSION = 1
+
+
+def _pack(value: dict) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def _unpack(value: bytes) -> dict:
+    return json.loads(zlib.decompress(value).decode("utf-8"))
+
+
+class SqliteMessageStore(MessageStore):
+    def __init__(
+            self,
+            path: str,
+            keep_raw: bool = True,
+            max_raw_bytes: int = 256 * 1024 * 1024,
+            parser: Callable[[dict], Email] = parse_response
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._keep_raw = keep_raw
+        self._max_raw_bytes = max_raw_bytes
+        self._parser = parser
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self._raw_bytes = self._conn.execute("SELECT COALESCE(SUM(raw_size), 0) FROM emails").fetchone()[0]
+        logger.info(f"[Store] SQLite message store opened at {path}")
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM emails").fetchone()[0]
+            return {
+                "emails": count,
+                "raw_bytes": self._raw_bytes,
+                "max_raw_bytes": self._max_raw_bytes,
+                "hits": self._hits,
+                "misses": self._misses
+            }
+
+    def get(self, email_id: str) -> Email | None:
+        return self.get_many([email_id]).get(email_id)
+
+    def get_many(self, email_ids: List[str]) -> Dict[str, Email]:
+        if not email_ids:
+            return {}
+
+        with self._lock:
+            emails = {}
+            for start in range(0, len(email_ids), 500):
+                chunk = email_ids[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT id, parser_version, email, raw FROM emails WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for email_id, parser_version, email, raw in rows:
+                    if parser_version < PARSER_VERSION and raw is not None:
+                        emails[email_id] = self._reparse(email_id=email_id, raw=raw)
+                    else:
+                        emails[email_id] = Email.model_validate(_unpack(email))
+
+            if emails:
+                self._conn.execute(
+                    f"UPDATE emails SET accessed_at = ? WHERE id IN ({','.join('?' * len(emails))})",
+                    [time.time(), *emails]
+                )
+                self._conn.commit()
+            self._hits += len(emails)
+            self._misses += len(email_ids) - len(emails)
+            return emails
+
+    def get_raw(self, email_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT raw FROM emails WHERE id = ?", (email_id,)).fetchone()
+            return _unpack(row[0]) if row and row[0] is not None else None
+
+    def put(self, email: Email, raw: Optional[dict] = None) -> None:
+        raw_blob = _pack(raw) if raw is not None and self._keep_raw else None
+        raw_size = len(raw_blob) if raw_blob else 0
+        now = time.time()
+
+        with self._lock:
+            previous = self._conn.execute("SELECT raw_size FROM emails WHERE id = ?", (email.id,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO emails "
+                "(id, parser_version, sender, date, subject, email, raw, raw_size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (email.id, PARSER_VERSION, email.sender, email.date, email.subject,
+                 _pack(email.model_dump(exclude={"html"})), raw_blob, raw_size, now, now)
+            )
+            self._raw_bytes += raw_size - (previous[0] if previous else 0)
+            self._evict_raw()
+            self._conn.commit()
+
+    def reparse_all(self) -> int:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, raw FROM emails WHERE parser_version < ? AND raw IS NOT NULL", (PARSER_VERSION,)
+            ).fetchall()
+            for email_id, raw in rows:
+                self._reparse(email_id=email_id, raw=raw)
+            self._conn.commit()
+        logger.success(f"[Store] Re-derived {len(rows)} emails with parser version {PARSER_VERSION}")
+        return len(rows)
+
+    def _reparse(self, email_id: str, raw: bytes) -> Email:
+        email = self._parser(_unpack(raw))
+        self._conn.execute(
+            "UPDATE emails SET parser_version = ?, email = ? WHERE id = ?",
+            (PARSER_VERSION, _pack(email.model_dump(exclude={"html"})), email_id)
+        )
+        return email
+
+    def _evict_raw(self) -> None:
+        if self._raw_bytes <= self._max_raw_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT id, raw_size FROM emails WHERE raw IS NOT NULL ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for email_id, raw_size in rows:
+            if self._raw_bytes <= self._max_raw_bytes:
+                break
+            evicted.append(email_id)
+            self._raw_bytes -= raw_size
+
+        self._conn.executemany("UPDATE emails SET raw = NULL, raw_size = 0 WHERE id = ?", [(i,) for i in evicted])
+        logger.info(f"[Store] Evicted raw payload of {len(evicted)} emails")
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS emails (
+                    id TEXT PRIMARY KEY,
+                    parser_version INTEGER NOT NULL,
+                    sender TEXT,
+                    date TEXT,
+                    subject TEXT,
+                    email BLOB NOT NULL,
+                    raw BLOB,
+                    raw_size INTEGER NOT NULL DEFAULT 0,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS emails_accessed_at ON emails (accessed_at);
+            """)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
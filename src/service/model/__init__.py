@@ -1,2 +1,5 @@
 from .mail_service import MailService
-from .llm_service import LLMService
\ No newline at end of file
+from .llm_service import LLMService
+from .dedup_store import DedupStore
+from .message_store import MessageStore
+from .work_queue import WorkQueue
\ No newline at end of file
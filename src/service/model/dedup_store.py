@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class DedupStore(ABC):
+    @abstractmethod
+    def contains(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def add(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def add_if_absent(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def discard(self, key: str) -> None:
+        pass
@@ -1,9 +1,20 @@
-from typing import List
+from typing import Callable, Dict, List, Optional
 from abc import ABC, abstractmethod
 
 
 class LLMService(ABC):
 
     @abstractmethod
-    def invoke(self, messages: List[dict]) -> dict:
+    def invoke(self, messages: List[dict], cache_messages: Optional[List[dict]] = None) -> dict:
         pass
+
+    def invoke_batch(
+            self,
+            items: List[dict],
+            build_batch: Callable[[List[dict]], List[dict]],
+            build_single: Callable[[dict], List[dict]],
+            validate: Optional[Callable[[dict], bool]] = None,
+            build_key: Optional[Callable[[dict], List[dict]]] = None
+    ) -> Dict[str, dict]:
+        build_key = build_key or build_single
+        return {item["id"]: self.invoke(messages=build_single(item), cache_messages=build_key(item)) for item in items}
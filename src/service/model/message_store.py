@@ -0,0 +1,16 @@
+from typing import Any, Dict, List, Optional
+from abc import ABC, abstractmethod
+
+
+class MessageStore(ABC):
+    @abstractmethod
+    def get(self, email_id: str) -> Any | None:
+        pass
+
+    @abstractmethod
+    def get_many(self, email_ids: List[str]) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def put(self, email: Any, raw: Optional[dict] = None) -> None:
+        pass
@@ -0,0 +1,36 @@
+from typing import List, Optional
+from abc import ABC, abstractmethod
+
+
+class WorkQueue(ABC):
+    @abstractmethod
+    def enqueue(self, payload: dict, key: Optional[str] = None, delay: float = 0) -> bool:
+        pass
+
+    @abstractmethod
+    def lease(self, worker: str, limit: int = 1, visibility_timeout: float = 60) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def extend(self, job_id: int, worker: str, visibility_timeout: float = 60) -> bool:
+        pass
+
+    @abstractmethod
+    def ack(self, job_id: int, worker: str) -> bool:
+        pass
+
+    @abstractmethod
+    def nack(self, job_id: int, worker: str, error: str, delay: float = 0) -> bool:
+        pass
+
+    @abstractmethod
+    def attempts(self, job_id: int) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def dead_letters(self, limit: int = 100) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def requeue(self, job_id: int) -> bool:
+        pass
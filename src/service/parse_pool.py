@@ -0,0 +1,72 @@
+import threading
+import multiprocessing
+from config import logger
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+from .web_gmail import Email
+
+
+def parse_response(raw: dict) -> Email:
+    return Email.from_gmail(raw)
+
+
+def parse_chunk(responses: List[dict], parser: Callable[[dict], Email] = parse_response) -> List[Email]:
+    emails = [parser(raw) for raw in responses]
+    for email in emails:
+        email.text = email.text
+    return emails
+
+
+class ParsePool:
+    def __init__(
+            self,
+            workers: int = 4,
+            chunk_size: int = 16,
+            min_batch: int = 64,
+            parser: Callable[[dict], Email] = parse_response,
+            start_method: str = "spawn"
+    ):
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._min_batch = min_batch
+        self._parser = parser
+        self._start_method = start_method
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counters = {"inline": 0, "pooled": 0}
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"workers": self._workers, **self._counters}
+
+    def parse_many(self, responses: List[dict]) -> List[Email]:
+        if self._workers <= 1 or len(responses) < self._min_batch:
+            with self._lock:
+                self._counters["inline"] += len(responses)
+            return [self._parser(raw) for raw in responses]
+
+        chunks = [responses[i:i + self._chunk_size] for i in range(0, len(responses), self._chunk_size)]
+        emails = [email for chunk in self._ensure_executor().map(partial(parse_chunk, parser=self._parser), chunks)
+                  for email in chunk]
+        with self._lock:
+            self._counters["pooled"] += len(responses)
+        return emails
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+            logger.info(f"[Parse] Process pool with {self._workers} workers stopped")
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context(self._start_method)
+                )
+                logger.info(f"[Parse] Process pool started with {self._workers} workers")
+            return self._executor
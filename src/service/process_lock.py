@@ -0,0 +1,43 @@
+import os
+import fcntl
+import threading
+from config import logger
+
+
+class ProcessLock:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self._file is not None:
+                return False
+            file = open(self._path, "a+")
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                file.close()
+                return False
+            file.seek(0)
+            file.truncate()
+            file.write(str(os.getpid()))
+            file.flush()
+            self._file = file
+        logger.info(f"[Lock] {self._path} acquired by process {os.getpid()}")
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        logger.info(f"[Lock] {self._path} released by process {os.getpid()}")
@@ -0,0 +1,113 @@
+import re
+import threading
+from config import logger
+from collections import Counter, OrderedDict
+from email.utils import parseaddr
+from typing import Callable, List, Optional
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+RELEVANT_PATTERN = re.compile(
+    r"\$|\bUSD\b|monto|valor|total|fecha|comercio|establecimiento|beneficiari|contacto|transferencia|consumo|"
+    r"tarjeta|pago|compra|amount|date|merchant|card|payment|\d{1,2}/\w+/\d{2,4}",
+    re.IGNORECASE
+)
+BOILERPLATE_PATTERN = re.compile(
+    r"no respond|confidencial|destinatario|unsubscribe|darte de baja|desuscrib|no imprimir|privacidad|privacy|"
+    r"derechos reservados|all rights reserved|nunca te (?:requerir|solicitar|pedir)|call center",
+    re.IGNORECASE
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in SENTENCE_PATTERN.split(text or "") if sentence.strip()]
+
+
+def is_relevant(sentence: str) -> bool:
+    return bool(RELEVANT_PATTERN.search(sentence))
+
+
+class PromptCompactor:
+    def __init__(
+            self,
+            count_tokens: Callable[[str], int],
+            max_tokens: int = 1500,
+            min_occurrences: int = 3,
+            max_senders: int = 1000,
+            max_sentences: int = 2000
+    ):
+        self._count_tokens = count_tokens
+        self._max_tokens = max_tokens
+        self._min_occurrences = min_occurrences
+        self._max_senders = max_senders
+        self._max_sentences = max_sentences
+        self._senders = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"emails": 0, "tokens_before": 0, "tokens_after": 0, "truncated": 0}
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            before = self._counters["tokens_before"]
+            saved = 1 - self._counters["tokens_after"] / before if before else 0.0
+            return {**self._counters, "saved_ratio": saved, "senders": len(self._senders)}
+
+    def compact(self, email: dict) -> dict:
+        text = email.get("text") or ""
+        sentences = split_sentences(text)
+        learned = self._learn(sender=email.get("sender"), sentences=sentences)
+        sentences = [
+            s for s in sentences
+            if is_relevant(s) or not (BOILERPLATE_PATTERN.search(s) or self._normalize(s) in learned)
+        ]
+
+        tokens_before = self._count_tokens(text)
+        compacted = " ".join(sentences)
+        tokens_after = self._count_tokens(compacted)
+        truncated = tokens_after > self._max_tokens
+        if truncated:
+            compacted = self._truncate(sentences)
+            tokens_after = self._count_tokens(compacted)
+
+        with self._lock:
+            self._counters["emails"] += 1
+            self._counters["tokens_before"] += tokens_before
+            self._counters["tokens_after"] += tokens_after
+            self._counters["truncated"] += truncated
+        logger.info(f"[Compactor] Email {email.get('id')} compacted from {tokens_before} to {tokens_after} tokens")
+        return {**email, "text": compacted}
+
+    def _truncate(self, sentences: List[str]) -> str:
+        sizes = [self._count_tokens(s) for s in sentences]
+        order = sorted(range(len(sentences)), key=lambda i: not is_relevant(sentences[i]))
+        selected = set()
+        used = 0
+        for i in order:
+            if used + sizes[i] <= self._max_tokens:
+                selected.add(i)
+                used += sizes[i]
+
+        if not selected and sentences:
+            first = order[0]
+            return sentences[first][:len(sentences[first]) * self._max_tokens // max(sizes[first], 1)]
+        return " ".join(sentences[i] for i in sorted(selected))
+
+    def _learn(self, sender: Optional[str], sentences: List[str]) -> set:
+        address = parseaddr(sender or "")[1].lower()
+        if not address:
+            return set()
+
+        normalized = {self._normalize(s) for s in sentences}
+        with self._lock:
+            seen = self._senders.pop(address, None) or Counter()
+            learned = {s for s in normalized if seen[s] >= self._min_occurrences}
+            seen.update(normalized)
+            if len(seen) > self._max_sentences:
+                seen = Counter(dict(seen.most_common(self._max_sentences // 2)))
+            self._senders[address] = seen
+            while len(self._senders) > self._max_senders:
+                self._senders.popitem(last=False)
+        return learned
+
+    @staticmethod
+    def _normalize(sentence: str) -> str:
+        return " ".join(sentence.lower().split())
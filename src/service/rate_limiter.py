@@ -0,0 +1,31 @@
+import time
+import asyncio
+from typing import Optional
+
+
+class AsyncTokenBucket:
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self._rate = rate_per_minute / 60
+        self._capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waited = 0.0
+
+    @property
+    def waited(self) -> float:
+        return self._waited
+
+    async def acquire(self, amount: float = 1) -> None:
+        amount = min(amount, self._capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                delay = (amount - self._tokens) / self._rate
+                self._waited += delay
+                await asyncio.sleep(delay)
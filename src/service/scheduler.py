@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import threading
+from config import logger
+from typing import Callable, Optional
+
+
+class Scheduler:
+    def __init__(self, state_path: Optional[str] = None, retry_delay: float = 300, max_sleep: float = 60):
+        self._state_path = state_path
+        self._retry_delay = retry_delay
+        self._max_sleep = max_sleep
+        self._jobs = {}
+        self._transient = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._state = self._load_state()
+
+    @property
+    def status(self) -> dict:
+        with self._lock:
+            return {name: dict(self._state[name]) for name in self._jobs}
+
+    def add_job(self, name: str, func: Callable[[], float], persist: bool = True) -> None:
+        with self._lock:
+            self._jobs[name] = func
+            if persist:
+                self._transient.discard(name)
+            else:
+                self._transient.add(name)
+                self._state.pop(name, None)
+            self._state.setdefault(name, {"next_run": time.time(), "last_run": None, "failures": 0, "error": None})
+        self._wake.set()
+        logger.info(f"[Scheduler] Job {name} scheduled at {self._state[name]['next_run']:.0f}")
+
+    def remove_job(self, name: str) -> None:
+        with self._lock:
+            self._jobs.pop(name, None)
+            self._transient.discard(name)
+            self._state.pop(name, None)
+            self._save_state()
+        logger.info(f"[Scheduler] Job {name} removed")
+
+    def reschedule(self, name: str, next_run: float) -> None:
+        with self._lock:
+            self._state[name]["next_run"] = next_run
+            self._save_state()
+        self._wake.set()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+            self._thread.start()
+        logger.info(f"[Scheduler] Started with {len(self._jobs)} jobs")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("[Scheduler] Stopped")
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        with self._lock:
+            due = [name for name in self._jobs if self._state[name]["next_run"] <= now]
+
+        for name in due:
+            with self._lock:
+                func = self._jobs.get(name)
+                state = {**self._state.get(name, {}), "last_run": now}
+            if func is None:
+                continue
+            try:
+                state.update(next_run=float(func()), failures=0, error=None)
+                logger.success(f"[Scheduler] Job {name} done, next run at {state['next_run']:.0f}")
+            except Exception as error:
+                state.update(
+                    next_run=time.time() + self._retry_delay,
+                    failures=state["failures"] + 1,
+                    error=repr(error)
+                )
+                logger.error(f"[Scheduler] Job {name} failed, retrying in {self._retry_delay}s: {error!r}")
+            with self._lock:
+                if name in self._jobs:
+                    self._state[name] = state
+                    self._save_state()
+        return len(due)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            with self._lock:
+                upcoming = min((self._state[name]["next_run"] for name in self._jobs), default=None)
+            delay = self._max_sleep if upcoming is None else min(max(upcoming - time.time(), 0), self._max_sleep)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _load_state(self) -> dict:
+        if self._state_path and os.path.isfile(self._state_path):
+            with open(self._state_path) as file:
+                state = json.load(file)
+                logger.info(f"[Scheduler] Loaded schedule from {self._state_path}")
+                return state
+        return {}
+
+    def _save_state(self) -> None:
+        if self._state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self._state_path)), exist_ok=True)
+            tmp_path = f"{self._state_path}.{os.getpid()}.tmp"
+            state = {name: job for name, job in self._state.items() if name not in self._transient}
+            with open(tmp_path, "w") as file:
+                json.dump(state, file)
+            os.replace(tmp_path, self._state_path)
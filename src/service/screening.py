@@ -0,0 +1,68 @@
+import re
+import threading
+from config import logger
+from typing import List, Optional
+
+SCREEN_HEADERS = ["From", "Subject", "Date"]
+SCREEN_FIELDS = "id,payload/headers"
+
+SENDER_ALLOWLIST = [
+    r"@produbanco\.com",
+    r"@(?:tarjetas)?bancopichincha\.com",
+    r"noreply@uber\.com",
+    r"banco|bank|tarjeta|pagos|payments|receipts?|facturaci[oó]n|billing"
+]
+SUBJECT_ALLOWLIST = [
+    r"consumo|transferencia|compra|pago|cobro|d[eé]bito|cr[eé]dito|recibo|factura|receipt|payment|charge|viaje|trip"
+]
+POSITIVE_TERMS = re.compile(r"\$|\bUSD\b|\d+[.,]\d{2}\b|transacci[oó]n|orden|pedido|order|total|monto", re.IGNORECASE)
+NEGATIVE_TERMS = re.compile(
+    r"newsletter|bolet[ií]n|promo|oferta|descuento|webinar|invitaci[oó]n|sorteo|encuesta|survey|novedades|"
+    r"verifica|c[oó]digo de seguridad|security code|contrase[nñ]a|password",
+    re.IGNORECASE
+)
+
+
+class MessageScreen:
+    def __init__(
+            self,
+            sender_allowlist: Optional[List[str]] = None,
+            subject_allowlist: Optional[List[str]] = None,
+            threshold: int = 1
+    ):
+        self._senders = re.compile("|".join(sender_allowlist or SENDER_ALLOWLIST), re.IGNORECASE)
+        self._subjects = re.compile("|".join(subject_allowlist or SUBJECT_ALLOWLIST), re.IGNORECASE)
+        self._threshold = threshold
+        self._lock = threading.Lock()
+        self._counters = {"screened": 0, "passed": 0, "rejected": 0}
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+    def score(self, sender: str, subject: str) -> int:
+        score = 0
+        if self._senders.search(sender):
+            score += 2
+        if self._subjects.search(subject):
+            score += 1
+        score += len(POSITIVE_TERMS.findall(subject))
+        score -= 2 * len(NEGATIVE_TERMS.findall(subject))
+        return score
+
+    def passes(self, headers: dict) -> bool:
+        score = self.score(sender=headers.get("from") or "", subject=headers.get("subject") or "")
+        passed = score >= self._threshold
+        with self._lock:
+            self._counters["screened"] += 1
+            self._counters["passed" if passed else "rejected"] += 1
+        if not passed:
+            logger.debug(f"[Screen] Rejected {headers.get('subject')!r} from {headers.get('from')!r} ({score})")
+        return passed
+
+    def select(self, responses: List[dict]) -> List[str]:
+        return [
+            rsp["id"] for rsp in responses
+            if self.passes({h["name"].lower(): h["value"] for h in rsp.get("payload", {}).get("headers", [])})
+        ]
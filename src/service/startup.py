@@ -0,0 +1,50 @@
+import time
+import threading
+from config import logger
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class StartupTimer:
+    def __init__(self, started: Optional[float] = None):
+        self._started = started or time.perf_counter()
+        self._phases = {}
+        self._ready = None
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"phases_ms": dict(self._phases), "ready_ms": self._ready}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name=name, since=start)
+
+    def record(self, name: str, since: float) -> None:
+        elapsed = round((time.perf_counter() - since) * 1000, 1)
+        with self._lock:
+            self._phases[name] = elapsed
+        logger.info(f"[Startup] {name} took {elapsed} ms")
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            self._ready = round((time.perf_counter() - self._started) * 1000, 1)
+        logger.info(f"[Startup] Ready to serve after {self._ready} ms")
+
+    def warmup(self, tasks: Dict[str, Callable[[], Any]]) -> threading.Thread:
+        def run():
+            for name, task in tasks.items():
+                try:
+                    with self.phase(f"warmup.{name}"):
+                        task()
+                except Exception as error:
+                    logger.warning(f"[Startup] Warmup of {name} failed: {error!r}")
+
+        thread = threading.Thread(target=run, name="warmup", daemon=True)
+        thread.start()
+        return thread
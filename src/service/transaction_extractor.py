@@ -0,0 +1,186 @@
+import re
+import threading
+from config import logger
+from typing import Any, Dict, List, Optional
+from .model import LLMService
+from .prompt_compactor import PromptCompactor
+from .transaction_rules import RuleRegistry, DEFAULT_RULES
+
+TRANSACTION_KEYS = ("is_transaction", "transaction_type", "amount", "establishment", "beneficiary", "date")
+EMAIL_PROMPT_FIELDS = ("id", "mimeType", "sender", "recipient", "date", "subject", "text")
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+SYSTEM_PROMPT = """
+    You are a expert in analyzing information from the body of emails identifying which emails corresponds to
+    credit cards consumptions and bank transfers of money.
+    """
+
+
+def build_messages(email: dict) -> List[dict]:
+    user_prompt = f"""
+    The information of the email has been processed in the following dict object {email}, and are in spanish language.
+
+    I want you to use the information in the keys ('subject', 'text') to extract in case of cards consumptions or
+    bank transfers:
+    - If is a card consumption or bank transfer
+    - Transaction type ('card' or 'transfer')
+    - Amount
+    - Establishment (In case of credit card consumption)
+    - Beneficiary (In case of bank transfers)
+    - Date
+
+    Return the information in JSON format with the following keys:
+    - "is_transaction" (bool)
+    - "transaction_type" (str)
+    - "amount" (float)
+    - "establishment" (string)
+    - "beneficiary" (string)
+    - "date" (date, in YYYY-MM-DD format)
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def build_batch_messages(emails: List[dict]) -> List[dict]:
+    user_prompt = f"""
+    The information of {len(emails)} emails has been processed in the following list of dict objects {emails}, and
+    are in spanish language.
+
+    For each email I want you to use the information in the keys ('subject', 'text') to extract in case of cards
+    consumptions or bank transfers:
+    - If is a card consumption or bank transfer
+    - Transaction type ('card' or 'transfer')
+    - Amount
+    - Establishment (In case of credit card consumption)
+    - Beneficiary (In case of bank transfers)
+    - Date
+
+    Return the information in JSON format with a single key "results" holding a list with one object per email with
+    the following keys:
+    - "id" (str, the id of the email)
+    - "is_transaction" (bool)
+    - "transaction_type" (str)
+    - "amount" (float)
+    - "establishment" (string)
+    - "beneficiary" (string)
+    - "date" (date, in YYYY-MM-DD format)
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def email_to_prompt_dict(email: Any) -> dict:
+    return {field: getattr(email, field, None) for field in EMAIL_PROMPT_FIELDS}
+
+
+def is_valid_transaction(answer: dict) -> bool:
+    if not isinstance(answer, dict) or set(answer) != set(TRANSACTION_KEYS):
+        return False
+    if not isinstance(answer["is_transaction"], bool):
+        return False
+    if not answer["is_transaction"]:
+        return True
+    if answer["transaction_type"] not in ("card", "transfer"):
+        return False
+    if not isinstance(answer["amount"], (int, float)) or isinstance(answer["amount"], bool) or answer["amount"] <= 0:
+        return False
+    if not isinstance(answer["date"], str) or not DATE_PATTERN.match(answer["date"]):
+        return False
+    return isinstance(answer["establishment"], str) and isinstance(answer["beneficiary"], str)
+
+
+class TransactionExtractor:
+    def __init__(
+            self,
+            registry: Optional[RuleRegistry] = None,
+            llm: Optional[LLMService] = None,
+            compactor: Optional[PromptCompactor] = None
+    ):
+        self._registry = registry or RuleRegistry(rules=DEFAULT_RULES)
+        self._llm = llm
+        self._compactor = compactor
+        self._lock = threading.Lock()
+        self._counters = {"rule_hits": 0, "rule_failures": 0, "llm_calls": 0, "unanalyzed": 0}
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+    @property
+    def compactor(self) -> PromptCompactor | None:
+        return self._compactor
+
+    def extract(self, email: Any) -> dict | None:
+        answer = self._extract_with_rules(email)
+        if answer:
+            return answer
+
+        if not self._llm:
+            logger.warning(f"[Rules] No rule or LLM available for email {email.id}")
+            self._count("unanalyzed")
+            return None
+
+        self._count("llm_calls")
+        prompt_dict = email_to_prompt_dict(email)
+        answer = self._llm.invoke(
+            messages=build_messages(email=self._compact(prompt_dict)),
+            cache_messages=build_messages(email=prompt_dict)
+        )
+        return self._validated(email_id=email.id, answer=answer)
+
+    def extract_many(self, emails: List[Any]) -> Dict[str, dict | None]:
+        results = {}
+        pending = []
+        originals = {}
+        for email in emails:
+            results[email.id] = self._extract_with_rules(email)
+            if results[email.id] is None:
+                originals[email.id] = email_to_prompt_dict(email)
+                pending.append(self._compact(originals[email.id]))
+
+        if pending and not self._llm:
+            logger.warning(f"[Rules] No rule or LLM available for {len(pending)} emails")
+            self._count("unanalyzed", len(pending))
+        elif pending:
+            self._count("llm_calls", len(pending))
+            answers = self._llm.invoke_batch(
+                items=pending,
+                build_batch=build_batch_messages,
+                build_single=lambda item: build_messages(email=item),
+                validate=is_valid_transaction,
+                build_key=lambda item: build_messages(email=originals[item["id"]])
+            )
+            for email_id in originals:
+                results[email_id] = self._validated(email_id=email_id, answer=answers.get(email_id))
+        return results
+
+    def _extract_with_rules(self, email: Any) -> dict | None:
+        rule = self._registry.match(email)
+        if rule:
+            answer = rule.extract(email)
+            if answer and is_valid_transaction(answer):
+                logger.info(f"[Rules] Email {email.id} extracted with rule {rule.name}")
+                self._count("rule_hits")
+                return answer
+            logger.warning(f"[Rules] Rule {rule.name} failed validation for email {email.id}, falling back to LLM")
+            self._count("rule_failures")
+        return None
+
+    def _validated(self, email_id: str, answer: dict | None) -> dict | None:
+        if answer and is_valid_transaction(answer):
+            return answer
+        logger.warning(f"[Rules] Invalid LLM answer for email {email_id} discarded: {answer}")
+        self._count("unanalyzed")
+        return None
+
+    def _compact(self, prompt_dict: dict) -> dict:
+        return self._compactor.compact(prompt_dict) if self._compactor else prompt_dict
+
+    def _count(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += value
@@ -0,0 +1,160 @@
+import re
+from config import logger
+from datetime import date
+from email.utils import parsedate_to_datetime
+from typing import Any, List, Optional
+
+MONTHS = {
+    "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6, "julio": 7, "agosto": 8,
+    "septiembre": 9, "setiembre": 9, "octubre": 10, "noviembre": 11, "diciembre": 12,
+    "ene": 1, "feb": 2, "mar": 3, "abr": 4, "may": 5, "jun": 6, "jul": 7, "ago": 8, "sep": 9, "oct": 10,
+    "nov": 11, "dic": 12
+}
+
+
+def parse_amount(value: str) -> float | None:
+    value = value.strip()
+    if "," in value and "." in value:
+        if value.rfind(",") > value.rfind("."):
+            value = value.replace(".", "").replace(",", ".")
+        else:
+            value = value.replace(",", "")
+    elif "," in value:
+        whole, _, decimals = value.rpartition(",")
+        value = f"{whole.replace(',', '')}.{decimals}" if len(decimals) == 2 else value.replace(",", "")
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_day_month_year(day: str, month: str, year: str) -> str | None:
+    month_number = int(month) if month.isdigit() else MONTHS.get(month.lower())
+    if not month_number:
+        return None
+    year_number = int(year) + 2000 if len(year) == 2 else int(year)
+    try:
+        return date(year_number, month_number, int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def parse_header_date(value: Optional[str]) -> str | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+class TransactionRule:
+    def __init__(
+            self,
+            name: str,
+            sender: str,
+            subject: str,
+            transaction_type: str,
+            amount: str,
+            date: Optional[str] = None,
+            establishment: Optional[str] = None,
+            beneficiary: Optional[str] = None
+    ):
+        self.name = name
+        self.transaction_type = transaction_type
+        self._sender = re.compile(sender, re.IGNORECASE)
+        self._subject = re.compile(subject, re.IGNORECASE)
+        self._amount = re.compile(amount, re.IGNORECASE)
+        self._date = re.compile(date, re.IGNORECASE) if date else None
+        self._establishment = re.compile(establishment, re.IGNORECASE) if establishment else None
+        self._beneficiary = re.compile(beneficiary, re.IGNORECASE) if beneficiary else None
+
+    def matches(self, email: Any) -> bool:
+        return bool(self._sender.search(email.sender or "") and self._subject.search(email.subject or ""))
+
+    def extract(self, email: Any) -> dict | None:
+        text = f"{email.subject or ''} {email.text or ''}"
+
+        amount_match = self._amount.search(text)
+        if not amount_match:
+            return None
+
+        if self._date:
+            date_match = self._date.search(text)
+            transaction_date = parse_day_month_year(*date_match.group("day", "month", "year")) if date_match else None
+        else:
+            transaction_date = parse_header_date(email.date)
+
+        return {
+            "is_transaction": True,
+            "transaction_type": self.transaction_type,
+            "amount": parse_amount(amount_match.group(1)),
+            "establishment": self._search(self._establishment, text) or "",
+            "beneficiary": self._search(self._beneficiary, text) or "",
+            "date": transaction_date
+        }
+
+    @staticmethod
+    def _search(pattern: Optional[re.Pattern], text: str) -> str | None:
+        if not pattern:
+            return None
+        match = pattern.search(text)
+        return match.group(1).strip() if match else None
+
+
+class RuleRegistry:
+    def __init__(self, rules: Optional[List[TransactionRule]] = None):
+        self._rules: List[TransactionRule] = list(rules or [])
+
+    @property
+    def rules(self) -> List[TransactionRule]:
+        return list(self._rules)
+
+    def register(self, rule: TransactionRule) -> None:
+        self._rules.append(rule)
+        logger.info(f"[Rules] Registered transaction rule: {rule.name}")
+
+    def match(self, email: Any) -> TransactionRule | None:
+        for rule in self._rules:
+            if rule.matches(email):
+                return rule
+        return None
+
+
+DEFAULT_RULES = [
+    TransactionRule(
+        name="produbanco_transfer",
+        sender=r"bancaenlinea@produbanco\.com",
+        subject=r"Transferencia enviada",
+        transaction_type="transfer",
+        amount=r"Monto:\s*\$\s*([\d.,]*\d)",
+        date=r"Fecha y Hora:\s*(?P<day>\d{1,2})/(?P<month>\w+)/(?P<year>\d{4})",
+        beneficiary=r"Banco Contacto:\s*(.+?)\s*Cuenta Contacto:"
+    ),
+    TransactionRule(
+        name="produbanco_card",
+        sender=r"@produbanco\.com",
+        subject=r"consumo",
+        transaction_type="card",
+        amount=r"Valor:\s*(?:USD|\$)\s*([\d.,]*\d)",
+        date=r"Fecha:\s*(?P<day>\d{1,2})/(?P<month>\d{1,2})/(?P<year>\d{4})",
+        establishment=r"Comercio:\s*(.+?)\s*Valor:"
+    ),
+    TransactionRule(
+        name="pichincha_card",
+        sender=r"@tarjetasbancopichincha\.com",
+        subject=r"consumo",
+        transaction_type="card",
+        amount=r"Monto:\s*(?:USD|\$)\s*([\d.,]*\d)",
+        date=r"Fecha:\s*(?P<day>\d{1,2})/(?P<month>\d{1,2})/(?P<year>\d{4})",
+        establishment=r"Establecimiento:\s*(.+?)\s*Monto:"
+    ),
+    TransactionRule(
+        name="uber_trip",
+        sender=r"noreply@uber\.com",
+        subject=r"viaje|trip",
+        transaction_type="card",
+        amount=r"Total\s*\$\s*([\d.,]*\d)",
+        establishment=r"(Uber)"
+    )
+]
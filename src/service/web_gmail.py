@@ -1,89 +1,65 @@
 import json
-from typing import Literal
+import threading
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from config import logger
-from pydantic import BaseModel
-from typing import List, Optional
-from .model import MailService
-from ..utils import bs64_to_utf8, process_html
-from google_auth_oauthlib.flow import Flow
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional, Tuple
+from .model import MailService, MessageStore
+from .gmail_batch import batch_get_messages, DEFAULT_BATCH_SIZE
+from .screening import MessageScreen, SCREEN_HEADERS, SCREEN_FIELDS
+from .gmail_message import Email, Response
+from .http_pool import HttpPool
 from googleapiclient.errors import HttpError
 from fastapi import HTTPException, status
 
+if TYPE_CHECKING:
+    from .parse_pool import ParsePool
 
-class Header(BaseModel):
-    name: str
-    value: str
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
 
 
-class Body(BaseModel):
-    data: Optional[str] = None
+@lru_cache(maxsize=None)
+def load_discovery_document(service_name: str, version: str) -> str:
+    from googleapiclient.discovery_cache import get_static_doc
 
+    document = get_static_doc(service_name, version)
+    if document is None:
+        raise ValueError(f"No bundled discovery document for {service_name} {version}")
+    return document
 
-class Part(BaseModel):
-    mimeType: str
-    body: Body
 
+def build(serviceName: str, version: str, credentials, **kwargs):
+    from googleapiclient.discovery import build_from_document
 
-class Payload(BaseModel):
-    mimeType: Literal["text/html", "multipart/related"]
-    headers: List[Header]
-    body: Body
-    parts: Optional[List[Part]] = None
+    return build_from_document(load_discovery_document(serviceName, version), credentials=credentials, **kwargs)
 
-    def extract_headers(self, header_names: List[str]) -> dict:
-        header_map = {h.name.lower(): h.value for h in self.headers}
-        return {name: header_map.get(name.lower()) for name in header_names}
 
+def authorized_http(credentials):
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
 
-class Email(BaseModel):
-    id: str
-    mimeType: Literal["text/html", "multipart/related"]
-    sender: Optional[str] = None
-    recipient: Optional[str] = None
-    date: Optional[str] = None
-    subject: Optional[str] = None
-    content_type: Optional[str] = None
-    data: Optional[str] = None
-    html: Optional[str] = None
-    text: Optional[str] = None
+    return AuthorizedHttp(credentials, http=httplib2.Http())
 
 
-class Response(BaseModel):
-    id: str
-    payload: Payload
+def oauth_flow(client_config: dict, scopes: List[str], redirect_uri: str, state: Optional[str] = None):
+    from google_auth_oauthlib.flow import Flow
 
-    def parse(self) -> Email:
-        headers_needed = ["From", "To", "Date", "Subject", "Content-Type"]
-        extracted_headers = self.payload.extract_headers(headers_needed)
-
-        email = Email(
-            id=self.id,
-            mimeType=self.payload.mimeType,
-            sender=extracted_headers.get("From"),
-            recipient=extracted_headers.get("To"),
-            date=extracted_headers.get("Date"),
-            subject=extracted_headers.get("Subject"),
-            content_type=extracted_headers.get("Content-Type")
-        )
-
-        if self.payload.mimeType == "text/html":
-            email.data = self.payload.body.data
-
-        elif self.payload.mimeType == "multipart/related":
-            if len(self.payload.parts) > 1:
-                logger.warning(f"[Gmail] {self.payload.mimeType} email: {self.id} with more than one parts")
-            email.data = self.payload.parts[0].body.data
-
-        email.html = bs64_to_utf8(encoded_data=email.data)
-        email.text = process_html(html=email.html)
-        return email
+    return Flow.from_client_config(client_config, scopes=scopes, redirect_uri=redirect_uri, state=state)
 
 
 class WebGmailService(MailService):
-    def __init__(self, client_id: str, client_secret: str, redirect_uri: str, token: str, scopes: List[str]):
+    def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            redirect_uri: str,
+            token: str,
+            scopes: List[str],
+            store: Optional[MessageStore] = None,
+            parse_pool: Optional["ParsePool"] = None,
+            http_pool_size: int = 0,
+            http_factory: Callable[[Any], Any] = authorized_http
+    ):
         self._scopes = scopes
         self._client_id = client_id
         self._client_secret = client_secret
@@ -91,6 +67,15 @@ class WebGmailService(MailService):
         self._token = token
         self._credentials = None
         self._service = None
+        self._store = store
+        self._parse_pool = parse_pool
+        self._loaded_token = None
+        self._service_credentials = None
+        self._lock = threading.RLock()
+        self._http_pool = HttpPool(
+            factory=lambda: http_factory(self._credentials),
+            size=http_pool_size
+        ) if http_pool_size else None
 
     @property
     def token(self):
@@ -106,6 +91,16 @@ class WebGmailService(MailService):
         else:
             return None
 
+    @property
+    def http_pool(self) -> HttpPool | None:
+        return self._http_pool
+
+    def execute(self, request) -> dict:
+        if not self._http_pool:
+            return request.execute()
+        with self._http_pool.acquire() as http:
+            return request.execute(http=http)
+
     def get_authorization_url(self):
         if not self._client_id or not self._client_secret:
             logger.error("[Gmail] Missing OAuth client credentials")
@@ -114,7 +109,7 @@ class WebGmailService(MailService):
                 detail="OAuth client credentials not configured"
             )
 
-        flow = Flow.from_client_config(
+        flow = oauth_flow(
             {
                 "web": {
                     "client_id": self._client_id,
@@ -137,7 +132,7 @@ class WebGmailService(MailService):
         return auth_url, flow
 
     def process_oauth_callback(self, code, state=None):
-        flow = Flow.from_client_config(
+        flow = oauth_flow(
             {
                 "web": {
                     "client_id": self._client_id,
@@ -152,26 +147,72 @@ class WebGmailService(MailService):
             state=state
         )
         flow.fetch_token(code=code)
-        self._credentials = flow.credentials
-        token_json = self._credentials.to_json()
+        token_json = flow.credentials.to_json()
+        with self._lock:
+            self._credentials = flow.credentials
+            self._token = token_json
+            self._loaded_token = token_json
         logger.info(f"[Gmail] Obtained new credentials. Token: {token_json}")
         return token_json
 
+    @property
+    def token_expiry(self) -> datetime | None:
+        return self._credentials.expiry if self._credentials else None
+
+    def token_expiring(self, margin: timedelta = TOKEN_REFRESH_MARGIN) -> bool:
+        if not self._credentials or not self._credentials.token:
+            return True
+        if not self._credentials.expiry:
+            return False
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return self._credentials.expiry - margin <= now
+
+    def refresh_credentials(self, margin: timedelta) -> datetime | None:
+        with self._lock:
+            self.authenticate()
+            credentials = self._credentials
+            if not self.token_expiring(margin=margin) or not credentials.refresh_token:
+                self.build_service()
+                return credentials.expiry
+            token = json.loads(credentials.to_json())
+
+        from google.oauth2.credentials import Credentials
+        from google.auth.transport.requests import Request
+
+        refreshed = Credentials.from_authorized_user_info(token, self._scopes)
+        refreshed.refresh(Request())
+        with self._lock:
+            if self._credentials is credentials:
+                self._credentials = refreshed
+                self.build_service()
+                logger.success(f"[Gmail] Token refreshed ahead of expiry, valid until {refreshed.expiry}")
+            return self._credentials.expiry
+
     def authenticate(self) -> None:
-        logger.info("[Gmail] Initializing authentication process...")
+        with self._lock:
+            if self._credentials and self._loaded_token == self._token and not self.token_expiring():
+                logger.debug("[Gmail] Reusing cached credentials")
+                return
+
+            logger.info("[Gmail] Initializing authentication process...")
 
-        try:
-            token = json.loads(self._token)
-            self._credentials = Credentials.from_authorized_user_info(token, self._scopes)
-            logger.info("[Gmail] Loaded credentials from environment")
+            if not self._credentials or self._loaded_token != self._token:
+                try:
+                    from google.oauth2.credentials import Credentials
 
-        except Exception as e:
-            logger.error(f"[Gmail] Error loading token from environment: {e}")
+                    token = json.loads(self._token)
+                    self._credentials = Credentials.from_authorized_user_info(token, self._scopes)
+                    self._loaded_token = self._token
+                    logger.info("[Gmail] Loaded credentials from environment")
+
+                except Exception as e:
+                    logger.error(f"[Gmail] Error loading token from environment: {e}")
 
-        if not self._credentials or not self._credentials.valid:
-            if self._credentials and self._credentials.expired and self._credentials.refresh_token:
-                logger.info("[Gmail] Refreshing expired token...")
+            if self._credentials and self.token_expiring() and self._credentials.refresh_token:
+                logger.info("[Gmail] Refreshing expiring token...")
                 try:
+                    from google.auth.transport.requests import Request
+
                     self._credentials.refresh(Request())
                     logger.success("[Gmail] Token refreshed successfully")
                 except Exception as e:
@@ -186,27 +227,41 @@ class WebGmailService(MailService):
                     headers={"WWW-Authenticate": "Bearer"}
                 )
 
-        logger.success("[Gmail] Authentication process completed")
+            logger.success("[Gmail] Authentication process completed")
 
     def build_service(self) -> None:
-        logger.info("[Gmail] Initializing building service...")
-        service = None
-        if self._credentials:
-            service = build(serviceName="gmail", version="v1", credentials=self._credentials)
-            logger.success("[Gmail] Service built successfully")
-        else:
-            logger.error("[Gmail] Credentials not found, building service process failed")
-        self._service = service
+        with self._lock:
+            if self._service and self._service_credentials is self._credentials:
+                logger.debug("[Gmail] Reusing cached service")
+                return
+
+            logger.info("[Gmail] Initializing building service...")
+            service = None
+            if self._credentials:
+                service = build(serviceName="gmail", version="v1", credentials=self._credentials)
+                logger.success("[Gmail] Service built successfully")
+            else:
+                logger.error("[Gmail] Credentials not found, building service process failed")
+            self._service = service
+            self._service_credentials = self._credentials
+            if self._http_pool:
+                self._http_pool.clear()
+
+    def ensure_service(self):
+        with self._lock:
+            self.authenticate()
+            self.build_service()
+            return self._service
 
-    def get_emails(self, max_results: int, filters: str) -> List[Email] | None:
+    def get_emails(self, max_results: int, filters: str, batch_size: Optional[int] = DEFAULT_BATCH_SIZE) -> List[Email] | None:
         if self._service:
             try:
-                results = self._service.users().messages().list(
+                results = self.execute(self._service.users().messages().list(
                     userId="me",
                     labelIds=["INBOX"],
                     q=filters,
                     maxResults=max_results
-                ).execute()
+                ))
 
                 messages = results.get("messages", [])
 
@@ -216,12 +271,7 @@ class WebGmailService(MailService):
 
                 else:
                     logger.info(f"[Gmail] Getting {max_results} emails information...")
-                    responses = [
-                        self._service.users().messages().get(userId="me", id=msj.get("id"), format="full").execute() for
-                        msj
-                        in messages
-                    ]
-                    emails = [Response.model_validate(rsp).parse() for rsp in responses]
+                    emails, _ = self._fetch_emails(email_ids=[msj.get("id") for msj in messages], batch_size=batch_size)
                     logger.success(f"[Gmail] Information successfully extracted for {max_results} emails")
                     return emails
 
@@ -236,13 +286,21 @@ class WebGmailService(MailService):
     def get_email_by_id(self, email_id: str) -> Email | None:
         if self._service:
             try:
+                if self._store:
+                    email = self._store.get(email_id)
+                    if email:
+                        logger.info(f"[Gmail] Email {email_id} read from local store")
+                        return email
+
                 logger.info(f"[Gmail] Getting email: {email_id}")
-                response = self._service.users().messages().get(
+                response = self.execute(self._service.users().messages().get(
                     userId="me",
                     id=email_id,
                     format="full"
-                ).execute()
-                email = Response.model_validate(response).parse()
+                ))
+                email = Email.from_gmail(response)
+                if self._store:
+                    self._store.put(email, raw=response)
                 logger.success(f"[Gmail] Email {email_id} retrieved and parsed successfully")
                 return email
 
@@ -252,3 +310,182 @@ class WebGmailService(MailService):
         else:
             logger.error(f"[Gmail] No service found. Call authenticate() and build_service() first")
             return None
+
+    def _fetch_emails(
+            self,
+            email_ids: List[str],
+            batch_size: Optional[int],
+            screen: Optional[MessageScreen] = None
+    ) -> Tuple[List[Email], List[str]]:
+        emails = self._store.get_many(email_ids) if self._store else {}
+        missing = [email_id for email_id in email_ids if email_id not in emails]
+        skipped = []
+        if emails:
+            logger.info(f"[Gmail] {len(emails)} emails read from local store")
+
+        if missing and screen:
+            metadata = batch_get_messages(
+                service=self._service,
+                message_ids=missing,
+                http_pool=self._http_pool,
+                batch_size=batch_size or DEFAULT_BATCH_SIZE,
+                message_format="metadata",
+                metadata_headers=SCREEN_HEADERS,
+                fields=SCREEN_FIELDS,
+                gone=skipped
+            )
+            passed = screen.select(metadata)
+            logger.info(f"[Gmail] {len(passed)}/{len(missing)} emails passed metadata screening")
+            passed_ids = set(passed)
+            skipped.extend(rsp["id"] for rsp in metadata if rsp["id"] not in passed_ids)
+            missing = passed
+
+        if missing:
+            if batch_size:
+                responses = batch_get_messages(
+                    service=self._service,
+                    message_ids=missing,
+                    batch_size=batch_size,
+                    http_pool=self._http_pool,
+                    gone=skipped
+                )
+            else:
+                responses = [
+                    self.execute(self._service.users().messages().get(userId="me", id=email_id, format="full"))
+                    for email_id in missing
+                ]
+            if self._parse_pool:
+                parsed = self._parse_pool.parse_many(responses)
+            else:
+                parsed = [Email.from_gmail(rsp) for rsp in responses]
+            for email, rsp in zip(parsed, responses):
+                emails[email.id] = email
+                if self._store:
+                    self._store.put(email, raw=rsp)
+
+        return [emails[email_id] for email_id in email_ids if email_id in emails], skipped
+
+    def get_email_ids(self, max_results: int, filters: str) -> List[str] | None:
+        if self._service:
+            try:
+                results = self.execute(self._service.users().messages().list(
+                    userId="me",
+                    labelIds=["INBOX"],
+                    q=filters,
+                    maxResults=max_results
+                ))
+                return [msj.get("id") for msj in results.get("messages", [])]
+
+            except HttpError as error:
+                logger.error(f"[Gmail] Error listing mails: {error}")
+                return None
+        else:
+            logger.error(f"[Gmail] No service found. Call authenticate() and build_service() first")
+            return None
+
+    def iter_email_id_pages(
+            self,
+            filters: str,
+            page_size: int = 500,
+            page_token: Optional[str] = None
+    ) -> Iterator[Tuple[List[str], str | None]]:
+        if not self._service:
+            logger.error(f"[Gmail] No service found. Call authenticate() and build_service() first")
+            return
+
+        while True:
+            results = self.execute(self._service.users().messages().list(
+                userId="me",
+                labelIds=["INBOX"],
+                q=filters,
+                maxResults=page_size,
+                pageToken=page_token
+            ))
+            page_token = results.get("nextPageToken")
+            yield [msj.get("id") for msj in results.get("messages", [])], page_token
+            if not page_token:
+                break
+
+    def get_emails_by_ids(
+            self,
+            email_ids: List[str],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            screen: Optional[MessageScreen] = None
+    ) -> List[Email] | None:
+        result = self.fetch_emails(email_ids=email_ids, batch_size=batch_size, screen=screen)
+        return None if result is None else result[0]
+
+    def fetch_emails(
+            self,
+            email_ids: List[str],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            screen: Optional[MessageScreen] = None
+    ) -> Tuple[List[Email], List[str]] | None:
+        if self._service:
+            try:
+                logger.info(f"[Gmail] Getting {len(email_ids)} emails by id...")
+                emails, skipped = self._fetch_emails(email_ids=email_ids, batch_size=batch_size, screen=screen)
+                logger.success(f"[Gmail] Information successfully extracted for {len(emails)} emails")
+                return emails, skipped
+
+            except HttpError as error:
+                logger.error(f"[Gmail] Error obtaining mails: {error}")
+                return None
+        else:
+            logger.error(f"[Gmail] No service found. Call authenticate() and build_service() first")
+            return None
+
+    def get_history_id(self) -> int | None:
+        if self._service:
+            try:
+                profile = self.execute(self._service.users().getProfile(userId="me"))
+                return int(profile["historyId"])
+
+            except HttpError as error:
+                logger.error(f"[Gmail] Error obtaining mailbox profile: {error}")
+                return None
+        else:
+            logger.error(f"[Gmail] No service found. Call authenticate() and build_service() first")
+            return None
+
+    def get_email_address(self) -> str | None:
+        if self._service:
+            try:
+                profile = self.execute(self._service.users().getProfile(userId="me"))
+                return profile["emailAddress"]
+
+            except HttpError as error:
+                logger.error(f"[Gmail] Error obtaining mailbox profile: {error}")
+                return None
+        else:
+            logger.error(f"[Gmail] No service found. Call authenticate() and build_service() first")
+            return None
+
+    def get_history(self, start_history_id: int) -> Tuple[List[str], int] | None:
+        if self._service:
+            email_ids = []
+            history_id = start_history_id
+            page_token = None
+            while True:
+                results = self.execute(self._service.users().history().list(
+                    userId="me",
+                    startHistoryId=start_history_id,
+                    historyTypes=["messageAdded"],
+                    labelId="INBOX",
+                    pageToken=page_token
+                ))
+
+                for record in results.get("history", []):
+                    for added in record.get("messagesAdded", []):
+                        email_ids.append(added["message"]["id"])
+
+                history_id = int(results.get("historyId", history_id))
+                page_token = results.get("nextPageToken")
+                if not page_token:
+                    break
+
+            logger.info(f"[Gmail] {len(email_ids)} emails added since history {start_history_id}")
+            return list(dict.fromkeys(email_ids)), history_id
+        else:
+            logger.error(f"[Gmail] No service found. Call authenticate() and build_service() first")
+            return None
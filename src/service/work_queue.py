@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from config import logger
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+from .model import WorkQueue
+
+STATUSES = ("ready", "leased", "done", "dead")
+
+
+class SqliteWorkQueue(WorkQueue):
+    def __init__(self, path: str, queue: str = "default", max_attempts: int = 5, retention: float = 7 * 24 * 3600):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._queue = queue
+        self._max_attempts = max_attempts
+        self._retention = retention
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, queue TEXT NOT NULL, key TEXT, payload TEXT NOT NULL, "
+            "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL, "
+            "lease_owner TEXT, lease_until REAL, last_error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "UNIQUE (queue, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (queue, status, available_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_attempts ("
+            "job_id INTEGER NOT NULL, attempt INTEGER NOT NULL, worker TEXT NOT NULL, started_at REAL NOT NULL, "
+            "finished_at REAL, outcome TEXT, error TEXT, PRIMARY KEY (job_id, attempt))"
+        )
+        logger.info(f"[Queue] SQLite work queue {queue} opened at {path}")
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE queue = ? GROUP BY status", (self._queue,)
+            ).fetchall())
+        return {"queue": self._queue, **{status: counts.get(status, 0) for status in STATUSES}}
+
+    def enqueue(self, payload: dict, key: Optional[str] = None, delay: float = 0) -> bool:
+        now = time.time()
+        with self._transaction():
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (queue, key, payload, status, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'ready', ?, ?, ?)",
+                (self._queue, key, json.dumps(payload, ensure_ascii=False), now + delay, now, now)
+            )
+        if not cursor.rowcount:
+            logger.debug(f"[Queue] Job {key} already enqueued")
+        return bool(cursor.rowcount)
+
+    def lease(self, worker: str, limit: int = 1, visibility_timeout: float = 60) -> List[dict]:
+        now = time.time()
+        with self._transaction():
+            expired = self._conn.execute(
+                "SELECT id, attempts FROM jobs WHERE queue = ? AND status = 'leased' AND lease_until < ?",
+                (self._queue, now)
+            ).fetchall()
+            for job_id, attempts in expired:
+                self._finish_attempt(job_id=job_id, outcome="expired", error="Lease expired", now=now)
+                if attempts >= self._max_attempts:
+                    self._update(job_id=job_id, status="dead", available_at=now, error="Lease expired", now=now)
+                    logger.error(f"[Queue] Job {job_id} dead-lettered after {attempts} expired attempts")
+
+            rows = self._conn.execute(
+                "SELECT id, key, payload, attempts FROM jobs WHERE queue = ? AND "
+                "((status = 'ready' AND available_at <= ?) OR (status = 'leased' AND lease_until < ?)) "
+                "ORDER BY available_at, id LIMIT ?",
+                (self._queue, now, now, limit)
+            ).fetchall()
+            jobs = []
+            for job_id, key, payload, attempts in rows:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_until = ?, attempts = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (worker, now + visibility_timeout, attempts + 1, now, job_id)
+                )
+                self._conn.execute(
+                    "INSERT INTO job_attempts (job_id, attempt, worker, started_at) "
+                    "SELECT ?, COALESCE(MAX(attempt), 0) + 1, ?, ? FROM job_attempts WHERE job_id = ?",
+                    (job_id, worker, now, job_id)
+                )
+                jobs.append({"id": job_id, "key": key, "payload": json.loads(payload), "attempts": attempts + 1})
+        return jobs
+
+    def extend(self, job_id: int, worker: str, visibility_timeout: float = 60) -> bool:
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + visibility_timeout, job_id, worker)
+            )
+        return bool(cursor.rowcount)
+
+    def ack(self, job_id: int, worker: str) -> bool:
+        now = time.time()
+        with self._transaction():
+            if not self._owns(job_id=job_id, worker=worker):
+                logger.warning(f"[Queue] Job {job_id} lease lost by {worker}, ack ignored")
+                return False
+            self._update(job_id=job_id, status="done", available_at=now, error=None, now=now)
+            self._finish_attempt(job_id=job_id, outcome="ok", error=None, now=now)
+        return True
+
+    def nack(self, job_id: int, worker: str, error: str, delay: float = 0) -> bool:
+        now = time.time()
+        with self._transaction():
+            attempts = self._owns(job_id=job_id, worker=worker)
+            if not attempts:
+                logger.warning(f"[Queue] Job {job_id} lease lost by {worker}, nack ignored")
+                return False
+            dead = attempts >= self._max_attempts
+            self._update(job_id=job_id, status="dead" if dead else "ready", available_at=now + delay, error=error, now=now)
+            self._finish_attempt(job_id=job_id, outcome="failed", error=error, now=now)
+        if dead:
+            logger.error(f"[Queue] Job {job_id} dead-lettered after {attempts} attempts: {error}")
+        return True
+
+    def attempts(self, job_id: int) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT attempt, worker, started_at, finished_at, outcome, error FROM job_attempts "
+                "WHERE job_id = ? ORDER BY attempt",
+                (job_id,)
+            ).fetchall()
+        keys = ("attempt", "worker", "started_at", "finished_at", "outcome", "error")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def dead_letters(self, limit: int = 100) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, key, payload, attempts, last_error FROM jobs WHERE queue = ? AND status = 'dead' "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (self._queue, limit)
+            ).fetchall()
+        return [
+            {"id": job_id, "key": key, "payload": json.loads(payload), "attempts": attempts, "error": error}
+            for job_id, key, payload, attempts, error in rows
+        ]
+
+    def requeue(self, job_id: int) -> bool:
+        now = time.time()
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'ready', attempts = 0, available_at = ?, updated_at = ? "
+                "WHERE id = ? AND queue = ? AND status = 'dead'",
+                (now, now, job_id, self._queue)
+            )
+        return bool(cursor.rowcount)
+
+    def purge(self) -> int:
+        with self._transaction():
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE queue = ? AND status = 'done' AND updated_at < ?",
+                (self._queue, time.time() - self._retention)
+            )
+            self._conn.execute("DELETE FROM job_attempts WHERE job_id NOT IN (SELECT id FROM jobs)")
+        logger.info(f"[Queue] Purged {cursor.rowcount} finished jobs")
+        return cursor.rowcount
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _owns(self, job_id: int, worker: str) -> int:
+        row = self._conn.execute(
+            "SELECT attempts FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?", (job_id, worker)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _update(self, job_id: int, status: str, available_at: float, error: Optional[str], now: float) -> None:
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL, lease_until = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (status, available_at, error, now, job_id)
+        )
+
+    def _finish_attempt(self, job_id: int, outcome: str, error: Optional[str], now: float) -> None:
+        self._conn.execute(
+            "UPDATE job_attempts SET finished_at = ?, outcome = ?, error = ? WHERE job_id = ? AND finished_at IS NULL",
+            (now, outcome, error, job_id)
+        )
+
+
+class QueueWorker:
+    def __init__(
+            self,
+            name: str,
+            queue: WorkQueue,
+            handler: Callable[[dict], None],
+            workers: int = 4,
+            visibility_timeout: float = 300,
+            poll_interval: float = 1.0,
+            retry_backoff: float = 30
+    ):
+        self._name = name
+        self._queue = queue
+        self._handler = handler
+        self._workers = workers
+        self._visibility_timeout = visibility_timeout
+        self._poll_interval = poll_interval
+        self._retry_backoff = retry_backoff
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{name}"
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._counters = {"processed": 0, "failed": 0, "lost": 0}
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"name": self._name, "workers": self._workers, "busy": self._busy, **self._counters}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for i in range(self._workers):
+                thread = threading.Thread(target=self._run, args=(f"{self._worker_id}-{i}",), name=f"{self._name}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"[Queue] {self._name} worker started with {self._workers} threads")
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 30) -> bool:
+        self._stop.set()
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        stopped = not any(thread.is_alive() for thread in self._threads)
+        self._threads = []
+        if stopped:
+            logger.success(f"[Queue] {self._name} worker stopped")
+        else:
+            logger.error(f"[Queue] {self._name} worker stopped with jobs in flight, their leases will expire")
+        return stopped
+
+    def _run(self, worker: str) -> None:
+        while not self._stop.is_set():
+            try:
+                jobs = self._queue.lease(worker=worker, limit=1, visibility_timeout=self._visibility_timeout)
+            except sqlite3.Error as error:
+                logger.error(f"[Queue] {worker} could not lease jobs: {error}")
+                jobs = []
+
+            if not jobs:
+                self._wake.wait(self._poll_interval)
+                self._wake.clear()
+                continue
+
+            for job in jobs:
+                self._process(worker=worker, job=job)
+
+    def _process(self, worker: str, job: dict) -> None:
+        with self._lock:
+            self._busy += 1
+        try:
+            self._handler(job["payload"])
+            acked = self._queue.ack(job_id=job["id"], worker=worker)
+            self._count("processed" if acked else "lost")
+        except Exception as e:
+            logger.error(f"[Queue] {self._name} job {job['id']} failed on attempt {job['attempts']}: {e}")
+            delay = self._retry_backoff * 2 ** (job["attempts"] - 1)
+            acked = self._queue.nack(job_id=job["id"], worker=worker, error=repr(e), delay=delay)
+            self._count("failed" if acked else "lost")
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
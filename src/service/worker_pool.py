@@ -0,0 +1,142 @@
+import time
+import zlib
+import queue
+import threading
+from config import logger
+from typing import Any, Callable, List, Optional
+
+_STOP = object()
+
+
+class WorkerPool:
+    def __init__(self, name: str, handler: Callable[[Any], None], workers: int = 4, max_queue: int = 100):
+        self._name = name
+        self._handler = handler
+        self._workers = workers
+        self._max_queue = max_queue
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._accepting = False
+        self._busy = 0
+        self._high_water = 0
+        self._counters = {"submitted": 0, "processed": 0, "failed": 0, "rejected": 0}
+
+    @property
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "name": self._name,
+                "workers": self._workers,
+                "busy": self._busy,
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self._max_queue,
+                "high_water": self._high_water,
+                **self._counters
+            }
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._accepting = True
+            for i in range(self._workers):
+                thread = threading.Thread(target=self._run, name=f"{self._name}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"[Workers] {self._name} pool started with {self._workers} workers")
+
+    def submit(self, item: Any, timeout: Optional[float] = 0) -> bool:
+        if not self._accepting:
+            logger.warning(f"[Workers] {self._name} pool is not accepting work")
+            self._count("rejected")
+            return False
+
+        try:
+            if timeout == 0:
+                self._queue.put_nowait(item)
+            else:
+                self._queue.put(item, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"[Workers] {self._name} queue full ({self._max_queue}), rejecting work")
+            self._count("rejected")
+            return False
+
+        with self._lock:
+            self._counters["submitted"] += 1
+            self._high_water = max(self._high_water, self._queue.qsize())
+        return True
+
+    def stop(self, timeout: float = 30) -> bool:
+        self._accepting = False
+        deadline = time.monotonic() + timeout
+        logger.info(f"[Workers] Draining {self._queue.qsize()} pending items from {self._name} pool...")
+
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        drained = not self._queue.unfinished_tasks
+
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+        if drained:
+            logger.success(f"[Workers] {self._name} pool drained and stopped")
+        else:
+            logger.error(f"[Workers] {self._name} pool stopped with {self._queue.qsize()} pending items")
+        return drained
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+
+            with self._lock:
+                self._busy += 1
+            try:
+                self._handler(item)
+                self._count("processed")
+            except Exception as e:
+                logger.error(f"[Workers] {self._name} worker failed: {e}")
+                self._count("failed")
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                self._queue.task_done()
+
+
+class ShardedWorkerPool:
+    def __init__(self, name: str, handler: Callable[[Any], None], shards: int = 4, max_queue: int = 100):
+        self._name = name
+        self._shards: List[WorkerPool] = [
+            WorkerPool(name=f"{name}-{i}", handler=handler, workers=1, max_queue=max_queue) for i in range(shards)
+        ]
+
+    @property
+    def metrics(self) -> dict:
+        return {"name": self._name, "shards": [shard.metrics for shard in self._shards]}
+
+    def shard_for(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % len(self._shards)
+
+    def start(self) -> None:
+        for shard in self._shards:
+            shard.start()
+
+    def submit(self, key: str, item: Any, timeout: Optional[float] = 0) -> bool:
+        return self._shards[self.shard_for(key)].submit(item, timeout=timeout)
+
+    def stop(self, timeout: float = 30) -> bool:
+        deadline = time.monotonic() + timeout
+        return all([shard.stop(timeout=max(0.0, deadline - time.monotonic())) for shard in self._shards])
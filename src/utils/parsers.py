@@ -1,6 +1,19 @@
 import re
 import base64
-from bs4 import BeautifulSoup
+from typing import List, Optional
+from html.parser import HTMLParser
+from html.entities import html5
+
+PARSER_VERSION = 2
+MAX_TEXT_CHARS = 200_000
+
+_SKIP_TAGS = {"style", "script", "template", "rt", "rp"}
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta", "param",
+    "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex", "nextid", "spacer"
+}
+_ENTITIES = {name.rstrip(";"): char for name, char in html5.items()}
+_CHUNK_SIZE = 64 * 1024
 
 
 def bs64_to_utf8(encoded_data: str) -> str:
@@ -10,7 +23,105 @@ def bs64_to_utf8(encoded_data: str) -> str:
     return data
 
 
+class HtmlTextExtractor(HTMLParser):
+    def __init__(self, max_chars: Optional[int] = None):
+        super().__init__(convert_charrefs=False)
+        self._max_chars = max_chars
+        self._stack: List[str] = []
+        self._skip_depth = 0
+        self._parts: List[str] = []
+        self._length = 0
+
+    def reached_limit(self) -> bool:
+        if self._max_chars is None or self._length <= self._max_chars:
+            return False
+        raw = "".join(self._parts)
+        text = " ".join(raw.split())
+        if raw[:1].isspace():
+            text = " " + text
+        if raw[-1:].isspace():
+            text = text + " "
+        self._parts = [text]
+        self._length = len(text)
+        return len(text.strip()) > self._max_chars
+
+    def text(self) -> str:
+        text = " ".join("".join(self._parts).split())
+        return text[:self._max_chars].rstrip() if self._max_chars else text
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in _VOID_TAGS:
+            return
+        self._stack.append(tag)
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        pass
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag not in self._stack:
+            return
+        while self._stack:
+            name = self._stack.pop()
+            if name in _SKIP_TAGS:
+                self._skip_depth -= 1
+            if name == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._parts.append(data)
+            self._length += len(data)
+
+    def handle_entityref(self, name: str) -> None:
+        self.handle_data(_ENTITIES.get(name, f"&{name}"))
+
+    def handle_charref(self, name: str) -> None:
+        code = int(name[1:], 16) if name[:1] in ("x", "X") else int(name)
+        data = None
+        if code < 256:
+            try:
+                data = bytes([code]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(code)
+            except (ValueError, OverflowError):
+                pass
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def unknown_decl(self, data: str) -> None:
+        # BeautifulSoup keeps CDATA sections even inside skipped containers like <rt>
+        if data.upper().startswith("CDATA["):
+            self._parts.append(data[len("CDATA["):])
+            self._length += len(data) - len("CDATA[")
+
+
+def extract_text(html: str, max_chars: Optional[int] = MAX_TEXT_CHARS) -> str:
+    extractor = HtmlTextExtractor(max_chars=max_chars)
+    for start in range(0, len(html), _CHUNK_SIZE):
+        extractor.feed(html[start:start + _CHUNK_SIZE])
+        if extractor.reached_limit():
+            break
+    else:
+        extractor.close()
+    return extractor.text()
+
+
 def process_html(html: str) -> str:
+    return extract_text(html=html)
+
+
+def process_plain(text: str, max_chars: Optional[int] = MAX_TEXT_CHARS) -> str:
+    text = " ".join(text.split())
+    return text[:max_chars].rstrip() if max_chars else text
+
+
+def process_html_soup(html: str) -> str:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, features="html.parser")
     text = soup.get_text()
     text = text.replace("\n"," ")
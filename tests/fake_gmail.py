@@ -0,0 +1,191 @@
+import json
+import time
+from datetime import datetime, timedelta
+import base64
+import httplib2
+from http.client import responses
+from email.parser import FeedParser
+from urllib.parse import urlparse, parse_qs
+from googleapiclient.discovery import build
+from src.service.web_gmail import WebGmailService
+
+
+def make_token(expires_in: timedelta) -> str:
+    return json.dumps({
+        "token": "access-token",
+        "refresh_token": "refresh-token",
+        "client_id": "client-id",
+        "client_secret": "client-secret",
+        "expiry": (datetime.utcnow() + expires_in).strftime("%Y-%m-%dT%H:%M:%SZ")
+    })
+
+
+def make_web_service(token: str, store=None, **kwargs) -> WebGmailService:
+    return WebGmailService(
+        client_id="client-id",
+        client_secret="client-secret",
+        redirect_uri="http://localhost/oauth2callback",
+        token=token,
+        scopes=["https://www.googleapis.com/auth/gmail.readonly"],
+        store=store,
+        **kwargs
+    )
+
+
+def make_message(message_id: str, sender: str, subject: str, html: str, date: str = "2 Apr 2025 21:44:09 -0500") -> dict:
+    data = base64.urlsafe_b64encode(html.encode("utf-8")).decode("ASCII")
+    return {
+        "id": message_id,
+        "threadId": message_id,
+        "labelIds": ["INBOX"],
+        "payload": {
+            "mimeType": "text/html",
+            "headers": [
+                {"name": "From", "value": sender},
+                {"name": "To", "value": "john.doe@gmail.com"},
+                {"name": "Date", "value": date},
+                {"name": "Subject", "value": subject},
+                {"name": "Content-Type", "value": "text/html; charset=utf-8"}
+            ],
+            "body": {"size": len(html), "data": data}
+        }
+    }
+
+
+def make_mailbox(size: int) -> dict:
+    mailbox = {}
+    for i in range(size):
+        message_id = f"{i:016x}"
+        html = (
+            f"<html><head><style>td {{color: #666;}}</style></head><body><table><tr><td>\n"
+            f"<p>Estimado/a John Doe</p>\n<p>Monto: ${i}.00</p>\n<p>Referencia: {i:010d}</p>\n"
+            f"</td></tr></table></body></html>"
+        )
+        mailbox[message_id] = make_message(
+            message_id=message_id,
+            sender='"Banco enlínea" <bancaenlinea@produbanco.com>',
+            subject=f"Transferencia enviada por ${i}.00",
+            html=html
+        )
+    return mailbox
+
+
+def mask_fields(value, paths: list):
+    if not isinstance(value, dict):
+        return value
+    grouped = {}
+    for path in paths:
+        head, _, rest = path.partition("/")
+        grouped.setdefault(head, []).append(rest)
+    return {
+        key: value[key] if "" in rests else mask_fields(value[key], rests)
+        for key, rests in grouped.items() if key in value
+    }
+
+
+def shape_message(message: dict, query: dict) -> dict:
+    if query.get("format", ["full"])[0] == "metadata":
+        names = {name.lower() for name in query.get("metadataHeaders", [])}
+        headers = [h for h in message["payload"]["headers"] if not names or h["name"].lower() in names]
+        message = {**message, "payload": {"mimeType": message["payload"]["mimeType"], "headers": headers}}
+    if "fields" in query:
+        message = mask_fields(message, query["fields"][0].split(","))
+    return message
+
+
+class FakeGmailHttp:
+    def __init__(self, messages: dict, latency: float = 0.0, throttled: dict = None):
+        self.messages = messages
+        self.latency = latency
+        self.throttled = dict(throttled or {})
+        self.requests = []
+        self.bytes_sent = 0
+        self.history_id = 1000
+        self.min_history_id = 1000
+        self.history = []
+
+    def add_message(self, message: dict) -> int:
+        self.messages[message["id"]] = message
+        self.history_id += 1
+        self.history.append({
+            "id": str(self.history_id),
+            "messages": [{"id": message["id"]}],
+            "messagesAdded": [{"message": {"id": message["id"], "labelIds": ["INBOX"]}}]
+        })
+        return self.history_id
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        time.sleep(self.latency)
+        self.requests.append((method, uri))
+        parsed = urlparse(uri)
+        if parsed.path == "/batch":
+            response, content = self._batch(body=body, headers=headers or {})
+        else:
+            status, payload = self._route(method=method, path=parsed.path, query=parse_qs(parsed.query))
+            response = httplib2.Response({"status": status, "content-type": "application/json"})
+            content = json.dumps(payload).encode()
+        self.bytes_sent += len(content)
+        return response, content
+
+    def _route(self, method: str, path: str, query: dict):
+        segments = path.strip("/").split("/")
+        if segments[-1] == "profile":
+            return 200, {"emailAddress": "john.doe@gmail.com", "historyId": str(self.history_id)}
+
+        if segments[-1] == "history":
+            start = int(query["startHistoryId"][0])
+            if start < self.min_history_id:
+                return 404, {"error": {"code": 404, "message": "Requested entity was not found."}}
+            records = [record for record in self.history if int(record["id"]) > start]
+            return 200, {"history": records, "historyId": str(self.history_id)}
+
+        if segments[-1] == "messages" and method == "GET":
+            ids = list(self.messages)
+            max_results = int(query.get("maxResults", ["100"])[0])
+            start = int(query.get("pageToken", ["0"])[0])
+            page = ids[start:start + max_results]
+            payload = {"messages": [{"id": i, "threadId": i} for i in page], "resultSizeEstimate": len(ids)}
+            if start + max_results < len(ids):
+                payload["nextPageToken"] = str(start + max_results)
+            return 200, payload
+
+        if len(segments) >= 2 and segments[-2] == "messages" and method == "GET":
+            message_id = segments[-1]
+            if self.throttled.get(message_id, 0) > 0:
+                self.throttled[message_id] -= 1
+                return 429, {"error": {"code": 429, "message": "Too many concurrent requests for user",
+                                       "errors": [{"reason": "rateLimitExceeded"}]}}
+            if message_id not in self.messages:
+                return 404, {"error": {"code": 404, "message": "Requested entity was not found."}}
+            return 200, shape_message(self.messages[message_id], query=query)
+
+        return 404, {"error": {"code": 404, "message": f"Unknown route {path}"}}
+
+    def _batch(self, body: str, headers: dict):
+        parser = FeedParser()
+        parser.feed(f"content-type: {headers['content-type']}\r\n\r\n{body}")
+        message = parser.close()
+
+        boundary = "fake_batch_boundary"
+        chunks = []
+        for part in message.get_payload():
+            request_line = part.get_payload().split("\n", 1)[0]
+            method, target, _ = request_line.split(" ", 2)
+            parsed = urlparse(target)
+            status, payload = self._route(method=method, path=parsed.path, query=parse_qs(parsed.query))
+            content_id = part["Content-ID"].replace("<", "<response-", 1)
+            chunks.append(
+                f"--{boundary}\r\n"
+                f"Content-Type: application/http\r\n"
+                f"Content-ID: {content_id}\r\n\r\n"
+                f"HTTP/1.1 {status} {responses.get(status, 'Unknown')}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        content = "".join(chunks) + f"--{boundary}--\r\n"
+        response = httplib2.Response({"status": 200, "content-type": f"multipart/mixed; boundary={boundary}"})
+        return response, content.encode("utf-8")
+
+
+def build_fake_service(http: FakeGmailHttp):
+    return build(serviceName="gmail", version="v1", http=http, static_discovery=True)
@@ -0,0 +1,77 @@
+import os
+import json
+from datetime import timedelta
+from src.service import web_gmail
+from src.service.accounts import SqliteCredentialStore, MailboxRegistry, account_slug
+from src.service.gmail_sync import GmailSyncEngine
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox, make_token, make_web_service
+
+
+def test_credential_store_normalizes_accounts(tmp_path):
+    store = SqliteCredentialStore(path=os.path.join(tmp_path, "accounts.sqlite3"))
+    store.put(" John.Doe@Gmail.com ", "token-1")
+    store.put("jane@example.com", "token-2")
+    store.put("john.doe@gmail.com", "token-3")
+
+    assert len(store) == 2
+    assert store.get("JOHN.DOE@gmail.com") == "token-3"
+    assert store.accounts() == ["jane@example.com", "john.doe@gmail.com"]
+    store.delete("jane@example.com")
+    assert store.get("jane@example.com") is None
+    assert account_slug("John Doe/x@gmail.com") == "john_doe_x@gmail.com"
+
+
+def test_registry_keeps_a_bounded_lru_of_live_clients(tmp_path):
+    store = SqliteCredentialStore(path=os.path.join(tmp_path, "accounts.sqlite3"))
+    built = []
+
+    def factory(account, token):
+        built.append(account)
+        return GmailSyncEngine(mail_service=make_web_service(token=token), on_emails=lambda emails: None)
+
+    registry = MailboxRegistry(credentials=store, factory=factory, capacity=2)
+    for account in ("a@x.com", "b@x.com", "c@x.com"):
+        registry.register(account=account, token=make_token(expires_in=timedelta(hours=1)))
+
+    first = registry.get("a@x.com")
+    assert registry.get("A@x.com") is first
+    registry.get("b@x.com")
+    registry.get("c@x.com")
+    assert registry.get("a@x.com") is not first
+    assert registry.get("unknown@x.com") is None
+    assert built == ["a@x.com", "b@x.com", "c@x.com", "a@x.com"]
+    assert registry.metrics["live"] == 2 and registry.metrics["evictions"] == 2
+    assert registry.metrics["unknown"] == 1
+
+
+def test_notifications_sync_the_matching_mailbox(monkeypatch, tmp_path):
+    mailboxes = {
+        "a@x.com": FakeGmailHttp(messages=make_mailbox(size=2)),
+        "b@x.com": FakeGmailHttp(messages={})
+    }
+    received = {}
+
+    def factory(account, token):
+        return GmailSyncEngine(
+            mail_service=make_web_service(token=token),
+            on_emails=lambda emails: received.setdefault(account, []).extend(e.id for e in emails),
+            state_path=os.path.join(tmp_path, f"{account_slug(account)}.json")
+        )
+
+    monkeypatch.setattr(
+        web_gmail, "build", lambda **kwargs: build_fake_service(http=mailboxes[kwargs["credentials"].token])
+    )
+    registry = MailboxRegistry(
+        credentials=SqliteCredentialStore(path=os.path.join(tmp_path, "accounts.sqlite3")),
+        factory=factory
+    )
+    for account, http in mailboxes.items():
+        token = {**json.loads(make_token(expires_in=timedelta(hours=1))), "token": account}
+        registry.register(account=account, token=json.dumps(token))
+        registry.get(account).seed(history_id=http.history_id)
+
+    new_id = mailboxes["b@x.com"].add_message(make_mailbox(size=3)["0000000000000002"])
+    registry.get("b@x.com").notify(history_id=new_id)
+
+    assert received == {"b@x.com": ["0000000000000002"]}
+    assert os.path.isfile(os.path.join(tmp_path, "b@x.com.json"))
@@ -0,0 +1,85 @@
+import time
+import asyncio
+import pytest
+from openai import APIStatusError, APITimeoutError
+from src.service.async_chatgpt_analyzer import AsyncChatGptAnalyzer
+from src.service.rate_limiter import AsyncTokenBucket
+from tests.fake_openai import FakeOpenAIServer
+
+ANSWER = {"is_transaction": False, "transaction_type": "", "amount": 0.0, "establishment": "",
+          "beneficiary": "", "date": ""}
+MESSAGES = [{"role": "user", "content": "Novedades"}]
+
+
+@pytest.fixture(autouse=True)
+def fixed_token_count(monkeypatch):
+    monkeypatch.setattr(AsyncChatGptAnalyzer, "count_tokens", staticmethod(lambda messages, model: 10))
+
+
+def make_analyzer(server: FakeOpenAIServer, **kwargs) -> AsyncChatGptAnalyzer:
+    return AsyncChatGptAnalyzer(model="gpt-4o-mini", api_key="test", base_url=server.base_url, **kwargs)
+
+
+def test_concurrent_requests_bounded_by_semaphore():
+    with FakeOpenAIServer(answer=ANSWER, latency=0.2) as server:
+        analyzer = make_analyzer(server, max_concurrency=5)
+        start = time.perf_counter()
+        answers = analyzer.invoke_many([MESSAGES] * 10)
+        elapsed = time.perf_counter() - start
+        analyzer.close()
+
+    assert answers == [ANSWER] * 10
+    assert server.max_in_flight == 5
+    assert elapsed < 1.5
+
+
+def test_retries_rate_limits_and_server_errors():
+    with FakeOpenAIServer(answer=ANSWER, failures=[429, 503]) as server:
+        analyzer = make_analyzer(server, backoff=0.01)
+        assert analyzer.invoke(MESSAGES) == ANSWER
+        analyzer.close()
+
+    assert server.requests == 3
+    assert analyzer.metrics["retries"] == 2
+
+
+def test_gives_up_on_client_errors_and_timeouts():
+    with FakeOpenAIServer(answer=ANSWER, failures=[400]) as server:
+        analyzer = make_analyzer(server, backoff=0.01)
+        with pytest.raises(APIStatusError):
+            analyzer.invoke(MESSAGES)
+        analyzer.close()
+    assert server.requests == 1
+
+    with FakeOpenAIServer(answer=ANSWER, latency=0.5) as server:
+        analyzer = make_analyzer(server, timeout=0.1, max_retries=1, backoff=0.01)
+        with pytest.raises((APITimeoutError, asyncio.TimeoutError)):
+            analyzer.invoke(MESSAGES)
+        analyzer.close()
+    assert analyzer.metrics["failures"] == 1
+
+
+def test_calls_from_other_loops_run_on_the_analyzer_loop():
+    with FakeOpenAIServer(answer=ANSWER, latency=0.05) as server:
+        analyzer = make_analyzer(server, max_concurrency=2)
+        assert asyncio.run(analyzer.ainvoke_many([MESSAGES] * 4)) == [ANSWER] * 4
+        assert asyncio.run(analyzer.ainvoke(MESSAGES)) == ANSWER
+        assert analyzer.invoke_many([MESSAGES] * 4) == [ANSWER] * 4
+        analyzer.close()
+        assert asyncio.run(analyzer.ainvoke_many([MESSAGES] * 4)) == [ANSWER] * 4
+        analyzer.close()
+
+    assert server.requests == 13
+    assert server.max_in_flight == 2
+
+
+def test_token_bucket_limits_rate():
+    async def acquire_all(bucket: AsyncTokenBucket) -> float:
+        start = time.perf_counter()
+        for _ in range(5):
+            await bucket.acquire(1)
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(acquire_all(AsyncTokenBucket(rate_per_minute=1200, capacity=1)))
+
+    assert 0.15 < elapsed < 0.5
@@ -0,0 +1,95 @@
+import os
+import pytest
+from datetime import timedelta
+from src.service import web_gmail, gmail_batch
+from src.service.backfill import BackfillRunner
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox, make_token, make_web_service
+
+
+def make_runner(monkeypatch, http: FakeGmailHttp, on_emails, state_path: str) -> BackfillRunner:
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: build_fake_service(http=http))
+    gmail = make_web_service(token=make_token(expires_in=timedelta(hours=1)))
+    return BackfillRunner(mail_service=gmail, on_emails=on_emails, state_path=state_path, page_size=50, chunk_size=20)
+
+
+def test_backfill_walks_every_page_in_bounded_chunks(monkeypatch, tmp_path):
+    http = FakeGmailHttp(messages=make_mailbox(size=130))
+    chunks = []
+    runner = make_runner(monkeypatch, http, chunks.append, os.path.join(tmp_path, "backfill.json"))
+
+    assert runner.run() == 130
+    assert max(len(chunk) for chunk in chunks) == 20
+    assert [email.id for chunk in chunks for email in chunk] == list(http.messages)
+    assert runner.status["done"]
+    assert sum("pageToken" in uri for _, uri in http.requests) == 2
+
+
+def test_backfill_resumes_from_checkpoint(monkeypatch, tmp_path):
+    http = FakeGmailHttp(messages=make_mailbox(size=130))
+    state_path = os.path.join(tmp_path, "backfill.json")
+    received = []
+
+    def crash_after_70(emails):
+        if len(received) >= 70:
+            raise RuntimeError("worker crashed")
+        received.extend(emails)
+
+    with pytest.raises(RuntimeError):
+        make_runner(monkeypatch, http, crash_after_70, state_path).run(filters="in:inbox")
+    assert make_runner(monkeypatch, http, received.extend, state_path).run(filters="in:inbox", limit=30) == 30
+    assert len(received) == 100
+
+    restarted = make_runner(monkeypatch, http, received.extend, state_path)
+    assert restarted.status["processed"] == 100
+    assert restarted.run(filters="in:inbox") == 30
+    assert [email.id for email in received] == list(http.messages)
+
+    assert restarted.run(filters="in:inbox", restart=True) == 130
+
+
+def test_backfill_keeps_checkpoint_when_emails_are_dropped(monkeypatch, tmp_path):
+    monkeypatch.setattr(gmail_batch.time, "sleep", lambda seconds: None)
+    http = FakeGmailHttp(messages=make_mailbox(size=60))
+    state_path = os.path.join(tmp_path, "backfill.json")
+    received = []
+    ids = list(http.messages)
+    http.throttled[ids[25]] = 10
+
+    runner = make_runner(monkeypatch, http, received.extend, state_path)
+    assert runner.run() == 20
+    assert runner.status["lastId"] == ids[19]
+    assert runner.status["error"]
+
+    http.throttled.clear()
+    assert runner.run() == 40
+    assert {email.id for email in received} == set(ids)
+    assert runner.status["done"] and runner.status["error"] is None
+
+
+def test_backfill_moves_past_deleted_messages(monkeypatch, tmp_path):
+    http = FakeGmailHttp(messages=make_mailbox(size=60))
+    received = []
+    runner = make_runner(monkeypatch, http, received.extend, os.path.join(tmp_path, "backfill.json"))
+    ids = list(http.messages)
+    pages = [(ids[:50], "50"), (ids[50:], None)]
+    del http.messages[ids[25]]
+    monkeypatch.setattr(runner._mail_service, "iter_email_id_pages", lambda **kwargs: iter(pages))
+
+    assert runner.run() == 60
+    assert runner.status["done"] and runner.status["error"] is None
+    assert [email.id for email in received] == ids[:25] + ids[26:]
+
+
+def test_backfill_records_errors(monkeypatch, tmp_path):
+    http = FakeGmailHttp(messages=make_mailbox(size=10))
+    runner = make_runner(monkeypatch, http, lambda emails: None, os.path.join(tmp_path, "backfill.json"))
+
+    def failing_pages(**kwargs):
+        raise RuntimeError("list failed")
+        yield
+
+    monkeypatch.setattr(runner._mail_service, "iter_email_id_pages", failing_pages)
+    with pytest.raises(RuntimeError):
+        runner.run()
+    assert runner.status["error"] == "RuntimeError('list failed')"
+    assert not runner.status["running"]
@@ -0,0 +1,98 @@
+import json
+from types import SimpleNamespace
+from typing import List
+from src.service.chatgpt_analyzer import ChatGptAnalyzer
+from src.service.llm_cache import LLMResponseCache
+from src.service.transaction_extractor import build_batch_messages, build_messages, is_valid_transaction
+
+NOT_TRANSACTION = {"is_transaction": False, "transaction_type": "", "amount": 0.0, "establishment": "",
+                   "beneficiary": "", "date": ""}
+
+
+class ScriptedCompletions:
+    def __init__(self, answers: List[dict]):
+        self.answers = list(answers)
+        self.calls = []
+
+    def create(self, model, messages, response_format):
+        self.calls.append(messages)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(self.answers.pop(0))))],
+            usage=SimpleNamespace(total_tokens=100)
+        )
+
+
+def make_analyzer(monkeypatch, answers: List[dict], **kwargs) -> tuple[ChatGptAnalyzer, ScriptedCompletions]:
+    monkeypatch.setattr(
+        ChatGptAnalyzer, "count_tokens", staticmethod(lambda messages, model: len(json.dumps(messages)) // 4)
+    )
+    analyzer = ChatGptAnalyzer(model="gpt-4o-mini", api_key="test", **kwargs)
+    completions = ScriptedCompletions(answers=answers)
+    analyzer._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return analyzer, completions
+
+
+def make_items(size: int) -> List[dict]:
+    return [{"id": f"email-{i}", "subject": "Novedades", "text": "Hola " * 20} for i in range(size)]
+
+
+def invoke_batch(analyzer: ChatGptAnalyzer, items: List[dict]) -> dict:
+    return analyzer.invoke_batch(
+        items=items,
+        build_batch=build_batch_messages,
+        build_single=lambda item: build_messages(email=item),
+        validate=is_valid_transaction
+    )
+
+
+def test_batch_maps_results_by_id_and_retries_failures(monkeypatch):
+    items = make_items(3)
+    batch_answer = {"results": [
+        {"id": "email-2", **NOT_TRANSACTION},
+        {"id": "email-0", **NOT_TRANSACTION, "amount": "broken", "is_transaction": "yes"},
+        {"id": "unknown", **NOT_TRANSACTION}
+    ]}
+    analyzer, completions = make_analyzer(monkeypatch, answers=[batch_answer, NOT_TRANSACTION, NOT_TRANSACTION])
+
+    results = invoke_batch(analyzer, items)
+
+    assert results == {item["id"]: NOT_TRANSACTION for item in items}
+    assert len(completions.calls) == 3
+    assert "email-0" in completions.calls[1][1]["content"]
+    assert "email-1" in completions.calls[2][1]["content"]
+
+
+def test_batch_respects_token_budget_and_cache(monkeypatch):
+    items = make_items(6)
+    overhead = len(json.dumps(build_batch_messages([]))) // 4
+    per_item = len(json.dumps([{"role": "user", "content": str(items[0])}])) // 4
+    answers = [{"results": [{"id": item["id"], **NOT_TRANSACTION} for item in items[i:i + 2]]} for i in (0, 2, 4)]
+    analyzer, completions = make_analyzer(
+        monkeypatch, answers=answers, cache=LLMResponseCache(), batch_max_tokens=overhead + 2 * per_item
+    )
+
+    assert len(invoke_batch(analyzer, items)) == 6
+    assert len(completions.calls) == 3
+
+    assert invoke_batch(analyzer, items) == {item["id"]: NOT_TRANSACTION for item in items}
+    assert analyzer.invoke(build_messages(email=items[0])) == NOT_TRANSACTION
+    assert len(completions.calls) == 3
+
+
+def test_offline_batch_file_round_trip(monkeypatch, tmp_path):
+    analyzer, _ = make_analyzer(monkeypatch, answers=[])
+    requests = {item["id"]: build_messages(email=item) for item in make_items(2)}
+
+    assert analyzer.write_batch_file(str(tmp_path / "batch.jsonl"), requests) == 2
+    lines = [json.loads(line) for line in (tmp_path / "batch.jsonl").read_text().splitlines()]
+    assert lines[0]["custom_id"] == "email-0"
+    assert lines[0]["url"] == "/v1/chat/completions"
+    assert lines[0]["body"]["model"] == "gpt-4o-mini"
+
+    output = [
+        {"custom_id": "email-0", "error": None,
+         "response": {"status_code": 200, "body": {"choices": [{"message": {"content": json.dumps(NOT_TRANSACTION)}}]}}},
+        {"custom_id": "email-1", "error": {"code": "server_error"}, "response": None}
+    ]
+    (tmp_path / "output.jsonl").write_text("\n".join(json.dumps(line) for line in output))
+    assert ChatGptAnalyzer.read_batch_results(str(tmp_path / "output.jsonl")) == {"email-0": NOT_TRANSACTION}
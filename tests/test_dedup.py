@@ -0,0 +1,69 @@
+import os
+import time
+from datetime import timedelta
+from src.service import web_gmail
+from src.service.dedup import Deduplicator, MemoryDedupStore, SqliteDedupStore
+from src.service.gmail_sync import GmailSyncEngine
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox, make_token, make_web_service
+
+
+def test_memory_store_lru_and_ttl():
+    store = MemoryDedupStore(capacity=2, ttl=0.05)
+    store.add("a")
+    store.add("b")
+    assert store.contains("a")
+    store.add("c")
+    assert not store.contains("b")
+    assert store.contains("a") and store.contains("c")
+    time.sleep(0.06)
+    assert not store.contains("a")
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = os.path.join(tmp_path, "dedup.sqlite3")
+    SqliteDedupStore(path=path).add("pubsub:1")
+
+    deduplicator = Deduplicator(memory=MemoryDedupStore(), persistent=SqliteDedupStore(path=path))
+    assert deduplicator.check_and_mark("pubsub:1")
+    assert not deduplicator.check_and_mark("pubsub:2")
+    assert deduplicator.seen("pubsub:2")
+    deduplicator.forget("pubsub:2")
+    assert not deduplicator.seen("pubsub:2")
+    assert deduplicator.metrics["hits"] == 2 and deduplicator.metrics["misses"] == 2
+
+
+def test_check_and_mark_is_atomic_across_processes(tmp_path):
+    path = os.path.join(tmp_path, "dedup.sqlite3")
+    first = Deduplicator(memory=MemoryDedupStore(), persistent=SqliteDedupStore(path=path))
+    second = Deduplicator(memory=MemoryDedupStore(), persistent=SqliteDedupStore(path=path))
+
+    assert not first.check_and_mark("pubsub:1")
+    assert second.check_and_mark("pubsub:1")
+    assert not second.check_and_mark("pubsub:2")
+    assert first.check_and_mark("pubsub:2")
+
+    expired = SqliteDedupStore(path=path, ttl=0.05)
+    time.sleep(0.06)
+    assert expired.add_if_absent("pubsub:1")
+    assert not expired.add_if_absent("pubsub:1")
+
+
+def test_sync_skips_processed_emails_before_fetching(monkeypatch):
+    mailbox = make_mailbox(size=5)
+    http = FakeGmailHttp(messages=mailbox)
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: build_fake_service(http=http))
+    deduplicator = Deduplicator(memory=MemoryDedupStore())
+    for message_id in list(mailbox)[:3]:
+        deduplicator.mark(f"gmail:{message_id}")
+
+    received = []
+    engine = GmailSyncEngine(
+        mail_service=make_web_service(token=make_token(expires_in=timedelta(hours=1))),
+        on_emails=received.extend,
+        deduplicator=deduplicator
+    )
+    engine.notify(history_id=http.history_id)
+
+    assert [email.id for email in received] == list(mailbox)[3:]
+    fetched = [uri for method, uri in http.requests if method == "POST"]
+    assert len(fetched) == 1
@@ -0,0 +1,35 @@
+from src.service.gmail_batch import batch_get_messages
+from src.service.local_gmail import LocalGmailService, Email
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox
+
+
+def test_batch_get_messages_groups_requests():
+    mailbox = make_mailbox(size=120)
+    http = FakeGmailHttp(messages=mailbox)
+    service = build_fake_service(http=http)
+
+    responses = batch_get_messages(service=service, message_ids=list(mailbox), batch_size=50)
+    assert [rsp["id"] for rsp in responses] == list(mailbox)
+    assert len(http.requests) == 3
+
+
+def test_batch_get_messages_skips_errors_and_retries_throttled():
+    mailbox = make_mailbox(size=10)
+    ids = list(mailbox)
+    http = FakeGmailHttp(messages=mailbox, throttled={ids[3]: 2})
+    service = build_fake_service(http=http)
+
+    responses = batch_get_messages(service=service, message_ids=ids + ["missing"], batch_size=4, backoff=0)
+    assert [rsp["id"] for rsp in responses] == ids
+    assert len(http.requests) == 3 + 2
+
+
+def test_get_emails_batched():
+    mailbox = make_mailbox(size=20)
+    gmail = LocalGmailService()
+    gmail._service = build_fake_service(http=FakeGmailHttp(messages=mailbox))
+
+    emails = gmail.get_emails(max_results=20, filters="from:bancaenlinea@produbanco.com", batch_size=8)
+    assert len(emails) == 20
+    assert all(isinstance(email, Email) for email in emails)
+    assert emails[5].text == "Estimado/a John Doe Monto: $5.00 Referencia: 0000000005"
@@ -0,0 +1,75 @@
+import base64
+from src.service.gmail_message import Email, Response, select_body
+
+
+def encode(text: str, charset: str = "utf-8") -> str:
+    return base64.urlsafe_b64encode(text.encode(charset)).decode("ASCII")
+
+
+def leaf(mime_type: str, text: str, charset: str = "utf-8") -> dict:
+    return {
+        "mimeType": mime_type,
+        "headers": [{"name": "Content-Type", "value": f"{mime_type}; charset={charset}"}],
+        "body": {"size": len(text), "data": encode(text, charset)}
+    }
+
+
+def message(payload: dict) -> dict:
+    headers = [{"name": "From", "value": "Uber Receipts <noreply@uber.com>"}, {"name": "Subject", "value": "Tu viaje"}]
+    return {"id": "abc", "payload": {**payload, "headers": headers}}
+
+
+ATTACHMENT = {
+    "mimeType": "application/pdf",
+    "filename": "recibo.pdf",
+    "headers": [{"name": "Content-Disposition", "value": "attachment; filename=recibo.pdf"}],
+    "body": {"size": 12000, "attachmentId": "ANGjdJ8"}
+}
+
+
+def test_prefers_plain_part_in_nested_multipart():
+    raw = message({
+        "mimeType": "multipart/mixed",
+        "body": {"size": 0},
+        "parts": [
+            {"mimeType": "multipart/alternative", "body": {"size": 0}, "parts": [
+                leaf("text/html", "<p>Total <b>$4.50</b></p>"),
+                leaf("text/plain", "Total\n  $4.50\n")
+            ]},
+            ATTACHMENT
+        ]
+    })
+
+    email = Email.from_gmail(raw)
+
+    assert email.mimeType == "multipart/mixed"
+    assert email.body_type == "text/plain"
+    assert email.text == "Total $4.50"
+    assert email.html is None
+    assert Response.model_validate(raw).parse() == email
+
+
+def test_falls_back_to_html_and_transcodes_charset():
+    raw = message({
+        "mimeType": "multipart/related",
+        "body": {"size": 0},
+        "parts": [
+            {"mimeType": "multipart/alternative", "body": {"size": 0}, "parts": [
+                leaf("text/html", "<p>Consumo en CAFÉ</p>", charset="iso-8859-1")
+            ]},
+            {"mimeType": "image/png", "filename": "logo.png", "body": {"attachmentId": "img"}}
+        ]
+    })
+
+    email = Email.from_gmail(raw)
+
+    assert email.body_type == "text/html"
+    assert email.html == "<p>Consumo en CAFÉ</p>"
+    assert email.text == "Consumo en CAFÉ"
+
+
+def test_attachments_are_never_decoded():
+    attachment = {**ATTACHMENT, "body": {"attachmentId": "x", "data": "not base64!"}}
+
+    assert select_body({"mimeType": "multipart/mixed", "parts": [attachment]}) == (None, None)
+    assert Email.from_gmail(message({"mimeType": "multipart/mixed", "parts": [attachment]})).text is None
@@ -0,0 +1,137 @@
+import os
+import pytest
+import threading
+from datetime import timedelta
+from src.service import web_gmail, gmail_batch
+from src.service.gmail_sync import GmailSyncEngine, IncompleteSyncError
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox, make_message, make_token, make_web_service
+
+
+def make_engine(monkeypatch, http: FakeGmailHttp, received: list, state_path: str = None) -> GmailSyncEngine:
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: build_fake_service(http=http))
+    gmail = make_web_service(token=make_token(expires_in=timedelta(hours=1)))
+    return GmailSyncEngine(mail_service=gmail, on_emails=received.extend, state_path=state_path, resync_limit=5)
+
+
+def new_message(http: FakeGmailHttp, message_id: str) -> int:
+    return http.add_message(make_message(
+        message_id=message_id,
+        sender="noreply@uber.com",
+        subject=f"Tu viaje {message_id}",
+        html="<p>Total $4.50</p>"
+    ))
+
+
+def test_sync_fetches_only_new_messages(monkeypatch, tmp_path):
+    http = FakeGmailHttp(messages=make_mailbox(size=20))
+    received = []
+    state_path = os.path.join(tmp_path, "sync_state.json")
+    engine = make_engine(monkeypatch, http=http, received=received, state_path=state_path)
+
+    assert engine.notify(history_id=http.history_id)
+    assert len(received) == 5
+    assert engine.history_id == http.history_id
+
+    received.clear()
+    new_message(http, message_id="a1")
+    history_id = new_message(http, message_id="a2")
+    assert engine.notify(history_id=history_id)
+    assert [email.id for email in received] == ["a1", "a2"]
+
+    received.clear()
+    assert engine.notify(history_id=history_id)
+    assert received == []
+
+    restarted = make_engine(monkeypatch, http=http, received=received, state_path=state_path)
+    assert restarted.history_id == history_id
+
+
+def test_sync_resyncs_when_history_expired(monkeypatch):
+    http = FakeGmailHttp(messages=make_mailbox(size=20))
+    received = []
+    engine = make_engine(monkeypatch, http=http, received=received)
+    engine.seed(history_id=900)
+
+    assert engine.notify(history_id=http.history_id)
+    assert len(received) == 5
+    assert engine.history_id == http.history_id
+
+
+def test_sync_coalesces_notification_bursts(monkeypatch):
+    http = FakeGmailHttp(messages={})
+    started, release = threading.Event(), threading.Event()
+    received = []
+
+    def slow_handler(emails):
+        started.set()
+        release.wait(timeout=5)
+        received.extend(emails)
+
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: build_fake_service(http=http))
+    engine = GmailSyncEngine(
+        mail_service=make_web_service(token=make_token(expires_in=timedelta(hours=1))),
+        on_emails=slow_handler
+    )
+    engine.seed(history_id=http.history_id)
+
+    first = threading.Thread(target=engine.notify, kwargs={"history_id": new_message(http, message_id="b1")})
+    first.start()
+    started.wait(timeout=5)
+
+    history_requests = len([uri for _, uri in http.requests if "/history" in uri])
+    results = [engine.notify(history_id=new_message(http, message_id=f"b{i}")) for i in range(2, 6)]
+    release.set()
+    first.join(timeout=5)
+
+    assert results == [False] * 4
+    assert sorted(email.id for email in received) == ["b1", "b2", "b3", "b4", "b5"]
+    assert len([uri for _, uri in http.requests if "/history" in uri]) == history_requests + 1
+
+
+def test_sync_keeps_history_when_emails_are_not_fetched(monkeypatch):
+    monkeypatch.setattr(gmail_batch.time, "sleep", lambda seconds: None)
+    http = FakeGmailHttp(messages={})
+    received = []
+    engine = make_engine(monkeypatch, http=http, received=received)
+    engine.seed(history_id=http.history_id)
+    start = engine.history_id
+
+    new_message(http, message_id="c1")
+    history_id = new_message(http, message_id="c2")
+    http.throttled["c2"] = 10
+    with pytest.raises(IncompleteSyncError):
+        engine.notify(history_id=history_id)
+    assert engine.history_id == start
+
+    with monkeypatch.context() as patch:
+        patch.setattr(engine.mail_service, "fetch_emails", lambda **kwargs: None)
+        with pytest.raises(IncompleteSyncError):
+            engine.notify(history_id=history_id)
+    assert engine.history_id == start
+
+    http.throttled.clear()
+    received.clear()
+    assert engine.notify(history_id=history_id)
+    assert [email.id for email in received] == ["c1", "c2"]
+    assert engine.history_id == history_id
+
+
+def test_sync_skips_messages_deleted_before_fetch(monkeypatch):
+    http = FakeGmailHttp(messages={})
+    received = []
+    engine = make_engine(monkeypatch, http=http, received=received)
+    engine.seed(history_id=http.history_id)
+
+    new_message(http, message_id="d1")
+    new_message(http, message_id="d2")
+    del http.messages["d1"]
+    history_id = new_message(http, message_id="d3")
+
+    assert engine.notify(history_id=history_id)
+    assert [email.id for email in received] == ["d2", "d3"]
+    assert engine.history_id == history_id
+
+    history_id = new_message(http, message_id="d4")
+    received.clear()
+    assert engine.notify(history_id=history_id)
+    assert [email.id for email in received] == ["d4"]
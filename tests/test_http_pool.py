@@ -0,0 +1,43 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.service.http_pool import HttpPool
+
+
+def test_pool_reuses_transports_and_bounds_concurrency():
+    created = []
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def use(_):
+        with pool.acquire() as http:
+            with lock:
+                active.append(http)
+                peak.append(len(active))
+            threading.Event().wait(0.01)
+            with lock:
+                active.remove(http)
+
+    pool = HttpPool(factory=lambda: created.append(object()) or created[-1], size=3)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(use, range(40)))
+
+    assert max(peak) <= 3
+    assert len(created) <= 3
+    assert pool.metrics["acquired"] == 40
+    assert pool.metrics["in_use"] == 0
+    assert pool.metrics["waits"] > 0
+
+
+def test_clear_discards_idle_and_in_use_transports():
+    pool = HttpPool(factory=object, size=2)
+    with pool.acquire() as first:
+        pass
+    with pool.acquire() as again:
+        assert again is first
+        pool.clear()
+
+    with pool.acquire() as fresh:
+        assert fresh is not first
+    assert pool.metrics["created"] == 2
+    assert pool.metrics["discarded"] == 1
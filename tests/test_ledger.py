@@ -0,0 +1,124 @@
+import os
+from src.service.ledger import SqliteLedger
+from src.service.budgets import parse_budgets
+from src.service.merchants import MerchantDirectory
+
+
+def make_transaction(amount: float, date: str, establishment: str = "", beneficiary: str = "", kind: str = "card") -> dict:
+    return {
+        "is_transaction": True,
+        "transaction_type": kind,
+        "amount": amount,
+        "establishment": establishment,
+        "beneficiary": beneficiary,
+        "date": date
+    }
+
+
+def make_ledger(tmp_path) -> SqliteLedger:
+    ledger = SqliteLedger(path=os.path.join(tmp_path, "ledger.sqlite3"))
+    ledger.record("e1", make_transaction(10.10, "2025-01-05", establishment="Uber"))
+    ledger.record("e2", make_transaction(20.20, "2025-01-20", establishment="Supermaxi"))
+    ledger.record("e3", make_transaction(5.00, "2025-02-01", establishment="Uber"))
+    ledger.record("e4", make_transaction(100, "2025-02-14", beneficiary="John Doe", kind="transfer"))
+    return ledger
+
+
+def test_record_is_idempotent_per_email_and_skips_non_transactions(tmp_path):
+    ledger = make_ledger(tmp_path)
+    assert ledger.record("e1", make_transaction(12.5, "2025-01-05", establishment="Uber"))
+    assert not ledger.record("e5", {"is_transaction": False})
+    assert not ledger.record("e6", make_transaction(1, None, establishment="Uber"))
+    assert not ledger.record("e7", make_transaction(1, "", establishment="Uber"))
+    assert not ledger.record("e8", make_transaction(1, "05/01/2025", establishment="Uber"))
+    assert not ledger.record("e9", make_transaction(1, "2025-02-30", establishment="Uber"))
+    assert not ledger.record("e10", make_transaction(0, "2025-01-05", establishment="Uber"))
+    assert not ledger.record("e11", make_transaction("abc", "2025-01-05", establishment="Uber"))
+    assert not ledger.record("e12", make_transaction(float("inf"), "2025-01-05", establishment="Uber"))
+    assert ledger.verify() == 0
+
+    assert ledger.metrics == {"transactions": 4, "total": 137.7}
+    assert ledger.get("e1")["amount"] == 12.5
+    assert ledger.delete("e1") and not ledger.delete("e1")
+    assert ledger.get("e1") is None
+
+
+def test_spend_aggregates(tmp_path):
+    ledger = make_ledger(tmp_path)
+
+    assert ledger.spend_by(group="month") == [
+        {"month": "2025-01", "total": 30.3, "count": 2},
+        {"month": "2025-02", "total": 105.0, "count": 2}
+    ]
+    assert ledger.spend_by(group="type") == [
+        {"type": "transfer", "total": 100.0, "count": 1},
+        {"type": "card", "total": 35.3, "count": 3}
+    ]
+    assert ledger.spend_by(group="merchant", start="2025-01-01", end="2025-01-31") == [
+        {"merchant": "Supermaxi", "total": 20.2, "count": 1},
+        {"merchant": "Uber", "total": 10.1, "count": 1}
+    ]
+    assert [m["merchant"] for m in ledger.top_merchants(n=2)] == ["John Doe", "Supermaxi"]
+    assert [t["email_id"] for t in ledger.transactions(start="2025-02-01")] == ["e4", "e3"]
+
+
+def test_rollups_follow_corrections_and_deletes(tmp_path):
+    ledger = make_ledger(tmp_path)
+    ledger.record("e1", make_transaction(12.5, "2025-02-03", establishment="Uber", kind="card"))
+    ledger.record("e2", make_transaction(20.2, "2025-01-20", establishment="Supermaxi", kind="transfer"))
+    ledger.delete("e4")
+
+    assert ledger.verify() == 0
+    assert ledger.spend_by(group="month") == [
+        {"month": "2025-01", "total": 20.2, "count": 1},
+        {"month": "2025-02", "total": 17.5, "count": 2}
+    ]
+    assert ledger.spend_by(group="merchant") == [
+        {"merchant": "Supermaxi", "total": 20.2, "count": 1},
+        {"merchant": "Uber", "total": 17.5, "count": 2}
+    ]
+
+    ledger._conn.execute("UPDATE rollups SET total_cents = 0 WHERE dimension = 'day'")
+    assert ledger.verify() == 3
+    assert ledger.rebuild() == 3
+    assert ledger.verify() == 0
+
+
+def test_budget_alerts_fire_once_per_threshold(tmp_path):
+    fired = []
+    ledger = SqliteLedger(
+        path=os.path.join(tmp_path, "ledger.sqlite3"),
+        budgets=parse_budgets('[{"name": "rides", "limit": 20, "merchant": "Uber"}, {"name": "all", "limit": 1000}]'),
+        on_alert=fired.append
+    )
+    ledger.record("e1", make_transaction(10, "2025-01-05", establishment="Uber"))
+    ledger.record("e2", make_transaction(7, "2025-01-06", establishment="Uber"))
+    ledger.record("e3", make_transaction(50, "2025-01-07", establishment="Supermaxi"))
+    assert [(alert["budget"], alert["threshold"]) for alert in fired] == [("rides", 0.8)]
+
+    ledger.record("e2", make_transaction(15, "2025-01-06", establishment="Uber"))
+    ledger.record("e4", make_transaction(5, "2025-01-08", establishment="Uber"))
+    ledger.record("e5", make_transaction(5, "2025-02-01", establishment="Uber"))
+    assert [(alert["budget"], alert["period"], alert["threshold"]) for alert in fired] == [
+        ("rides", "2025-01", 0.8), ("rides", "2025-01", 1.0)
+    ]
+    assert len(ledger.alerts()) == 2
+    assert [(status["name"], status["total"]) for status in ledger.budget_status("2025-01")] == [
+        ("rides", 30.0), ("all", 80.0)
+    ]
+
+
+def test_merchants_are_canonicalized_and_corrections_move_history(tmp_path):
+    merchants = MerchantDirectory(path=os.path.join(tmp_path, "merchants.sqlite3"))
+    merchants.add("Supermaxi")
+    ledger = SqliteLedger(path=os.path.join(tmp_path, "ledger.sqlite3"), merchants=merchants)
+    ledger.record("e1", make_transaction(10, "2025-01-05", establishment="SUPERMAXI QUITO"))
+    ledger.record("e2", make_transaction(20, "2025-01-06", establishment="BANCO SUPER"))
+    ledger.record("e3", make_transaction(30, "2025-02-01", establishment="Banco Super"))
+    assert [m["merchant"] for m in ledger.top_merchants()] == ["Banco Super", "BANCO SUPER", "Supermaxi"]
+
+    merchants.learn("banco super", "Supermaxi")
+    assert ledger.normalize_merchants() == 2
+    assert ledger.normalize_merchants() == 0
+    assert ledger.top_merchants() == [{"merchant": "Supermaxi", "total": 60.0, "count": 3}]
+    assert ledger.verify() == 0
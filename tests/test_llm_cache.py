@@ -0,0 +1,96 @@
+import json
+import time
+from types import SimpleNamespace
+from src.service.chatgpt_analyzer import ChatGptAnalyzer
+from src.service.llm_cache import LLMResponseCache, make_cache_key
+
+MESSAGES = [
+    {"role": "system", "content": "You are a expert in analyzing emails."},
+    {"role": "user", "content": "Transferencia enviada por $223.00 desde Banco"}
+]
+ANSWER = {
+    "is_transaction": True,
+    "transaction_type": "transfer",
+    "amount": 223.0,
+    "establishment": "",
+    "beneficiary": "BANCO SUPER",
+    "date": "2025-04-02"
+}
+
+
+class StubCompletions:
+    def __init__(self, answer: dict):
+        self.answer = answer
+        self.calls = 0
+
+    def create(self, model, messages, response_format):
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(self.answer)))],
+            usage=SimpleNamespace(total_tokens=42)
+        )
+
+
+def make_analyzer(monkeypatch, cache: LLMResponseCache) -> tuple[ChatGptAnalyzer, StubCompletions]:
+    monkeypatch.setattr(ChatGptAnalyzer, "count_tokens", staticmethod(lambda messages, model: 40))
+    analyzer = ChatGptAnalyzer(model="gpt-4o-mini", api_key="test", cache=cache)
+    completions = StubCompletions(answer=ANSWER)
+    analyzer._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return analyzer, completions
+
+
+def test_repeated_prompt_served_from_memory(monkeypatch):
+    cache = LLMResponseCache()
+    analyzer, completions = make_analyzer(monkeypatch, cache)
+
+    assert analyzer.invoke(MESSAGES) == ANSWER
+    assert analyzer.invoke(MESSAGES) == ANSWER
+    assert completions.calls == 1
+    assert cache.metrics["memory_hits"] == 1
+    assert cache.metrics["tokens_saved"] == 42
+
+    assert analyzer.invoke(MESSAGES, bypass_cache=True) == ANSWER
+    assert completions.calls == 2
+
+
+def test_disk_tier_survives_restart(monkeypatch, tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    analyzer, completions = make_analyzer(monkeypatch, LLMResponseCache(path=path))
+    analyzer.invoke(MESSAGES)
+
+    restarted = LLMResponseCache(path=path)
+    analyzer, completions = make_analyzer(monkeypatch, restarted)
+    assert analyzer.invoke(MESSAGES) == ANSWER
+    assert completions.calls == 0
+    assert restarted.metrics["disk_hits"] == 1
+
+
+def test_empty_answers_are_not_cached(monkeypatch):
+    cache = LLMResponseCache()
+    analyzer, completions = make_analyzer(monkeypatch, cache)
+    completions.answer = {}
+
+    analyzer.invoke(MESSAGES)
+    analyzer.invoke(MESSAGES)
+    assert completions.calls == 2
+
+
+def test_key_ignores_whitespace_but_not_model():
+    spaced = [{"role": message["role"], "content": f"  {message['content']}\n\n"} for message in MESSAGES]
+
+    assert make_cache_key("gpt-4o-mini", MESSAGES) == make_cache_key("gpt-4o-mini", spaced)
+    assert make_cache_key("gpt-4o-mini", MESSAGES) != make_cache_key("gpt-4o", MESSAGES)
+
+
+def test_ttl_and_max_entries(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm_cache.sqlite3"), capacity=1, max_entries=2, ttl=60)
+    for i in range(3):
+        cache.put(f"key-{i}", answer={"i": i})
+        time.sleep(0.01)
+
+    assert cache.get("key-2") == {"i": 2}
+    assert cache.get("key-1") == {"i": 1}
+    assert cache.get("key-0") is None
+
+    cache._ttl = 0
+    assert cache.get("key-2") is None
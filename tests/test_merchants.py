@@ -0,0 +1,42 @@
+import os
+from src.service.merchants import MerchantDirectory, normalize_text
+
+
+def make_directory(tmp_path) -> MerchantDirectory:
+    directory = MerchantDirectory(path=os.path.join(tmp_path, "merchants.sqlite3"))
+    directory.add("Uber", aliases=["uber trip", "uber bv"])
+    directory.add("Uber Eats", aliases=["ubereats"])
+    directory.add("Supermaxi", aliases=["super maxi"])
+    return directory
+
+
+def test_normalize_text_strips_accents_punctuation_and_numbers():
+    assert normalize_text("UBER *Trip 4521") == "uber trip"
+    assert normalize_text("  Café  Niño ") == "cafe nino"
+
+
+def test_resolve_exact_and_fuzzy_names(tmp_path):
+    directory = make_directory(tmp_path)
+
+    assert directory.resolve("UBER *TRIP") == "Uber"
+    assert directory.resolve("UBER EATS") == "Uber Eats"
+    assert directory.resolve("SUPERMAXI QUITO") == "Supermaxi"
+    assert directory.resolve("Farmacias Fybeca") is None
+    assert directory.resolve("UBER *TRIP") == "Uber"
+    assert directory.metrics["hits"] == 1
+    assert directory.metrics["fuzzy"] == 1
+
+
+def test_learned_aliases_persist_and_win_over_dictionary(tmp_path):
+    directory = make_directory(tmp_path)
+    assert directory.resolve("BANCO SUPER") is None
+
+    directory.learn("BANCO SUPER", "Supermaxi")
+    directory.learn("uber bv", "Uber Eats")
+    assert directory.resolve("BANCO SUPER") == "Supermaxi"
+
+    reopened = MerchantDirectory(path=os.path.join(tmp_path, "merchants.sqlite3"))
+    reopened.add("Uber", aliases=["uber bv"])
+    assert len(reopened) == 3
+    assert reopened.resolve("Banco  Super") == "Supermaxi"
+    assert reopened.resolve("UBER BV") == "Uber Eats"
@@ -0,0 +1,66 @@
+import os
+from datetime import timedelta
+from src.service import web_gmail, message_store
+from src.service.message_store import SqliteMessageStore, parse_response
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox, make_token, make_web_service
+
+
+def test_store_round_trip_and_reparse(tmp_path, monkeypatch):
+    path = os.path.join(tmp_path, "messages.sqlite3")
+    raw = make_mailbox(size=1)["0000000000000000"]
+    email = parse_response(raw)
+    SqliteMessageStore(path=path).put(email, raw=raw)
+
+    store = SqliteMessageStore(path=path)
+    assert store.get(email.id) == email
+    assert store.get_raw(email.id) == raw
+    assert store.get("missing") is None
+
+    reparsed = []
+
+    def parser(raw_response):
+        reparsed.append(raw_response["id"])
+        return parse_response(raw_response)
+
+    monkeypatch.setattr(message_store, "PARSER_VERSION", message_store.PARSER_VERSION + 1)
+    upgraded = SqliteMessageStore(path=path, parser=parser)
+    assert upgraded.reparse_all() == 1
+    assert upgraded.get(email.id) == email
+    assert reparsed == [email.id]
+
+
+def test_store_evicts_raw_bodies_over_budget(tmp_path):
+    store = SqliteMessageStore(path=os.path.join(tmp_path, "messages.sqlite3"), max_raw_bytes=1000)
+    mailbox = make_mailbox(size=10)
+    for raw in mailbox.values():
+        store.put(parse_response(raw), raw=raw)
+
+    metrics = store.metrics
+    assert metrics["emails"] == 10
+    assert 0 < metrics["raw_bytes"] <= 1000
+    assert store.get_raw(list(mailbox)[0]) is None
+    assert store.get_raw(list(mailbox)[-1]) is not None
+    assert store.get(list(mailbox)[0]).text
+
+
+def test_gmail_service_reads_through_store(tmp_path, monkeypatch):
+    mailbox = make_mailbox(size=6)
+    http = FakeGmailHttp(messages=mailbox)
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: build_fake_service(http=http))
+    gmail = make_web_service(
+        token=make_token(expires_in=timedelta(hours=1)),
+        store=SqliteMessageStore(path=os.path.join(tmp_path, "messages.sqlite3"))
+    )
+    gmail.ensure_service()
+
+    ids = list(mailbox)
+    first = gmail.get_emails_by_ids(email_ids=ids[:4])
+    calls = len(http.requests)
+    second = gmail.get_emails_by_ids(email_ids=ids)
+    assert [email.id for email in second] == ids
+    assert second[:4] == first
+    assert len(http.requests) == calls + 1
+
+    calls = len(http.requests)
+    assert gmail.get_email_by_id(email_id=ids[5]) == second[5]
+    assert len(http.requests) == calls
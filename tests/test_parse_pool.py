@@ -0,0 +1,25 @@
+from src.service.parse_pool import ParsePool, parse_response
+from tests.fake_gmail import make_mailbox
+
+
+def test_pool_returns_emails_in_original_order():
+    responses = list(make_mailbox(size=40).values())[::-1]
+    pool = ParsePool(workers=2, chunk_size=7, min_batch=10)
+    try:
+        emails = pool.parse_many(responses)
+    finally:
+        pool.close()
+
+    assert [email.id for email in emails] == [rsp["id"] for rsp in responses]
+    assert emails == [parse_response(rsp) for rsp in responses]
+    assert pool.metrics["pooled"] == 40
+
+
+def test_small_batches_parse_inline():
+    pool = ParsePool(workers=4, min_batch=10)
+
+    emails = pool.parse_many(list(make_mailbox(size=5).values()))
+
+    assert len(emails) == 5
+    assert pool.metrics == {"workers": 4, "inline": 5, "pooled": 0}
+    assert pool._executor is None
@@ -0,0 +1,18 @@
+import os
+from src.service.process_lock import ProcessLock
+
+
+def test_only_one_holder_until_released(tmp_path):
+    path = os.path.join(tmp_path, "leader.lock")
+    first, second = ProcessLock(path=path), ProcessLock(path=path)
+
+    assert first.acquire() and first.held
+    assert not second.acquire() and not second.held
+    assert not first.acquire()
+    with open(path) as file:
+        assert file.read() == str(os.getpid())
+
+    first.release()
+    assert not first.held
+    assert second.acquire()
+    second.release()
@@ -0,0 +1,49 @@
+from src.service.prompt_compactor import PromptCompactor, split_sentences
+
+FOOTER = ("Si tienes alguna consulta no dudes en comunicarte con nosotros. "
+          "Síguenos en nuestras redes sociales para conocer las novedades.")
+TEXT = ("Estimado/a John Doe. Fecha y Hora: 2/Abril/2025 21:43. Monto: $223.00. "
+        "Si no realizaste esta transacción comunícate con nuestro Call Center. "
+        "La información de este mensaje es confidencial. ")
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def make_email(email_id: str, text: str, sender: str = "Banco <bancaenlinea@produbanco.com>") -> dict:
+    return {"id": email_id, "sender": sender, "subject": "Transferencia enviada", "text": text}
+
+
+def test_strips_static_boilerplate_and_keeps_transaction_sentences():
+    compactor = PromptCompactor(count_tokens=count_words)
+
+    text = compactor.compact(make_email("1", TEXT))["text"]
+
+    assert text == "Estimado/a John Doe. Fecha y Hora: 2/Abril/2025 21:43. Monto: $223.00."
+    assert compactor.metrics["tokens_after"] < compactor.metrics["tokens_before"]
+
+
+def test_learns_repeated_sentences_per_sender():
+    compactor = PromptCompactor(count_tokens=count_words, min_occurrences=2)
+    for i in range(2):
+        assert FOOTER.split(". ")[1] in compactor.compact(make_email(str(i), f"Monto: ${i}.00. {FOOTER}"))["text"]
+
+    assert compactor.compact(make_email("3", f"Monto: $3.00. {FOOTER}"))["text"] == "Monto: $3.00."
+    other = compactor.compact(make_email("4", f"Monto: $4.00. {FOOTER}", sender="alertas@otro.com"))
+    assert "redes sociales" in other["text"]
+
+
+def test_truncates_to_budget_keeping_relevant_sentences():
+    compactor = PromptCompactor(count_tokens=count_words, max_tokens=12)
+    filler = " ".join(f"Parrafo de relleno numero {i}." for i in range(20))
+
+    text = compactor.compact(make_email("1", f"{filler} Comercio: KFC. Valor: $12.80."))["text"]
+
+    assert count_words(text) <= 12
+    assert text.endswith("Comercio: KFC. Valor: $12.80.")
+    assert compactor.metrics["truncated"] == 1
+
+
+def test_split_sentences():
+    assert split_sentences("Hola. Monto: $1.00\nAdios!") == ["Hola.", "Monto: $1.00", "Adios!"]
@@ -0,0 +1,93 @@
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+from google.oauth2.credentials import Credentials
+from src.service import web_gmail
+from src.service.scheduler import Scheduler
+from tests.fake_gmail import make_token, make_web_service
+
+
+def test_scheduler_persists_next_runs_across_restarts(tmp_path):
+    state_path = os.path.join(tmp_path, "scheduler.json")
+    runs = []
+
+    scheduler = Scheduler(state_path=state_path)
+    scheduler.add_job(name="renew_watch", func=lambda: runs.append(1) or time.time() + 3600)
+    assert scheduler.run_pending() == 1
+    assert scheduler.run_pending() == 0
+
+    restarted = Scheduler(state_path=state_path)
+    restarted.add_job(name="renew_watch", func=lambda: runs.append(2) or time.time() + 3600)
+    assert restarted.run_pending() == 0
+    assert restarted.run_pending(now=time.time() + 3601) == 1
+    assert runs == [1, 2]
+
+
+def test_transient_jobs_run_on_every_start(tmp_path):
+    state_path = os.path.join(tmp_path, "scheduler.json")
+    runs = []
+
+    scheduler = Scheduler(state_path=state_path)
+    scheduler.add_job(name="refresh_token", func=lambda: runs.append(1) or time.time() + 3600, persist=False)
+    scheduler.add_job(name="renew_watch", func=lambda: time.time() + 3600)
+    assert scheduler.run_pending() == 2
+
+    restarted = Scheduler(state_path=state_path)
+    restarted.add_job(name="refresh_token", func=lambda: runs.append(2) or time.time() + 3600, persist=False)
+    restarted.add_job(name="renew_watch", func=lambda: time.time() + 3600)
+    assert restarted.run_pending() == 1
+    assert runs == [1, 2]
+
+
+def test_failed_job_is_retried_later(tmp_path):
+    def fail():
+        raise RuntimeError("watch failed")
+
+    scheduler = Scheduler(state_path=os.path.join(tmp_path, "scheduler.json"), retry_delay=120)
+    scheduler.add_job(name="renew_watch", func=fail)
+    scheduler.run_pending()
+
+    status = scheduler.status["renew_watch"]
+    assert status["failures"] == 1
+    assert "watch failed" in status["error"]
+    assert status["next_run"] >= time.time() + 100
+
+
+def test_background_thread_runs_due_jobs():
+    done = threading.Event()
+    scheduler = Scheduler(max_sleep=0.05)
+    scheduler.add_job(name="job", func=lambda: done.set() or time.time() + 3600)
+    scheduler.start()
+    try:
+        assert done.wait(timeout=2)
+    finally:
+        scheduler.stop(timeout=2)
+
+
+def test_proactive_refresh_does_not_block_requests(monkeypatch):
+    release = threading.Event()
+    refreshing = threading.Event()
+
+    def slow_refresh(self, request):
+        refreshing.set()
+        release.wait(timeout=5)
+        self.token = "new-access-token"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: object())
+    monkeypatch.setattr(Credentials, "refresh", slow_refresh)
+    gmail = make_web_service(token=make_token(expires_in=timedelta(minutes=8)))
+    gmail.ensure_service()
+
+    refresher = threading.Thread(target=gmail.refresh_credentials, kwargs={"margin": timedelta(minutes=10)})
+    refresher.start()
+    assert refreshing.wait(timeout=2)
+
+    start = time.perf_counter()
+    gmail.ensure_service()
+    assert time.perf_counter() - start < 0.5
+
+    release.set()
+    refresher.join(timeout=5)
+    assert gmail.token_expiry > datetime.utcnow() + timedelta(minutes=50)
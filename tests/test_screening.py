@@ -0,0 +1,45 @@
+from datetime import timedelta
+from src.service import web_gmail
+from src.service.screening import MessageScreen
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox, make_message, make_token, make_web_service
+
+
+def make_mixed_mailbox() -> dict:
+    mailbox = make_mailbox(size=4)
+    newsletter = "<p>Novedades</p>" * 500
+    for i in range(6):
+        message_id = f"news{i:012d}"
+        mailbox[message_id] = make_message(
+            message_id=message_id,
+            sender="Tienda <marketing@tienda.com>",
+            subject=f"Newsletter semanal {i}: ofertas y descuentos",
+            html=newsletter
+        )
+    return mailbox
+
+
+def test_screen_scores_senders_subjects_and_terms():
+    screen = MessageScreen()
+
+    assert screen.passes({"from": "alertas@produbanco.com", "subject": "Produbanco consumo"})
+    assert screen.passes({"from": "tienda@example.com", "subject": "Tu pedido por $25.90"})
+    assert not screen.passes({"from": "marketing@tienda.com", "subject": "Newsletter: ofertas"})
+    assert not screen.passes({"from": "amigo@gmail.com", "subject": "Hola"})
+    assert screen.metrics == {"screened": 4, "passed": 2, "rejected": 2}
+
+
+def test_metadata_screening_downloads_only_candidate_bodies(monkeypatch):
+    http = FakeGmailHttp(messages=make_mixed_mailbox())
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: build_fake_service(http=http))
+    gmail = make_web_service(token=make_token(expires_in=timedelta(hours=1)))
+    gmail.ensure_service()
+    email_ids = list(http.messages)
+
+    emails = gmail.get_emails_by_ids(email_ids=email_ids, screen=MessageScreen())
+    screened_bytes = http.bytes_sent
+
+    assert [email.id for email in emails] == email_ids[:4]
+
+    http.bytes_sent = 0
+    assert len(gmail.get_emails_by_ids(email_ids=email_ids)) == 10
+    assert screened_bytes < http.bytes_sent / 2
@@ -0,0 +1,146 @@
+import os
+from typing import List, Optional
+from src.service.model import LLMService
+from src.service.web_gmail import Email
+from src.service.message_store import parse_response
+from src.service.prompt_compactor import PromptCompactor
+from src.service.transaction_extractor import (
+    TransactionExtractor, build_messages, email_to_prompt_dict, is_valid_transaction
+)
+from src.service.transaction_rules import parse_amount
+from tests.fake_gmail import make_message
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+
+class StubLLM(LLMService):
+    def __init__(self, answer: dict):
+        self.answer = answer
+        self.calls = []
+        self.cache_keys = []
+
+    def invoke(self, messages: List[dict], cache_messages: Optional[List[dict]] = None) -> dict:
+        self.calls.append(messages)
+        self.cache_keys.append(cache_messages)
+        return self.answer
+
+
+def fixture_email(name: str, sender: str, subject: str, date: str = "5 Apr 2025 18:45:00 -0500") -> Email:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as file:
+        html = file.read()
+    return parse_response(make_message(message_id=name, sender=sender, subject=subject, html=html, date=date))
+
+
+def test_produbanco_transfer_matches_llm_answer():
+    email = Email(
+        id="195f988dd90cbffa",
+        mimeType="text/html",
+        sender='"Banco enlínea" <bancaenlinea@produbanco.com>',
+        date="2 Apr 2025 21:44:09 -0500",
+        subject="Transferencia enviada por $223.00 desde Banco",
+        text="Banco enlínea notificacion nuevo formato Estimado/a John Doe Fecha y Hora: 2/Abril/2025 21:43 "
+             "Transacción: Transferencia Enviada Exitosamente desde Banco Detalle Contacto: John DoeBanco Contacto: "
+             "BANCO SUPERCuenta Contacto: XXXXX82326Monto: $223.00Descripción: Pago RociCanal: App Móvil"
+    )
+    llm = StubLLM(answer={})
+    extractor = TransactionExtractor(llm=llm)
+
+    assert extractor.extract(email) == {
+        "is_transaction": True,
+        "transaction_type": "transfer",
+        "amount": 223.0,
+        "establishment": "",
+        "beneficiary": "BANCO SUPER",
+        "date": "2025-04-02"
+    }
+    assert llm.calls == []
+    assert extractor.metrics["rule_hits"] == 1
+
+
+def test_card_and_trip_templates():
+    extractor = TransactionExtractor(llm=StubLLM(answer={}))
+    pichincha = fixture_email("pichincha_card.html", "servicios@tarjetasbancopichincha.com", "Notificación de consumo")
+    produbanco = fixture_email("produbanco_card_unclosed.html", "alertas@produbanco.com", "Produbanco consumo")
+    uber = fixture_email("uber_receipt.html", "Uber Receipts <noreply@uber.com>", "Tu viaje del sábado con Uber")
+
+    assert extractor.extract(pichincha) == {
+        "is_transaction": True, "transaction_type": "card", "amount": 45.67,
+        "establishment": "SUPERMAXI EL BOSQUE", "beneficiary": "", "date": "2025-04-05"
+    }
+    assert extractor.extract(produbanco)["establishment"] == "KFC C.C.I. & CIA"
+    assert extractor.extract(produbanco)["amount"] == 12.8
+    assert extractor.extract(uber) == {
+        "is_transaction": True, "transaction_type": "card", "amount": 4.5,
+        "establishment": "Uber", "beneficiary": "", "date": "2025-04-05"
+    }
+
+
+def test_falls_back_to_llm_when_no_rule_or_invalid():
+    answer = {"is_transaction": False, "transaction_type": "", "amount": 0.0, "establishment": "",
+              "beneficiary": "", "date": ""}
+    llm = StubLLM(answer=answer)
+    extractor = TransactionExtractor(llm=llm)
+
+    newsletter = Email(id="1", mimeType="text/html", sender="news@example.com", subject="Novedades", text="Hola")
+    broken = Email(id="2", mimeType="text/html", sender="bancaenlinea@produbanco.com",
+                   subject="Transferencia enviada", text="Monto: $0.00")
+
+    assert extractor.extract(newsletter) == answer
+    assert extractor.extract(broken) == answer
+    assert len(llm.calls) == 2
+    assert "Novedades" in llm.calls[0][1]["content"]
+    assert extractor.metrics == {"rule_hits": 0, "rule_failures": 1, "llm_calls": 2, "unanalyzed": 0}
+
+
+def test_invalid_llm_answers_are_discarded():
+    answer = {"is_transaction": True, "transaction_type": "card", "amount": "12", "establishment": "Uber",
+              "beneficiary": "", "date": ""}
+    llm = StubLLM(answer=answer)
+    extractor = TransactionExtractor(llm=llm)
+    newsletter = Email(id="1", mimeType="text/html", sender="news@example.com", subject="Novedades", text="Hola")
+
+    assert extractor.extract(newsletter) is None
+    assert extractor.extract_many([newsletter]) == {"1": None}
+    assert extractor.metrics == {"rule_hits": 0, "rule_failures": 0, "llm_calls": 2, "unanalyzed": 2}
+
+
+def test_parse_amount_and_validation():
+    assert parse_amount("1,234.56") == 1234.56
+    assert parse_amount("1.234,56") == 1234.56
+    assert parse_amount("45,67") == 45.67
+    assert parse_amount("1,234") == 1234.0
+    assert not is_valid_transaction({"is_transaction": True})
+
+
+def test_extract_many_sends_only_unmatched_emails_to_llm():
+    answer = {"is_transaction": False, "transaction_type": "", "amount": 0.0, "establishment": "",
+              "beneficiary": "", "date": ""}
+    llm = StubLLM(answer=answer)
+    extractor = TransactionExtractor(llm=llm)
+    uber = fixture_email("uber_receipt.html", "Uber Receipts <noreply@uber.com>", "Tu viaje del sábado con Uber")
+    newsletter = Email(id="1", mimeType="text/html", sender="news@example.com", subject="Novedades", text="Hola")
+
+    results = extractor.extract_many([uber, newsletter])
+
+    assert results[uber.id]["establishment"] == "Uber"
+    assert results["1"] == answer
+    assert len(llm.calls) == 1
+    assert extractor.metrics == {"rule_hits": 1, "rule_failures": 0, "llm_calls": 1, "unanalyzed": 0}
+
+
+def test_cache_messages_do_not_depend_on_learned_boilerplate():
+    llm = StubLLM(answer={"is_transaction": False})
+    compactor = PromptCompactor(count_tokens=lambda text: len(text.split()), min_occurrences=2)
+    extractor = TransactionExtractor(llm=llm, compactor=compactor)
+    footer = "Síguenos en nuestras redes sociales para conocer las novedades."
+    email = Email(id="e1", mimeType="text/html", sender="Tienda <info@tienda.com>", subject="Tu pedido",
+                  text=f"Monto: $12.00. {footer}")
+
+    extractor.extract(email)
+    for i in range(3):
+        extractor.extract_many([Email(**{**email.model_dump(), "id": f"x{i}", "text": f"Hola {i}. {footer}"})])
+    extractor.extract(email)
+
+    assert "redes sociales" in llm.calls[0][1]["content"]
+    assert "redes sociales" not in llm.calls[-1][1]["content"]
+    assert llm.cache_keys[0] == llm.cache_keys[-1] == build_messages(email=email_to_prompt_dict(email))
@@ -1,4 +1,8 @@
-from src.utils import bs64_to_utf8, process_html
+import os
+import random
+from src.utils import bs64_to_utf8, process_html, process_html_soup, extract_text
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
 
 def test_bs64_to_utf8():
     encoded_data = "PCFET0NUWVBFIEhUTUwgUFVCTElDICItLy9XM0MvL0RURCBIVE1MIDQuMCBUcmFuc2l0aW9uYWwvL0VOIj4NCjxIVE1MPjxIRUFEPjxUSVRMRT5Qcm9kdWJhbmNvIGVubMOtbmVhIG5vdGlmaWNhY2lvbiBudWV2byBmb3JtYXRvPC9USVRMRT4NCjxNRVRBIGNvbnRlbnQ9InRleHQvaHRtbDsgY2hhcnNldD11bmljb2RlIiBodHRwLWVxdWl2PUNvbnRlbnQtVHlwZT4NCjxTVFlMRSB0eXBlPXRleHQvY3NzPg0KYm9keSx0ZCx0aCB7DQoJZm9udC1mYW1pbHk6IEFyaWFsLCBIZWx2ZXRpY2EsIHNhbnMtc2VyaWY7DQoJZm9udC1zaXplOiAxNnB4Ow0KCWNvbG9yOiAjNjY2Ow0KfQ0KPC9TVFlMRT4NCg0KPE1FVEEgbmFtZT1HRU5FUkFUT1IgY29udGVudD0iTVNIVE1MIDExLjAwLjEwNTcwLjEwMDEiPjwvSEVBRD4NCjxCT0RZIGJnQ29sb3I9I2ZmZmZmZiBsZWZ0TWFyZ2luPTAgdG9wTWFyZ2luPTAgbWFyZ2lud2lkdGg9IjAiIG1hcmdpbmhlaWdodD0iMCI-PCEtLSBTYXZlIGZvciBXZWIgU2xpY2VzIChQcm9kdWJhbmNvIGVubMOtbmVhIG5vdGlmaWNhY2lvbiBudWV2byBmb3JtYXRvKSAtLT4NCjxUQUJMRSBpZD1UYWJsYV8wMSBoZWlnaHQ9Nzk0IGNlbGxTcGFjaW5nPTAgY2VsbFBhZGRpbmc9MCB3aWR0aD04NTAgYm9yZGVyPTA-DQogIDxUQk9EWT4NCiAgPFRSPg0KICAgIDxURD48Rk9OVCBmYWNlPSJOdW5pdG8gU2FucyBOb3JtYWwiPjxJTUcgYWx0PSIiIA0KICAgICAgc3JjPSJodHRwczovL2NvbnRlbnQucHJkLm5ldC5lYy9iZXByb2QvcHJvZHViYW5jby1lbmxpbmVhLW5vdGlmaWNhY2lvbi0xNzAyMjFfMDIuanBnIiANCiAgICAgIHdpZHRoPTg1MCBoZWlnaHQ9MjE4PjwvRk9OVD48L1REPjwvVFI-DQogIDxUUj4NCiAgICA8VEQ-DQogICAgICA8VEFCTEUgY2VsbFNwYWNpbmc9NDAgd2lkdGg9IjEwMCUiPg0KICAgICAgICA8VEJPRFk-DQogICAgICAgIDxUUj4NCiAgICAgICAgICA8VEQ-DQogICAgICAgICAgICA8UD48Rk9OVCBmYWNlPSJOdW5pdG8gU2FucyBOb3JtYWwiPkVzdGltYWRvL2E8L0ZPTlQ-PC9QPg0KICAgICAgICAgICAgPFA-PEZPTlQgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5NQUZMQSBDSEVDQSBOSUNPTEFTIEpFU1VTPC9GT05UPjwvUD4NCiAgICAgICAgICAgIDxQPjxGT05UIGZhY2U9Ik51bml0byBTYW5zIE5vcm1hbCI-RmVjaGEgeSBIb3JhOiANCiAgICAgICAgICAgIDIvQWJyaWwvMjAyNSAgMjE6NDM8L0ZPTlQ-PC9QPg0KICAgICAgICAgICAgPFA-PEZPTlQgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5UcmFuc2FjY2nDs246IA0KICAgICAgICAgICAgPFNUUk9ORz5UcmFuc2ZlcmVuY2lhIEVudmlhZGEgRXhpdG9zYW1lbnRlIGRlc2RlIA0KICAgICAgICAgICAgUHJvZHViYW5jbzwvU1RST05HPjwvRk9OVD48L1A-DQogICAgICAgICAgICA8UD48U1RST05HPjxGT05UIA0KICAgICAgICAgICAgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5EZXRhbGxlPC9GT05UPjwvU1RST05HPjwvUD4NCiAgICAgICAgICAgIDxQPjxGT05UIGZhY2U9Ik51bml0byBTYW5zIE5vcm1hbCI-PFNUUk9ORz5Db250YWN0bzo8L1NUUk9ORz4gDQogICAgICAgICAgICBOSUNPTEFTIEpFU1VTTUFGTEEgQ0hFQ0E8QlI-PFNUUk9ORz5CYW5jbyBDb250YWN0bzo8L1NUUk9ORz4gDQogICAgICAgICAgICBCQU5DTyBQSUNISU5DSEE8QlI-PFNUUk9ORz5DdWVudGEgQ29udGFjdG86PC9TVFJPTkc-IA0KICAgICAgICAgICAgWFhYWFg4MjMyNjxCUj48U1RST05HPk1vbnRvOjwvU1RST05HPiANCiAgICAgICAgICAgICQyMjMuMDA8QlI-PFNUUk9ORz5EZXNjcmlwY2nDs246PC9TVFJPTkc-IA0KICAgICAgICAgICAgUGFnbyBSb2NpPEJSPjxTVFJPTkc-Q2FuYWw6PC9TVFJPTkc-IA0KICAgICAgICAgICAgQXBwIE3Ds3ZpbDxCUj48U1RST05HPlJlZmVyZW5jaWE6PC9TVFJPTkc-IA0KMDg1OTg1MDIwOTAwPC9GT05UPjwvUD4NCiAgICAgICAgICAgIDxQPjxGT05UIGZhY2U9Ik51bml0byBTYW5zIE5vcm1hbCI-RXN0YSB0cmFuc2FjY2nDs24gdGllbmUgdW4gY29zdG8gDQogICAgICAgICAgICBkZSAkMC40MSBwb3IgbW90aXZvIGRlIFRyYW5zZmVyZW5jaWEgSW50ZXJiYW5jYXJpYS48L0ZPTlQ-PC9QPg0KICAgICAgICAgICAgPFA-PEZPTlQgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5TaSBubyByZWFsaXphc3RlIGVzdGEgdHJhbnNhY2Npw7NuIA0KICAgICAgICAgICAgcG9yIGZhdm9yIGNvbXVuw61jYXRlIGRlIG1hbmVyYSB1cmdlbnRlIGNvbiBub3NvdHJvcyBhIG51ZXN0cm8gQ2FsbCANCiAgICAgICAgICAgIENlbnRlci4gUG9yIGZhdm9yIG5vIHJlc3BvbmRhcyBhIGVzdGUgbWFpbC48L0ZPTlQ-PC9QPg0KICAgICAgICAgICAgPFA-PEZPTlQgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5BdGVudGFtZW50ZSANCiAgICAgICAgICBQcm9kdWJhbmNvPC9GT05UPjwvUD48L1REPjwvVFI-PC9UQk9EWT48L1RBQkxFPg0KICAgICAgPFA-Jm5ic3A7PC9QPjwvVEQ-PC9UUj4NCiAgPFRSPg0KICAgIDxURD4NCiAgICAgIDxUQUJMRSBjZWxsU3BhY2luZz0wIHdpZHRoPSIxMDAlIj4NCiAgICAgICAgPFRCT0RZPg0KICAgICAgICA8VFI-DQogICAgICAgICAgPFREIGNvbFNwYW49Nj48SU1HIGFsdD0iIiANCiAgICAgICAgICAgIHNyYz0iaHR0cHM6Ly9jb250ZW50LnByZC5uZXQuZWMvYmVwcm9kL3Byb2R1YmFuY28tZW5saW5lYS1ub3RpZmljYWNpb24tMTkwMjIxXzAxLmpwZyIgDQogICAgICAgICAgICB3aWR0aD04NTAgaGVpZ2h0PTQxPjwvVEQ-PC9UUj4NCiAgICAgICAgPFRSPg0KICAgICAgICAgIDxURCBjb2xTcGFuPTY-PEEgaHJlZj0iaHR0cHM6Ly93d3cucHJvZHViYW5jby5jb20uZWMvIj48SU1HIGJvcmRlcj0wIA0KICAgICAgICAgICAgYWx0PSIiIA0KICAgICAgICAgICAgc3JjPSJodHRwczovL2NvbnRlbnQucHJkLm5ldC5lYy9iZXByb2QvcHJvZHViYW5jby1lbmxpbmVhLW5vdGlmaWNhY2lvbi0xOTAyMjFfMDIuanBnIiANCiAgICAgICAgICAgIHdpZHRoPTg1MCBoZWlnaHQ9MjY-PC9BPjwvVEQ-PC9UUj4NCiAgICAgICAgPFRSPg0KICAgICAgICAgIDxURD48SU1HIGFsdD0iIiANCiAgICAgICAgICAgIHNyYz0iaHR0cHM6Ly9jb250ZW50LnByZC5uZXQuZWMvYmVwcm9kL3Byb2R1YmFuY28tZW5saW5lYS1ub3RpZmljYWNpb24tMTkwMjIxXzAzLmpwZyIgDQogICAgICAgICAgICB3aWR0aD0zNyBoZWlnaHQ9Mzc-PC9URD4NCiAgICAgICAgICA8VEQ-PEEgaHJlZj0iaHR0cHM6Ly93d3cuZmFjZWJvb2suY29tL1Byb2R1YmFuY28iPjxJTUcgYm9yZGVyPTAgDQogICAgICAgICAgICBhbHQ9IiIgDQogICAgICAgICAgICBzcmM9Imh0dHBzOi8vY29udGVudC5wcmQubmV0LmVjL2JlcHJvZC9wcm9kdWJhbmNvLWVubGluZWEtbm90aWZpY2FjaW9uLTE5MDIyMV8wNC5qcGciIA0KICAgICAgICAgICAgd2lkdGg9MzggaGVpZ2h0PTM3PjwvQT48L1REPg0KICAgICAgICAgIDxURD48QSBocmVmPSJodHRwczovL3R3aXR0ZXIuY29tL3Byb2R1YmFuY29lYyI-PElNRyBib3JkZXI9MCBhbHQ9IiIgDQogICAgICAgICAgICBzcmM9Imh0dHBzOi8vY29udGVudC5wcmQubmV0LmVjL2JlcHJvZC9wcm9kdWJhbmNvLWVubGluZWEtbm90aWZpY2FjaW9uLTE5MDIyMV8wNS5qcGciIA0KICAgICAgICAgICAgd2lkdGg9MzcgaGVpZ2h0PTM3PjwvQT48L1REPg0KICAgICAgICAgIDxURD48QSBocmVmPSJodHRwczovL3d3dy5pbnN0YWdyYW0uY29tL3Byb2R1YmFuY29lYy8iPjxJTUcgYm9yZGVyPTAgDQogICAgICAgICAgICBhbHQ9IiIgDQogICAgICAgICAgICBzcmM9Imh0dHBzOi8vY29udGVudC5wcmQubmV0LmVjL2JlcHJvZC9wcm9kdWJhbmNvLWVubGluZWEtbm90aWZpY2FjaW9uLTE5MDIyMV8wNi5qcGciIA0KICAgICAgICAgICAgd2lkdGg9MzQgaGVpZ2h0PTM3PjwvQT48L1REPg0KICAgICAgICAgIDxURD48QSBocmVmPSJodHRwOi8vd2EubWUvNTkzMDI0MDA5MDAwIj48SU1HIGJvcmRlcj0wIGFsdD0iIiANCiAgICAgICAgICAgIHNyYz0iaHR0cHM6Ly9jb250ZW50LnByZC5uZXQuZWMvYmVwcm9kL3Byb2R1YmFuY28tZW5saW5lYS1ub3RpZmljYWNpb24tMTkwMjIxXzA3LmpwZyIgDQogICAgICAgICAgICB3aWR0aD0zNSBoZWlnaHQ9Mzc-PC9BPjwvVEQ-DQogICAgICAgICAgPFREPjxJTUcgYWx0PSIiIA0KICAgICAgICAgICAgc3JjPSJodHRwczovL2NvbnRlbnQucHJkLm5ldC5lYy9iZXByb2QvcHJvZHViYW5jby1lbmxpbmVhLW5vdGlmaWNhY2lvbi0xOTAyMjFfMDguanBnIiANCiAgICAgICAgICAgIHdpZHRoPTY2OSBoZWlnaHQ9Mzc-PC9URD48L1RSPg0KICAgICAgICA8VFI-DQogICAgICAgICAgPFREIGNvbFNwYW49Nj48QSBocmVmPSJ0ZWw6KzU5MzAyNDAwOTAwMCI-PElNRyBib3JkZXI9MCBhbHQ9IiIgDQogICAgICAgICAgICBzcmM9Imh0dHBzOi8vY29udGVudC5wcmQubmV0LmVjL2JlcHJvZC9wcm9kdWJhbmNvLWVubGluZWEtbm90aWZpY2FjaW9uLTE5MDIyMV8wOS5qcGciIA0KICAgICAgICAgICAgd2lkdGg9ODUwIGhlaWdodD05Nj48L0E-PC9URD48L1RSPjwvVEJPRFk-PC9UQUJMRT48L1REPjwvVFI-PC9UQk9EWT48L1RBQkxFPjwhLS0gRW5kIFNhdmUgZm9yIFdlYiBTbGljZXMgLS0-Cg0KPHN0eWxlIHR5cGU9InRleHQvY3NzIj4vKjwhW0NEQVRBWyovDQouc3R5bGUxIHsNCglmb250LWZhbWlseTogR2VuZXZhLCBBcmlhbCwgSGVsdmV0aWNhLCBzYW5zLXNlcmlmOw0KCWZvbnQtc2l6ZTogOXB4Ow0KCWNvbG9yOiAjMzMzMzMzOw0KfQ0KLypdXT4qLzwvc3R5bGU-DQo8ZGl2IGNsYXNzPSJwaWUiPg0KPHRhYmxlIHdpZHRoPSI3MjAiIGNlbGxzcGFjaW5nPSIwIiBjZWxscGFkZGluZz0iMCIgYm9yZGVyPSIwIiBiZ2NvbG9yPSIjZmZmZmZmIj4NCiAgPHRib2R5Pjx0cj4NCiAgICA8dGQ-PGJyIC8-PC90ZD4NCiAgICA8dGQ-JiN4YTA7PC90ZD4NCiAgPC90cj4NCiAgPHRyPg0KICAgIDx0ZD48dGFibGUgd2lkdGg9IjEwMCUiIGNlbGxzcGFjaW5nPSIwIiBjZWxscGFkZGluZz0iMCIgYm9yZGVyPSIwIiBhbGlnbj0iY2VudGVyIj4NCiAgICAgIDx0Ym9keT48dHI-DQogICAgICAgIDx0ZCBjbGFzcz0ic3R5bGUxIiBjb2xzcGFuPSIyIj48ZGl2IGFsaWduPSJqdXN0aWZ5Ij5TaSB0aWVuZXMgYWxndW5hIGNvbnN1bHRhIGNvbiByZXNwZWN0byBhIGVzdGEgaW5mb3JtYWNpw7NuIG5vIGR1ZGVzIGVuIGNvbXVuaWNhcnRlIGNvbiBub3NvdHJvcywgY2FzbyBjb250cmFyaW8gbm8gZXMgbmVjZXNhcmlvIHJlc3BvbmRlciBhIGVzdGUgY29ycmVvIGVsZWN0csOzbmljby48L2Rpdj48ZGl2IGFsaWduPSJqdXN0aWZ5Ij48ZGl2IGFsaWduPSJqdXN0aWZ5Ij48ZGl2IGFsaWduPSJqdXN0aWZ5Ij5MYSBpbmZvcm1hY2nDs24geSBhZGp1bnRvcyBjb250ZW5pZG9zIGVuIGVzdGUgbWVuc2FqZSBzb24gY29uZmlkZW5jaWFsZXMgeSByZXNlcnZhZG9zOyBwb3IgdGFudG8gbm8gcHVlZGVuIHNlciB1c2Fkb3MsIHJlcHJvZHVjaWRvcyBvIGRpdnVsZ2Fkb3MgcG9yIG90cmFzIHBlcnNvbmFzIGRpc3RpbnRhcyBhIHN1KHMpIGRlc3RpbmF0YXJpbyhzKS4gU2kgbm8gZXJlcyBlbCBkZXN0aW5hdGFyaW8gZGUgZXN0ZSBlbWFpbCwgdGUgc29saWNpdGFtb3MgY29tZWRpZGFtZW50ZSBlbGltaW5hcmxvLiBDdWFscXVpZXIgb3BpbmnDs24gZXhwcmVzYWRhIGVuIGVzdGUgbWVuc2FqZSwgY29ycmVzcG9uZGUgYSBzdSBhdXRvciB5IG5vIG5lY2VzYXJpYW1lbnRlIGFsIEJhbmNvLjwvZGl2PjxkaXYgYWxpZ249Imp1c3RpZnkiPlJlY3VlcmRhIHF1ZSBQcm9kdWJhbmNvIG51bmNhIHRlIHJlcXVlcmlyw6EgcG9yIG5pbmfDum4gbWVkaW8sIHR1IHVzdWFyaW8gbyBjbGF2ZSBkZSBhY2Nlc28gYSBzdXMgc2l0aW9zIHdlYiBvIGFwbGljYWNpb25lcyBtw7N2aWxlcy48L2Rpdj48ZGl2IGFsaWduPSJqdXN0aWZ5Ij5UZSByZWNvbWVuZGFtb3Mgbm8gaW1wcmltaXIgZXN0ZSBjb3JyZW8gZWxlY3Ryw7NuaWNvIGEgbWVub3MgcXVlIHNlYSBlc3RyaWN0YW1lbnRlIG5lY2VzYXJpby48L2Rpdj48ZGl2PjxiciAvPjwvZGl2PjwvZGl2PjxkaXY-PGJyIC8-PC9kaXY-PC9kaXY-PC90ZD4gICAgICAgDQogICAgICA8L3RyPgkNCiAgICA8L3Rib2R5PjwvdGFibGU-PC90ZD4NCiAgPC90cj4NCjwvdGJvZHk-PC90YWJsZT4NCjwvZGl2Pg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoKPC9CT0RZPjwvSFRNTD4="
@@ -9,4 +13,30 @@ def test_process_html():
     encoded_data = "PCFET0NUWVBFIEhUTUwgUFVCTElDICItLy9XM0MvL0RURCBIVE1MIDQuMCBUcmFuc2l0aW9uYWwvL0VOIj4NCjxIVE1MPjxIRUFEPjxUSVRMRT5Qcm9kdWJhbmNvIGVubMOtbmVhIG5vdGlmaWNhY2lvbiBudWV2byBmb3JtYXRvPC9USVRMRT4NCjxNRVRBIGNvbnRlbnQ9InRleHQvaHRtbDsgY2hhcnNldD11bmljb2RlIiBodHRwLWVxdWl2PUNvbnRlbnQtVHlwZT4NCjxTVFlMRSB0eXBlPXRleHQvY3NzPg0KYm9keSx0ZCx0aCB7DQoJZm9udC1mYW1pbHk6IEFyaWFsLCBIZWx2ZXRpY2EsIHNhbnMtc2VyaWY7DQoJZm9udC1zaXplOiAxNnB4Ow0KCWNvbG9yOiAjNjY2Ow0KfQ0KPC9TVFlMRT4NCg0KPE1FVEEgbmFtZT1HRU5FUkFUT1IgY29udGVudD0iTVNIVE1MIDExLjAwLjEwNTcwLjEwMDEiPjwvSEVBRD4NCjxCT0RZIGJnQ29sb3I9I2ZmZmZmZiBsZWZ0TWFyZ2luPTAgdG9wTWFyZ2luPTAgbWFyZ2lud2lkdGg9IjAiIG1hcmdpbmhlaWdodD0iMCI-PCEtLSBTYXZlIGZvciBXZWIgU2xpY2VzIChQcm9kdWJhbmNvIGVubMOtbmVhIG5vdGlmaWNhY2lvbiBudWV2byBmb3JtYXRvKSAtLT4NCjxUQUJMRSBpZD1UYWJsYV8wMSBoZWlnaHQ9Nzk0IGNlbGxTcGFjaW5nPTAgY2VsbFBhZGRpbmc9MCB3aWR0aD04NTAgYm9yZGVyPTA-DQogIDxUQk9EWT4NCiAgPFRSPg0KICAgIDxURD48Rk9OVCBmYWNlPSJOdW5pdG8gU2FucyBOb3JtYWwiPjxJTUcgYWx0PSIiIA0KICAgICAgc3JjPSJodHRwczovL2NvbnRlbnQucHJkLm5ldC5lYy9iZXByb2QvcHJvZHViYW5jby1lbmxpbmVhLW5vdGlmaWNhY2lvbi0xNzAyMjFfMDIuanBnIiANCiAgICAgIHdpZHRoPTg1MCBoZWlnaHQ9MjE4PjwvRk9OVD48L1REPjwvVFI-DQogIDxUUj4NCiAgICA8VEQ-DQogICAgICA8VEFCTEUgY2VsbFNwYWNpbmc9NDAgd2lkdGg9IjEwMCUiPg0KICAgICAgICA8VEJPRFk-DQogICAgICAgIDxUUj4NCiAgICAgICAgICA8VEQ-DQogICAgICAgICAgICA8UD48Rk9OVCBmYWNlPSJOdW5pdG8gU2FucyBOb3JtYWwiPkVzdGltYWRvL2E8L0ZPTlQ-PC9QPg0KICAgICAgICAgICAgPFA-PEZPTlQgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5NQUZMQSBDSEVDQSBOSUNPTEFTIEpFU1VTPC9GT05UPjwvUD4NCiAgICAgICAgICAgIDxQPjxGT05UIGZhY2U9Ik51bml0byBTYW5zIE5vcm1hbCI-RmVjaGEgeSBIb3JhOiANCiAgICAgICAgICAgIDIvQWJyaWwvMjAyNSAgMjE6NDM8L0ZPTlQ-PC9QPg0KICAgICAgICAgICAgPFA-PEZPTlQgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5UcmFuc2FjY2nDs246IA0KICAgICAgICAgICAgPFNUUk9ORz5UcmFuc2ZlcmVuY2lhIEVudmlhZGEgRXhpdG9zYW1lbnRlIGRlc2RlIA0KICAgICAgICAgICAgUHJvZHViYW5jbzwvU1RST05HPjwvRk9OVD48L1A-DQogICAgICAgICAgICA8UD48U1RST05HPjxGT05UIA0KICAgICAgICAgICAgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5EZXRhbGxlPC9GT05UPjwvU1RST05HPjwvUD4NCiAgICAgICAgICAgIDxQPjxGT05UIGZhY2U9Ik51bml0byBTYW5zIE5vcm1hbCI-PFNUUk9ORz5Db250YWN0bzo8L1NUUk9ORz4gDQogICAgICAgICAgICBOSUNPTEFTIEpFU1VTTUFGTEEgQ0hFQ0E8QlI-PFNUUk9ORz5CYW5jbyBDb250YWN0bzo8L1NUUk9ORz4gDQogICAgICAgICAgICBCQU5DTyBQSUNISU5DSEE8QlI-PFNUUk9ORz5DdWVudGEgQ29udGFjdG86PC9TVFJPTkc-IA0KICAgICAgICAgICAgWFhYWFg4MjMyNjxCUj48U1RST05HPk1vbnRvOjwvU1RST05HPiANCiAgICAgICAgICAgICQyMjMuMDA8QlI-PFNUUk9ORz5EZXNjcmlwY2nDs246PC9TVFJPTkc-IA0KICAgICAgICAgICAgUGFnbyBSb2NpPEJSPjxTVFJPTkc-Q2FuYWw6PC9TVFJPTkc-IA0KICAgICAgICAgICAgQXBwIE3Ds3ZpbDxCUj48U1RST05HPlJlZmVyZW5jaWE6PC9TVFJPTkc-IA0KMDg1OTg1MDIwOTAwPC9GT05UPjwvUD4NCiAgICAgICAgICAgIDxQPjxGT05UIGZhY2U9Ik51bml0byBTYW5zIE5vcm1hbCI-RXN0YSB0cmFuc2FjY2nDs24gdGllbmUgdW4gY29zdG8gDQogICAgICAgICAgICBkZSAkMC40MSBwb3IgbW90aXZvIGRlIFRyYW5zZmVyZW5jaWEgSW50ZXJiYW5jYXJpYS48L0ZPTlQ-PC9QPg0KICAgICAgICAgICAgPFA-PEZPTlQgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5TaSBubyByZWFsaXphc3RlIGVzdGEgdHJhbnNhY2Npw7NuIA0KICAgICAgICAgICAgcG9yIGZhdm9yIGNvbXVuw61jYXRlIGRlIG1hbmVyYSB1cmdlbnRlIGNvbiBub3NvdHJvcyBhIG51ZXN0cm8gQ2FsbCANCiAgICAgICAgICAgIENlbnRlci4gUG9yIGZhdm9yIG5vIHJlc3BvbmRhcyBhIGVzdGUgbWFpbC48L0ZPTlQ-PC9QPg0KICAgICAgICAgICAgPFA-PEZPTlQgZmFjZT0iTnVuaXRvIFNhbnMgTm9ybWFsIj5BdGVudGFtZW50ZSANCiAgICAgICAgICBQcm9kdWJhbmNvPC9GT05UPjwvUD48L1REPjwvVFI-PC9UQk9EWT48L1RBQkxFPg0KICAgICAgPFA-Jm5ic3A7PC9QPjwvVEQ-PC9UUj4NCiAgPFRSPg0KICAgIDxURD4NCiAgICAgIDxUQUJMRSBjZWxsU3BhY2luZz0wIHdpZHRoPSIxMDAlIj4NCiAgICAgICAgPFRCT0RZPg0KICAgICAgICA8VFI-DQogICAgICAgICAgPFREIGNvbFNwYW49Nj48SU1HIGFsdD0iIiANCiAgICAgICAgICAgIHNyYz0iaHR0cHM6Ly9jb250ZW50LnByZC5uZXQuZWMvYmVwcm9kL3Byb2R1YmFuY28tZW5saW5lYS1ub3RpZmljYWNpb24tMTkwMjIxXzAxLmpwZyIgDQogICAgICAgICAgICB3aWR0aD04NTAgaGVpZ2h0PTQxPjwvVEQ-PC9UUj4NCiAgICAgICAgPFRSPg0KICAgICAgICAgIDxURCBjb2xTcGFuPTY-PEEgaHJlZj0iaHR0cHM6Ly93d3cucHJvZHViYW5jby5jb20uZWMvIj48SU1HIGJvcmRlcj0wIA0KICAgICAgICAgICAgYWx0PSIiIA0KICAgICAgICAgICAgc3JjPSJodHRwczovL2NvbnRlbnQucHJkLm5ldC5lYy9iZXByb2QvcHJvZHViYW5jby1lbmxpbmVhLW5vdGlmaWNhY2lvbi0xOTAyMjFfMDIuanBnIiANCiAgICAgICAgICAgIHdpZHRoPTg1MCBoZWlnaHQ9MjY-PC9BPjwvVEQ-PC9UUj4NCiAgICAgICAgPFRSPg0KICAgICAgICAgIDxURD48SU1HIGFsdD0iIiANCiAgICAgICAgICAgIHNyYz0iaHR0cHM6Ly9jb250ZW50LnByZC5uZXQuZWMvYmVwcm9kL3Byb2R1YmFuY28tZW5saW5lYS1ub3RpZmljYWNpb24tMTkwMjIxXzAzLmpwZyIgDQogICAgICAgICAgICB3aWR0aD0zNyBoZWlnaHQ9Mzc-PC9URD4NCiAgICAgICAgICA8VEQ-PEEgaHJlZj0iaHR0cHM6Ly93d3cuZmFjZWJvb2suY29tL1Byb2R1YmFuY28iPjxJTUcgYm9yZGVyPTAgDQogICAgICAgICAgICBhbHQ9IiIgDQogICAgICAgICAgICBzcmM9Imh0dHBzOi8vY29udGVudC5wcmQubmV0LmVjL2JlcHJvZC9wcm9kdWJhbmNvLWVubGluZWEtbm90aWZpY2FjaW9uLTE5MDIyMV8wNC5qcGciIA0KICAgICAgICAgICAgd2lkdGg9MzggaGVpZ2h0PTM3PjwvQT48L1REPg0KICAgICAgICAgIDxURD48QSBocmVmPSJodHRwczovL3R3aXR0ZXIuY29tL3Byb2R1YmFuY29lYyI-PElNRyBib3JkZXI9MCBhbHQ9IiIgDQogICAgICAgICAgICBzcmM9Imh0dHBzOi8vY29udGVudC5wcmQubmV0LmVjL2JlcHJvZC9wcm9kdWJhbmNvLWVubGluZWEtbm90aWZpY2FjaW9uLTE5MDIyMV8wNS5qcGciIA0KICAgICAgICAgICAgd2lkdGg9MzcgaGVpZ2h0PTM3PjwvQT48L1REPg0KICAgICAgICAgIDxURD48QSBocmVmPSJodHRwczovL3d3dy5pbnN0YWdyYW0uY29tL3Byb2R1YmFuY29lYy8iPjxJTUcgYm9yZGVyPTAgDQogICAgICAgICAgICBhbHQ9IiIgDQogICAgICAgICAgICBzcmM9Imh0dHBzOi8vY29udGVudC5wcmQubmV0LmVjL2JlcHJvZC9wcm9kdWJhbmNvLWVubGluZWEtbm90aWZpY2FjaW9uLTE5MDIyMV8wNi5qcGciIA0KICAgICAgICAgICAgd2lkdGg9MzQgaGVpZ2h0PTM3PjwvQT48L1REPg0KICAgICAgICAgIDxURD48QSBocmVmPSJodHRwOi8vd2EubWUvNTkzMDI0MDA5MDAwIj48SU1HIGJvcmRlcj0wIGFsdD0iIiANCiAgICAgICAgICAgIHNyYz0iaHR0cHM6Ly9jb250ZW50LnByZC5uZXQuZWMvYmVwcm9kL3Byb2R1YmFuY28tZW5saW5lYS1ub3RpZmljYWNpb24tMTkwMjIxXzA3LmpwZyIgDQogICAgICAgICAgICB3aWR0aD0zNSBoZWlnaHQ9Mzc-PC9BPjwvVEQ-DQogICAgICAgICAgPFREPjxJTUcgYWx0PSIiIA0KICAgICAgICAgICAgc3JjPSJodHRwczovL2NvbnRlbnQucHJkLm5ldC5lYy9iZXByb2QvcHJvZHViYW5jby1lbmxpbmVhLW5vdGlmaWNhY2lvbi0xOTAyMjFfMDguanBnIiANCiAgICAgICAgICAgIHdpZHRoPTY2OSBoZWlnaHQ9Mzc-PC9URD48L1RSPg0KICAgICAgICA8VFI-DQogICAgICAgICAgPFREIGNvbFNwYW49Nj48QSBocmVmPSJ0ZWw6KzU5MzAyNDAwOTAwMCI-PElNRyBib3JkZXI9MCBhbHQ9IiIgDQogICAgICAgICAgICBzcmM9Imh0dHBzOi8vY29udGVudC5wcmQubmV0LmVjL2JlcHJvZC9wcm9kdWJhbmNvLWVubGluZWEtbm90aWZpY2FjaW9uLTE5MDIyMV8wOS5qcGciIA0KICAgICAgICAgICAgd2lkdGg9ODUwIGhlaWdodD05Nj48L0E-PC9URD48L1RSPjwvVEJPRFk-PC9UQUJMRT48L1REPjwvVFI-PC9UQk9EWT48L1RBQkxFPjwhLS0gRW5kIFNhdmUgZm9yIFdlYiBTbGljZXMgLS0-Cg0KPHN0eWxlIHR5cGU9InRleHQvY3NzIj4vKjwhW0NEQVRBWyovDQouc3R5bGUxIHsNCglmb250LWZhbWlseTogR2VuZXZhLCBBcmlhbCwgSGVsdmV0aWNhLCBzYW5zLXNlcmlmOw0KCWZvbnQtc2l6ZTogOXB4Ow0KCWNvbG9yOiAjMzMzMzMzOw0KfQ0KLypdXT4qLzwvc3R5bGU-DQo8ZGl2IGNsYXNzPSJwaWUiPg0KPHRhYmxlIHdpZHRoPSI3MjAiIGNlbGxzcGFjaW5nPSIwIiBjZWxscGFkZGluZz0iMCIgYm9yZGVyPSIwIiBiZ2NvbG9yPSIjZmZmZmZmIj4NCiAgPHRib2R5Pjx0cj4NCiAgICA8dGQ-PGJyIC8-PC90ZD4NCiAgICA8dGQ-JiN4YTA7PC90ZD4NCiAgPC90cj4NCiAgPHRyPg0KICAgIDx0ZD48dGFibGUgd2lkdGg9IjEwMCUiIGNlbGxzcGFjaW5nPSIwIiBjZWxscGFkZGluZz0iMCIgYm9yZGVyPSIwIiBhbGlnbj0iY2VudGVyIj4NCiAgICAgIDx0Ym9keT48dHI-DQogICAgICAgIDx0ZCBjbGFzcz0ic3R5bGUxIiBjb2xzcGFuPSIyIj48ZGl2IGFsaWduPSJqdXN0aWZ5Ij5TaSB0aWVuZXMgYWxndW5hIGNvbnN1bHRhIGNvbiByZXNwZWN0byBhIGVzdGEgaW5mb3JtYWNpw7NuIG5vIGR1ZGVzIGVuIGNvbXVuaWNhcnRlIGNvbiBub3NvdHJvcywgY2FzbyBjb250cmFyaW8gbm8gZXMgbmVjZXNhcmlvIHJlc3BvbmRlciBhIGVzdGUgY29ycmVvIGVsZWN0csOzbmljby48L2Rpdj48ZGl2IGFsaWduPSJqdXN0aWZ5Ij48ZGl2IGFsaWduPSJqdXN0aWZ5Ij48ZGl2IGFsaWduPSJqdXN0aWZ5Ij5MYSBpbmZvcm1hY2nDs24geSBhZGp1bnRvcyBjb250ZW5pZG9zIGVuIGVzdGUgbWVuc2FqZSBzb24gY29uZmlkZW5jaWFsZXMgeSByZXNlcnZhZG9zOyBwb3IgdGFudG8gbm8gcHVlZGVuIHNlciB1c2Fkb3MsIHJlcHJvZHVjaWRvcyBvIGRpdnVsZ2Fkb3MgcG9yIG90cmFzIHBlcnNvbmFzIGRpc3RpbnRhcyBhIHN1KHMpIGRlc3RpbmF0YXJpbyhzKS4gU2kgbm8gZXJlcyBlbCBkZXN0aW5hdGFyaW8gZGUgZXN0ZSBlbWFpbCwgdGUgc29saWNpdGFtb3MgY29tZWRpZGFtZW50ZSBlbGltaW5hcmxvLiBDdWFscXVpZXIgb3BpbmnDs24gZXhwcmVzYWRhIGVuIGVzdGUgbWVuc2FqZSwgY29ycmVzcG9uZGUgYSBzdSBhdXRvciB5IG5vIG5lY2VzYXJpYW1lbnRlIGFsIEJhbmNvLjwvZGl2PjxkaXYgYWxpZ249Imp1c3RpZnkiPlJlY3VlcmRhIHF1ZSBQcm9kdWJhbmNvIG51bmNhIHRlIHJlcXVlcmlyw6EgcG9yIG5pbmfDum4gbWVkaW8sIHR1IHVzdWFyaW8gbyBjbGF2ZSBkZSBhY2Nlc28gYSBzdXMgc2l0aW9zIHdlYiBvIGFwbGljYWNpb25lcyBtw7N2aWxlcy48L2Rpdj48ZGl2IGFsaWduPSJqdXN0aWZ5Ij5UZSByZWNvbWVuZGFtb3Mgbm8gaW1wcmltaXIgZXN0ZSBjb3JyZW8gZWxlY3Ryw7NuaWNvIGEgbWVub3MgcXVlIHNlYSBlc3RyaWN0YW1lbnRlIG5lY2VzYXJpby48L2Rpdj48ZGl2PjxiciAvPjwvZGl2PjwvZGl2PjxkaXY-PGJyIC8-PC9kaXY-PC9kaXY-PC90ZD4gICAgICAgDQogICAgICA8L3RyPgkNCiAgICA8L3Rib2R5PjwvdGFibGU-PC90ZD4NCiAgPC90cj4NCjwvdGJvZHk-PC90YWJsZT4NCjwvZGl2Pg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoNCg0KDQoKPC9CT0RZPjwvSFRNTD4="
     html = bs64_to_utf8(encoded_data=encoded_data)
     text = process_html(html=html)
-    assert isinstance(text, str) and len(text) > 0
\ No newline at end of file
+    assert isinstance(text, str) and len(text) > 0
+
+
+def test_process_html_matches_soup_on_fixtures():
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as file:
+            html = file.read()
+        assert process_html(html=html) == process_html_soup(html=html), name
+
+
+def test_process_html_matches_soup_on_random_markup():
+    rng = random.Random(7)
+    tokens = [
+        "<p>", "</p>", "<td>", "</td>", "<br>", "<br/>", "<style>a{}</style>", "<script>x<y</script>", "<template>",
+        "</template>", "<rt>", "</rt>", "<!-- note -->", "<![CDATA[cd]]>", "&nbsp;", "&amp;", "&copy", "&bogus;",
+        "&#147;", "&#x41;", "&#129;", " ", "\n", "\t", "Monto", "$12.50", "Comercio:", "á", "<div>", "</div>", "</b>"
+    ]
+    for _ in range(500):
+        html = "".join(rng.choice(tokens) for _ in range(rng.randint(1, 40)))
+        assert process_html(html=html) == process_html_soup(html=html), html
+
+
+def test_extract_text_caps_large_bodies():
+    html = "<table>" + "<tr><td>Monto: $1.00</td></tr>\n" * 200_000 + "</table>"
+    text = extract_text(html=html, max_chars=1000)
+    assert 0 < len(text) <= 1000
+    assert text.startswith("Monto: $1.00 Monto: $1.00")
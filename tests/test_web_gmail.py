@@ -0,0 +1,112 @@
+import json
+import pickle
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from google.oauth2.credentials import Credentials
+from src.service import web_gmail
+from src.service.web_gmail import Email
+from tests.fake_gmail import FakeGmailHttp, build_fake_service, make_mailbox, make_token, make_web_service
+
+
+def test_ensure_service_builds_once(monkeypatch):
+    mailbox = make_mailbox(size=3)
+    builds = []
+
+    def fake_build(**kwargs):
+        builds.append(kwargs["credentials"])
+        return build_fake_service(http=FakeGmailHttp(messages=mailbox))
+
+    monkeypatch.setattr(web_gmail, "build", fake_build)
+    gmail = make_web_service(token=make_token(expires_in=timedelta(hours=1)))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        services = list(pool.map(lambda _: gmail.ensure_service(), range(32)))
+
+    assert len(builds) == 1
+    assert all(service is services[0] for service in services)
+    assert isinstance(gmail.get_email_by_id(email_id=list(mailbox)[0]), Email)
+
+
+def test_ensure_service_refreshes_expiring_token(monkeypatch):
+    refreshes = []
+
+    def fake_refresh(self, request):
+        refreshes.append(request)
+        self.token = "new-access-token"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: object())
+    monkeypatch.setattr(Credentials, "refresh", fake_refresh)
+    gmail = make_web_service(token=make_token(expires_in=timedelta(minutes=2)))
+
+    first = gmail.ensure_service()
+    second = gmail.ensure_service()
+    assert len(refreshes) == 1
+    assert first is second
+    assert json.loads(gmail.token)["token"] == "new-access-token"
+
+
+def test_ensure_service_rebuilds_when_token_changes(monkeypatch):
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: object())
+    gmail = make_web_service(token=make_token(expires_in=timedelta(hours=1)))
+
+    first = gmail.ensure_service()
+    gmail._token = make_token(expires_in=timedelta(hours=2))
+    second = gmail.ensure_service()
+    assert first is not second
+
+
+def test_concurrent_requests_never_share_a_transport(monkeypatch):
+    mailbox = make_mailbox(size=24)
+    transports = []
+
+    class ExclusiveHttp(FakeGmailHttp):
+        def __init__(self):
+            super().__init__(messages=mailbox, latency=0.01)
+            self.busy = threading.Lock()
+
+        def request(self, *args, **kwargs):
+            assert self.busy.acquire(blocking=False), "transport used by two threads at once"
+            try:
+                return super().request(*args, **kwargs)
+            finally:
+                self.busy.release()
+
+    def http_factory(credentials):
+        transports.append(ExclusiveHttp())
+        return transports[-1]
+
+    monkeypatch.setattr(web_gmail, "build", lambda **kwargs: build_fake_service(http=ExclusiveHttp()))
+    gmail = make_web_service(
+        token=make_token(expires_in=timedelta(hours=1)),
+        http_pool_size=4,
+        http_factory=http_factory
+    )
+    gmail.ensure_service()
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        emails = list(pool.map(lambda email_id: gmail.get_email_by_id(email_id=email_id), mailbox))
+
+    assert [email.id for email in emails] == list(mailbox)
+    assert len(transports) <= 4
+    assert sum(len(http.requests) for http in transports) == len(mailbox)
+    assert gmail.http_pool.metrics["acquired"] == len(mailbox)
+
+
+def test_email_derives_html_and_text_lazily():
+    raw = make_mailbox(size=1)["0000000000000000"]
+    email = Email.from_gmail(raw)
+
+    assert email._html is None and email._text is None
+    assert email.text == "Estimado/a John Doe Monto: $0.00 Referencia: 0000000000"
+    assert email._html is None
+    assert email.html.startswith("<html>")
+    assert email.data == raw["payload"]["body"]["data"]
+    assert email.sender == '"Banco enlínea" <bancaenlinea@produbanco.com>'
+
+    dump = email.model_dump()
+    assert set(dump) == set(Email.FIELDS)
+    assert Email.model_validate(email.model_dump(exclude={"html"})) == email
+    assert pickle.loads(pickle.dumps(email)) == email
+    assert email == web_gmail.Response.model_validate(raw).parse()
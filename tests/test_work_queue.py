@@ -0,0 +1,104 @@
+import os
+import time
+import threading
+import multiprocessing
+from src.service.work_queue import SqliteWorkQueue, QueueWorker
+
+
+def drain(path: str, worker: str) -> list:
+    queue = SqliteWorkQueue(path=path, queue="emails")
+    processed = []
+    while True:
+        jobs = queue.lease(worker=worker, limit=2, visibility_timeout=30)
+        if not jobs:
+            return processed
+        for job in jobs:
+            processed.append(job["payload"]["n"])
+            assert queue.ack(job_id=job["id"], worker=worker)
+
+
+def test_enqueue_is_idempotent_per_key_and_records_attempts(tmp_path):
+    queue = SqliteWorkQueue(path=os.path.join(tmp_path, "queue.sqlite3"), queue="emails")
+    assert queue.enqueue(payload={"n": 1}, key="gmail:1")
+    assert not queue.enqueue(payload={"n": 1}, key="gmail:1")
+
+    [job] = queue.lease(worker="w1")
+    assert job["payload"] == {"n": 1} and job["attempts"] == 1
+    assert queue.lease(worker="w2") == []
+    assert queue.ack(job_id=job["id"], worker="w1")
+
+    [attempt] = queue.attempts(job_id=job["id"])
+    assert attempt["worker"] == "w1" and attempt["outcome"] == "ok"
+    assert queue.metrics["done"] == 1 and queue.metrics["ready"] == 0
+
+
+def test_expired_lease_is_redelivered_and_stale_ack_rejected(tmp_path):
+    queue = SqliteWorkQueue(path=os.path.join(tmp_path, "queue.sqlite3"))
+    queue.enqueue(payload={"n": 1})
+
+    [first] = queue.lease(worker="w1", visibility_timeout=0.05)
+    time.sleep(0.1)
+    [second] = queue.lease(worker="w2", visibility_timeout=30)
+
+    assert second["id"] == first["id"] and second["attempts"] == 2
+    assert not queue.ack(job_id=first["id"], worker="w1")
+    assert queue.ack(job_id=second["id"], worker="w2")
+    assert [a["outcome"] for a in queue.attempts(job_id=first["id"])] == ["expired", "ok"]
+
+
+def test_failing_job_is_dead_lettered_and_can_be_requeued(tmp_path):
+    queue = SqliteWorkQueue(path=os.path.join(tmp_path, "queue.sqlite3"), max_attempts=3)
+    queue.enqueue(payload={"n": 1}, key="gmail:1")
+
+    for attempt in range(3):
+        [job] = queue.lease(worker="w1")
+        assert queue.nack(job_id=job["id"], worker="w1", error=f"boom {attempt}")
+
+    assert queue.lease(worker="w1") == []
+    [dead] = queue.dead_letters()
+    assert dead["key"] == "gmail:1" and dead["attempts"] == 3 and dead["error"] == "boom 2"
+    assert [a["error"] for a in queue.attempts(job_id=dead["id"])] == ["boom 0", "boom 1", "boom 2"]
+
+    assert queue.requeue(job_id=dead["id"])
+    [job] = queue.lease(worker="w1")
+    assert job["attempts"] == 1
+    assert [a["attempt"] for a in queue.attempts(job_id=job["id"])] == [1, 2, 3, 4]
+
+
+def test_processes_share_the_queue_without_double_processing(tmp_path):
+    path = os.path.join(tmp_path, "queue.sqlite3")
+    queue = SqliteWorkQueue(path=path, queue="emails")
+    for n in range(200):
+        queue.enqueue(payload={"n": n}, key=f"gmail:{n}")
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=3) as pool:
+        results = pool.starmap(drain, [(path, f"node-{i}") for i in range(3)])
+
+    processed = [n for result in results for n in result]
+    assert sorted(processed) == list(range(200))
+    assert queue.metrics["done"] == 200
+
+
+def test_queue_worker_retries_until_success(tmp_path):
+    queue = SqliteWorkQueue(path=os.path.join(tmp_path, "queue.sqlite3"))
+    calls = []
+    done = threading.Event()
+
+    def handler(payload):
+        calls.append(payload["n"])
+        if len(calls) == 1:
+            raise RuntimeError("transient")
+        done.set()
+
+    worker = QueueWorker(name="emails", queue=queue, handler=handler, workers=2, poll_interval=0.01, retry_backoff=0)
+    worker.start()
+    queue.enqueue(payload={"n": 7})
+    worker.notify()
+    try:
+        assert done.wait(timeout=5)
+    finally:
+        assert worker.stop(timeout=5)
+
+    assert calls == [7, 7]
+    assert worker.metrics["processed"] == 1 and worker.metrics["failed"] == 1
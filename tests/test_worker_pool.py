@@ -0,0 +1,66 @@
+import threading
+from src.service.worker_pool import WorkerPool, ShardedWorkerPool
+
+
+def test_worker_pool_processes_and_drains():
+    processed = []
+    lock = threading.Lock()
+
+    def handler(item):
+        if item == "boom":
+            raise ValueError(item)
+        with lock:
+            processed.append(item)
+
+    pool = WorkerPool(name="test", handler=handler, workers=3, max_queue=50)
+    pool.start()
+    for i in range(40):
+        assert pool.submit(i)
+    assert pool.submit("boom")
+
+    assert pool.stop(timeout=5)
+    assert sorted(processed) == list(range(40))
+    metrics = pool.metrics
+    assert metrics["processed"] == 40 and metrics["failed"] == 1 and metrics["queue_depth"] == 0
+    assert not pool.submit(41)
+
+
+def test_worker_pool_rejects_when_full():
+    release = threading.Event()
+    pool = WorkerPool(name="test", handler=lambda item: release.wait(timeout=5), workers=1, max_queue=2)
+    pool.start()
+
+    results = [pool.submit(i) for i in range(6)]
+    assert results.count(False) >= 3
+    assert pool.metrics["rejected"] == results.count(False)
+    assert pool.metrics["high_water"] == 2
+
+    release.set()
+    assert pool.stop(timeout=5)
+
+
+def test_sharded_pool_isolates_a_noisy_key():
+    release = threading.Event()
+    processed = []
+
+    def handler(item):
+        key, value = item
+        if key == "noisy":
+            release.wait(timeout=5)
+        processed.append(item)
+
+    pool = ShardedWorkerPool(name="test", handler=handler, shards=4, max_queue=5)
+    quiet = next(f"quiet-{i}" for i in range(100) if pool.shard_for(f"quiet-{i}") != pool.shard_for("noisy"))
+    pool.start()
+
+    accepted = [pool.submit(key="noisy", item=("noisy", i)) for i in range(10)]
+    assert not all(accepted)
+    assert pool.submit(key=quiet, item=(quiet, 1))
+    for _ in range(100):
+        if (quiet, 1) in processed:
+            break
+        threading.Event().wait(0.01)
+    assert (quiet, 1) in processed
+
+    release.set()
+    assert pool.stop(timeout=5)